@@ -60,6 +60,7 @@ DEFAULT_REQUEST_TIMEOUT_SECONDS = 30
 DEFAULT_RATE_LIMIT_DELAY_SECONDS = 3.0
 DEFAULT_RETRY_MAX_ATTEMPTS = 3
 DEFAULT_RETRY_BASE_DELAY_SECONDS = 2.0
+DEFAULT_RETRY_MAX_TOTAL_WAIT_SECONDS = 60.0
 
 # Log settings
 DEFAULT_LOG_RETENTION_DAYS = 7
@@ -79,8 +80,12 @@ ERROR_BODY_TRUNCATE_CHARS = 500
 # Email validation regex (RFC 5322 simplified)
 EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
-# Google Sheets API scope
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
+# Google API scopes: Sheets read access, plus Drive file metadata (modifiedTime)
+# so unchanged spreadsheets can be skipped without fetching their values
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets.readonly',
+    'https://www.googleapis.com/auth/drive.metadata.readonly',
+]
 
 # File paths (configurable via environment)
 # These are evaluated at module load time for backward compatibility
@@ -140,6 +145,7 @@ class AppSettings:
     request_timeout_seconds: int = DEFAULT_REQUEST_TIMEOUT_SECONDS
     retry_max_attempts: int = DEFAULT_RETRY_MAX_ATTEMPTS
     retry_base_delay_seconds: float = DEFAULT_RETRY_BASE_DELAY_SECONDS
+    retry_max_total_wait_seconds: float = DEFAULT_RETRY_MAX_TOTAL_WAIT_SECONDS
     rate_limit_delay_seconds: float = DEFAULT_RATE_LIMIT_DELAY_SECONDS
 
     # Logging
@@ -186,6 +192,9 @@ class AppSettings:
             request_timeout_seconds=settings.get('request_timeout_seconds', DEFAULT_REQUEST_TIMEOUT_SECONDS),
             retry_max_attempts=settings.get('retry_max_attempts', DEFAULT_RETRY_MAX_ATTEMPTS),
             retry_base_delay_seconds=settings.get('retry_base_delay_seconds', DEFAULT_RETRY_BASE_DELAY_SECONDS),
+            retry_max_total_wait_seconds=settings.get(
+                'retry_max_total_wait_seconds', DEFAULT_RETRY_MAX_TOTAL_WAIT_SECONDS
+            ),
             rate_limit_delay_seconds=settings.get('rate_limit_delay_seconds', DEFAULT_RATE_LIMIT_DELAY_SECONDS),
             log_retention_days=settings.get('log_retention_days', DEFAULT_LOG_RETENTION_DAYS),
             log_format=log_format,
@@ -501,7 +510,7 @@ def reload_config() -> Dict[str, Any]:
     """Reload configuration from file and update global state."""
     global _config, MOMENCE_HOSTS, SHEETS_CONFIG, _settings
     global LOG_RETENTION_DAYS, API_TIMEOUT_SECONDS, RETRY_MAX_ATTEMPTS
-    global RETRY_BASE_DELAY, RATE_LIMIT_DELAY, DLQ_ENABLED
+    global RETRY_BASE_DELAY, RETRY_MAX_TOTAL_WAIT, RATE_LIMIT_DELAY, DLQ_ENABLED
     global DLQ_MAX_RETRY_ATTEMPTS, DLQ_RETRY_BACKOFF_HOURS
     global HEALTH_SERVER_ENABLED, HEALTH_SERVER_PORT, LOG_FORMAT
     global DEFAULT_SPREADSHEET_ID, _smtp_config, _email_config
@@ -516,6 +525,7 @@ def reload_config() -> Dict[str, Any]:
     API_TIMEOUT_SECONDS = _settings.get('api_timeout_seconds', DEFAULT_API_TIMEOUT_SECONDS)
     RETRY_MAX_ATTEMPTS = _settings.get('retry_max_attempts', DEFAULT_RETRY_MAX_ATTEMPTS)
     RETRY_BASE_DELAY = _settings.get('retry_base_delay_seconds', DEFAULT_RETRY_BASE_DELAY_SECONDS)
+    RETRY_MAX_TOTAL_WAIT = _settings.get('retry_max_total_wait_seconds', DEFAULT_RETRY_MAX_TOTAL_WAIT_SECONDS)
     RATE_LIMIT_DELAY = _settings.get('rate_limit_delay_seconds', DEFAULT_RATE_LIMIT_DELAY_SECONDS)
 
     DLQ_ENABLED = _settings.get('dlq_enabled', True)
@@ -547,6 +557,7 @@ LOG_RETENTION_DAYS = _settings.get('log_retention_days', DEFAULT_LOG_RETENTION_D
 API_TIMEOUT_SECONDS = _settings.get('api_timeout_seconds', DEFAULT_API_TIMEOUT_SECONDS)
 RETRY_MAX_ATTEMPTS = _settings.get('retry_max_attempts', DEFAULT_RETRY_MAX_ATTEMPTS)
 RETRY_BASE_DELAY = _settings.get('retry_base_delay_seconds', DEFAULT_RETRY_BASE_DELAY_SECONDS)
+RETRY_MAX_TOTAL_WAIT = _settings.get('retry_max_total_wait_seconds', DEFAULT_RETRY_MAX_TOTAL_WAIT_SECONDS)
 RATE_LIMIT_DELAY = _settings.get('rate_limit_delay_seconds', DEFAULT_RATE_LIMIT_DELAY_SECONDS)
 
 # Dead-letter queue settings
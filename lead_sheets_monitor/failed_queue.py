@@ -7,7 +7,7 @@ Now uses SQLite storage backend for atomic, corruption-resistant operations.
 
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
 from config import (
     DLQ_MAX_RETRY_ATTEMPTS, DLQ_RETRY_BACKOFF_HOURS,
@@ -19,7 +19,39 @@ from utils import utc_now, logger, compute_entry_hash
 import storage
 
 
-def generate_row_hash(sheet_id: str, gid: str, headers: List[str], row_data: List[Any]) -> str:
+# Row fields that compute_entry_hash reads when hashing a sheet row
+ROW_HASH_FIELDS = ('email', 'first_name', 'last_name', 'phone_number')
+
+
+def compile_row_hash_columns(headers: List[str]) -> Dict[str, Tuple[int, ...]]:
+    """
+    Resolve the column positions of the hashed fields for a sheet's headers.
+
+    Computed once per sheet so generate_row_hash reads only the identity
+    columns of each row instead of building a dict of every column.
+
+    Args:
+        headers: List of column headers
+
+    Returns:
+        Dict mapping each field in ROW_HASH_FIELDS present in the headers to
+        its column indices, last column first (later duplicate headers win)
+    """
+    columns: Dict[str, Tuple[int, ...]] = {}
+    for i, header in enumerate(headers):
+        key = header.lower().strip()
+        if key in ROW_HASH_FIELDS:
+            columns[key] = (i,) + columns.get(key, ())
+    return columns
+
+
+def generate_row_hash(
+    sheet_id: str,
+    gid: str,
+    headers: List[str],
+    row_data: List[Any],
+    columns: Optional[Dict[str, Tuple[int, ...]]] = None
+) -> str:
     """
     Generate a unique hash for a row based on key fields and sheet location.
 
@@ -35,15 +67,23 @@ def generate_row_hash(sheet_id: str, gid: str, headers: List[str], row_data: Lis
         gid: Sheet tab ID
         headers: List of column headers
         row_data: List of cell values for the row
+        columns: compile_row_hash_columns(headers), when hashing many rows
+                 of the same sheet. Compiled on the fly if omitted.
 
     Returns:
         32-character hex hash string
     """
-    # Build a dict of the row data for easier access
+    if columns is None:
+        columns = compile_row_hash_columns(headers)
+
+    # Build a dict of the identity fields for compute_entry_hash
+    row_len = len(row_data)
     row_dict = {}
-    for i, value in enumerate(row_data):
-        if i < len(headers) and value:
-            row_dict[headers[i].lower().strip()] = str(value).strip()
+    for field, indices in columns.items():
+        for i in indices:
+            if i < row_len and row_data[i]:
+                row_dict[field] = str(row_data[i]).strip()
+                break
 
     return compute_entry_hash(row_dict, sheet_id=sheet_id, gid=gid)
 
@@ -191,7 +191,8 @@ def create_momence_lead(lead_data: Dict[str, Any], host_name: str, dry_run: bool
     debug_payload = {k: ('***' if k == 'token' else v) for k, v in payload.items()}
 
     try:
-        response = retry_with_backoff(make_request)
+        # Creating a lead isn't idempotent: only resend if Momence answered
+        response = retry_with_backoff(make_request, idempotent=False)
 
         if response.status_code >= 400:
             all_response_headers = dict(response.headers)
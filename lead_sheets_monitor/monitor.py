@@ -17,10 +17,12 @@ Usage:
 import argparse
 import gc
 import json
+import random
 import signal
 import sys
+import threading
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 # Local application
 import storage
@@ -31,17 +33,23 @@ from config import (
     get_momence_hosts, get_sheets_config
 )
 from failed_queue import (
-    generate_row_hash, add_to_failed_queue, process_failed_queue, list_dead_letters
+    compile_row_hash_columns, generate_row_hash, add_to_failed_queue,
+    process_failed_queue, list_dead_letters
 )
 from momence import create_momence_lead, close_session
-from notifications import send_error_digest, send_location_leads_digest
+from notifications import send_all_digests
 from sheets import (
-    get_google_sheets_service, get_sheet_name_by_gid, fetch_sheet_data,
-    build_momence_lead_data
+    get_google_sheets_service, get_sheet_name_by_gid, fetch_spreadsheets_data,
+    iter_sheet_rows, compile_schema, build_momence_lead_data,
+    get_spreadsheet_modified_time
 )
 from utils import utc_now, setup_logging, logger
 from web import start_health_server, update_health_state, cleanup_web_caches
 
+# Fraction of the check interval applied as random +/- jitter to daemon sleeps,
+# so multiple instances don't hit the Sheets API at synchronized boundaries
+DAEMON_INTERVAL_JITTER = 0.1
+
 
 def run_cleanup_tasks():
     """
@@ -54,6 +62,7 @@ def run_cleanup_tasks():
     - Expired dead letter entries (default: 90 days)
     - Expired web sessions
     - Expired CSRF tokens
+    - Stale index statistics and free pages left behind by the above
 
     Called once per monitor run in daemon mode.
     Each cleanup task is run independently so one failure doesn't block others.
@@ -123,6 +132,14 @@ def run_cleanup_tasks():
         logger.error(f"Database error cleaning up CSRF tokens: {type(e).__name__}: {e}")
         cleanup_results['csrf_tokens'] = f"error: {e}"
 
+    # Refresh index statistics and reclaim pages freed by the cleanups above
+    try:
+        pages_reclaimed = storage.optimize_database()
+        cleanup_results['db_optimize'] = pages_reclaimed
+    except sqlite3.Error as e:
+        logger.error(f"Database error optimizing database: {type(e).__name__}: {e}")
+        cleanup_results['db_optimize'] = f"error: {e}"
+
     # Clean up stale database connections from dead threads
     try:
         connections_cleaned = storage.cleanup_stale_connections()
@@ -355,10 +372,22 @@ def check_for_new_entries(
     """
     new_entries: List[Dict[str, Any]] = []
 
+    # Drive modifiedTime per spreadsheet, looked up once per cycle. Spreadsheets
+    # whose sheets were all checked successfully get it recorded at the end, so
+    # the next cycle can skip them entirely if nothing changed.
+    current_mtimes: Dict[str, Optional[str]] = {}
+    incomplete_spreadsheets: set = set()
+
+    # Tabs due a fetch, grouped by spreadsheet so each spreadsheet's tabs are
+    # fetched together in one batchGet call
+    pending: List[Tuple[Dict[str, Any], str, int]] = []
+    tabs_by_spreadsheet: Dict[str, List[Tuple[str, int]]] = {}
+
     for sheet_config in get_sheets_config():
         # Skip disabled sheets
         if not sheet_config.get('enabled', True):
             logger.debug(f"Sheet '{sheet_config.get('name')}' is disabled, skipping")
+            incomplete_spreadsheets.add(sheet_config.get('spreadsheet_id'))
             continue
 
         spreadsheet_id = sheet_config['spreadsheet_id']
@@ -373,11 +402,25 @@ def check_for_new_entries(
         host_cfg = get_momence_hosts().get(momence_host, {})
         if not host_cfg.get('enabled', True):
             logger.debug(f"Momence host '{momence_host}' is disabled, skipping sheet '{sheet_config.get('name')}'")
+            # Don't record the mtime, or the sheet would be skipped as unchanged once re-enabled
+            incomplete_spreadsheets.add(spreadsheet_id)
+            continue
+
+        last_row = 0 if full_scan else storage.get_sheet_progress(spreadsheet_id, gid)
+
+        # Skip the sheet if its spreadsheet hasn't been modified since the last
+        # completed check (sheets never scanned before are always fetched)
+        if spreadsheet_id not in current_mtimes:
+            current_mtimes[spreadsheet_id] = get_spreadsheet_modified_time(service, spreadsheet_id)
+        current_mtime = current_mtimes[spreadsheet_id]
+        if last_row > 0 and current_mtime and current_mtime == storage.get_spreadsheet_mtime(spreadsheet_id):
+            logger.info(f"Skipping sheet '{sheet_config.get('name')}' (spreadsheet unchanged since {current_mtime})")
             continue
 
         sheet_name = get_sheet_name_by_gid(service, spreadsheet_id, gid)
         if not sheet_name:
             logger.warning(f"Could not find sheet with gid={gid}")
+            incomplete_spreadsheets.add(spreadsheet_id)
             continue
 
         # Determine start row for incremental fetching
@@ -385,7 +428,6 @@ def check_for_new_entries(
             start_row = 1
             logger.info(f"Checking sheet: {sheet_name} (FULL SCAN)")
         else:
-            last_row = storage.get_sheet_progress(spreadsheet_id, gid)
             # start_row is the first data row to fetch (row 2 = first data row after headers)
             # If last_row is 0 (never processed), fetch from row 2 (all data)
             # If last_row is N, fetch from row N+1 (new rows only)
@@ -395,14 +437,26 @@ def check_for_new_entries(
             else:
                 logger.info(f"Checking sheet: {sheet_name} (first scan)")
 
-        data = fetch_sheet_data(service, spreadsheet_id, sheet_name, start_row=start_row if start_row > 1 else 1)
+        pending.append((sheet_config, sheet_name, start_row))
+        tabs_by_spreadsheet.setdefault(spreadsheet_id, []).append((sheet_name, start_row))
+
+    fetched = fetch_spreadsheets_data(service, tabs_by_spreadsheet)
+
+    for sheet_config, sheet_name, start_row in pending:
+        spreadsheet_id = sheet_config['spreadsheet_id']
+        gid = sheet_config['gid']
+        momence_host = sheet_config['momence_host']
+
+        data = fetched[(spreadsheet_id, sheet_name, start_row)]
         if not data:
+            # No headers back means the fetch failed - check again next cycle
+            incomplete_spreadsheets.add(spreadsheet_id)
             continue
 
-        headers = data[0] if data else []
-        rows = data[1:] if len(data) > 1 else []
+        headers = data[0]
+        row_count = len(data) - 1
 
-        if not rows:
+        if not row_count:
             if verbose:
                 logger.info(f"  No new rows found")
             continue
@@ -412,31 +466,30 @@ def check_for_new_entries(
         # If full scan (start_row = 1), first data row is at row 2
         first_data_row = start_row if start_row > 1 else 2
 
-        logger.info(f"  Fetched {len(rows)} rows (starting at row {first_data_row})")
+        logger.info(f"  Fetched {row_count} rows (starting at row {first_data_row})")
 
-        # Filter out empty rows and build row data with indices
-        valid_rows = []
-        for idx, row in enumerate(rows):
-            if any(cell.strip() if isinstance(cell, str) else cell for cell in row):
-                row_index = first_data_row + idx
-                valid_rows.append((row_index, row))
+        # Skip empty rows and hash the rest in a single pass over the fetched
+        # data, keeping one (row_index, row, hash) list instead of copies.
+        # Identity column positions are resolved once for the whole sheet.
+        hash_columns = compile_row_hash_columns(headers)
+        valid_rows = [
+            (row_index, row, generate_row_hash(spreadsheet_id, gid, headers, row, hash_columns))
+            for row_index, row in iter_sheet_rows(data, first_data_row)
+        ]
 
         if not valid_rows:
             if verbose:
                 logger.info(f"  No non-empty rows found")
             continue
 
-        # Batch hash generation for all valid rows
-        row_hashes = [
-            generate_row_hash(spreadsheet_id, gid, headers, row)
-            for _, row in valid_rows
-        ]
+        # Column positions of the lead fields, shared by every row of this sheet
+        schema = compile_schema(headers)
 
         # Batch hash lookup (single DB query instead of N queries)
-        existing_hashes = storage.get_existing_hashes(row_hashes)
+        existing_hashes = storage.get_existing_hashes([row_hash for _, _, row_hash in valid_rows])
 
         # Process only truly new rows (handles crash recovery case)
-        for (row_index, row), row_hash in zip(valid_rows, row_hashes):
+        for row_index, row, row_hash in valid_rows:
             if row_hash in existing_hashes:
                 if verbose:
                     logger.debug(f"  Row {row_index} already processed (hash exists)")
@@ -449,6 +502,7 @@ def check_for_new_entries(
                 'spreadsheet_id': spreadsheet_id,
                 'row_index': row_index,
                 'headers': headers,
+                'schema': schema,
                 'data': row,
                 'hash': row_hash,
                 'momence_host': momence_host
@@ -461,6 +515,10 @@ def check_for_new_entries(
             total_rows = last_processed_row  # Approximate total (actual row count)
             storage.update_sheet_progress(spreadsheet_id, gid, last_processed_row, total_rows)
 
+    for spreadsheet_id, mtime in current_mtimes.items():
+        if mtime and spreadsheet_id not in incomplete_spreadsheets:
+            storage.update_spreadsheet_mtime(spreadsheet_id, mtime)
+
     return new_entries
 
 
@@ -488,82 +546,114 @@ def process_new_entries(new_entries: list, dry_run: bool = False) -> tuple[List[
 
     logger.info(f"Processing {len(new_entries)} new entries")
 
+    # Bookkeeping writes are deferred and flushed in one transaction via
+    # storage.bulk_commit() instead of auto-committing per lead
+    processed_hashes: List[tuple] = []
+    location_increments: Dict[str, int] = {}
+    lead_metrics: List[tuple] = []
+
+    # Leads already posted this cycle, keyed by (momence_host, email), so the
+    # same person appearing in several sheets is only sent once
+    posted_leads: Dict[tuple, Dict[str, Any]] = {}
+
     posts_made = 0
-    for entry in new_entries:
-        location = entry['sheet_config'].get('name', entry['momence_host'])
-        momence_host = entry['momence_host']
-
-        lead_data = build_momence_lead_data(
-            entry['headers'],
-            entry['data'],
-            entry['sheet_config']
-        )
-        if lead_data:
-            # Idempotency protection: Mark as in-progress BEFORE making API call
-            # This prevents duplicate submissions if process crashes mid-request
-            # and restarts before the response is processed
-            if not dry_run and not storage.hash_exists(entry['hash']):
-                storage.add_sent_hash(entry['hash'], location)
-
-            # Add delay between POST requests to avoid rate limiting
-            if posts_made > 0:
-                time.sleep(RATE_LIMIT_DELAY)
-            result = create_momence_lead(lead_data, momence_host, dry_run=dry_run)
-            posts_made += 1
-
-            # Track lead for location email notification (regardless of success/failure)
-            sync_success = result.get('success', False)
-            lead_record = {**lead_data, 'success': sync_success}
-            if location not in leads_by_location:
-                leads_by_location[location] = []
-            leads_by_location[location].append(lead_record)
-
-            if sync_success:
-                # Hash already added before API call for idempotency
-                # Just increment the location count
-                storage.increment_location_count(location)
+    try:
+        for entry in new_entries:
+            location = entry['sheet_config'].get('name', entry['momence_host'])
+            momence_host = entry['momence_host']
+
+            lead_data = build_momence_lead_data(
+                entry['headers'],
+                entry['data'],
+                entry['sheet_config'],
+                entry.get('schema')
+            )
+            if lead_data:
+                lead_key = (momence_host, str(lead_data['email']).lower().strip())
+                first_entry = posted_leads.get(lead_key)
+                if first_entry is not None:
+                    # Duplicate within this cycle - attribute to the first occurrence
+                    # and mark this row processed without another POST
+                    logger.info(
+                        f"Skipping duplicate lead '{lead_data['email']}' at row {entry['row_index']} "
+                        f"(already sent from '{first_entry['sheet_name']}' row {first_entry['row_index']})"
+                    )
+                    if not dry_run:
+                        processed_hashes.append((entry['hash'], location))
+                    continue
+                posted_leads[lead_key] = entry
+
+                # Idempotency protection: Mark as in-progress BEFORE making API call
+                # This prevents duplicate submissions if process crashes mid-request
+                # and restarts before the response is processed. This write stays
+                # immediate - deferring it would widen the crash window to the whole batch.
+                if not dry_run:
+                    storage.add_sent_hash(entry['hash'], location)
+
+                # Add delay between POST requests to avoid rate limiting
+                if posts_made > 0:
+                    time.sleep(RATE_LIMIT_DELAY)
+                result = create_momence_lead(lead_data, momence_host, dry_run=dry_run)
+                posts_made += 1
+
+                # Track lead for location email notification (regardless of success/failure)
+                sync_success = result.get('success', False)
+                lead_record = {**lead_data, 'success': sync_success}
+                if location not in leads_by_location:
+                    leads_by_location[location] = []
+                leads_by_location[location].append(lead_record)
+
                 # Record daily metric using the lead's created date from spreadsheet
                 lead_created_date = lead_data.get('created_time')  # From spreadsheet 'created_time' column
-                storage.record_lead_metric(location, momence_host, lead_date=lead_created_date, success=True)
-            else:
-                # Collect error for admin digest with capped sizes to limit memory usage
-                error_info = result.get('error', {})
-                response_body = error_info.get('response_body', '')
-                errors.append({
-                    'momence_host': momence_host,
-                    'lead_email': lead_data.get('email'),
-                    'sheet_name': lead_data.get('sheetName'),
-                    'error_type': error_info.get('type', 'unknown'),
-                    'exception_type': error_info.get('exception_type'),
-                    'status_code': error_info.get('status_code'),
-                    'cf_ray': error_info.get('cf_ray', 'N/A'),
-                    'response_headers': error_info.get('response_headers', {}),
-                    'response_body': response_body[:500] if response_body else '',  # Cap at 500 chars
-                    'message': error_info.get('message', '')[:500],  # Cap at 500 chars
-                    'request_url': error_info.get('request_url'),
-                    'request_payload': error_info.get('request_payload'),
-                    'request_timestamp': error_info.get('request_timestamp'),
-                    'request_duration_ms': error_info.get('request_duration_ms'),
-                    'timestamp': utc_now().isoformat()
-                })
-                # Add to failed queue for retry with backoff (if DLQ enabled)
-                # Note: Hash already added before API call for idempotency, so lead won't be
-                # picked up as NEW again. Failed queue handles the retry separately.
-                if DLQ_ENABLED:
-                    add_to_failed_queue(lead_data, momence_host, error_info, entry['hash'])
-                    logger.warning(f"Lead '{lead_data.get('email')}' failed, added to retry queue")
+                lead_metrics.append((location, momence_host, lead_created_date, sync_success))
+
+                if sync_success:
+                    # Hash already added before API call for idempotency
+                    # Just increment the location count
+                    location_increments[location] = location_increments.get(location, 0) + 1
                 else:
-                    logger.warning(f"Lead '{lead_data.get('email')}' failed (DLQ disabled, will not be retried)")
-                # Record failed metric using the lead's created date from spreadsheet
-                lead_created_date = lead_data.get('created_time')  # From spreadsheet 'created_time' column
-                storage.record_lead_metric(location, momence_host, lead_date=lead_created_date, success=False)
-        else:
-            # No valid lead data (missing email, etc.) - mark as processed to avoid retrying
-            # The hash was already added for idempotency if lead_data existed, so only
-            # add it here if there was no lead_data at all
-            if not storage.hash_exists(entry['hash']):
-                storage.add_sent_hash(entry['hash'], location)
-            storage.increment_location_count(location)
+                    # Collect error for admin digest with capped sizes to limit memory usage
+                    error_info = result.get('error', {})
+                    response_body = error_info.get('response_body', '')
+                    errors.append({
+                        'momence_host': momence_host,
+                        'lead_email': lead_data.get('email'),
+                        'sheet_name': lead_data.get('sheetName'),
+                        'error_type': error_info.get('type', 'unknown'),
+                        'exception_type': error_info.get('exception_type'),
+                        'status_code': error_info.get('status_code'),
+                        'cf_ray': error_info.get('cf_ray', 'N/A'),
+                        'response_headers': error_info.get('response_headers', {}),
+                        'response_body': response_body[:500] if response_body else '',  # Cap at 500 chars
+                        'message': error_info.get('message', '')[:500],  # Cap at 500 chars
+                        'request_url': error_info.get('request_url'),
+                        'request_payload': error_info.get('request_payload'),
+                        'request_timestamp': error_info.get('request_timestamp'),
+                        'request_duration_ms': error_info.get('request_duration_ms'),
+                        'timestamp': utc_now().isoformat()
+                    })
+                    # Add to failed queue for retry with backoff (if DLQ enabled)
+                    # Note: Hash already added before API call for idempotency, so lead won't be
+                    # picked up as NEW again. Failed queue handles the retry separately.
+                    if DLQ_ENABLED:
+                        add_to_failed_queue(lead_data, momence_host, error_info, entry['hash'])
+                        logger.warning(f"Lead '{lead_data.get('email')}' failed, added to retry queue")
+                    else:
+                        logger.warning(f"Lead '{lead_data.get('email')}' failed (DLQ disabled, will not be retried)")
+            else:
+                # No valid lead data (missing email, etc.) - mark as processed to avoid retrying
+                processed_hashes.append((entry['hash'], location))
+                location_increments[location] = location_increments.get(location, 0) + 1
+    except BaseException:
+        # Persist whatever progress was made before the loop was interrupted.
+        # A failing commit is only logged so the original error still propagates.
+        try:
+            storage.bulk_commit(processed_hashes, location_increments, lead_metrics)
+        except Exception as e:
+            logger.error(f"Could not save progress after processing was interrupted: {e}")
+        raise
+
+    storage.bulk_commit(processed_hashes, location_increments, lead_metrics)
 
     storage.update_tracker_metadata(last_check=utc_now().isoformat())
     return errors, leads_by_location
@@ -572,19 +662,18 @@ def process_new_entries(new_entries: list, dry_run: bool = False) -> tuple[List[
 def log_location_counts():
     """Log cumulative location counts since cache was built."""
     metadata = storage.get_tracker_metadata()
-    location_counts = metadata.get('location_counts', {})
     cache_built_at = metadata.get('cache_built_at', 'unknown')
+    location_counts = storage.get_location_counts()
 
     if not location_counts:
         logger.info("Location counts: No entries processed yet")
         return
 
     logger.info(f"Cumulative location counts (since {cache_built_at}):")
-    total = 0
-    for location, count in sorted(location_counts.items()):
+    # Already ordered by location
+    for location, count in location_counts.items():
         logger.info(f"  {location}: {count}")
-        total += count
-    logger.info(f"  TOTAL: {total}")
+    logger.info(f"  TOTAL: {sum(location_counts.values())}")
 
 
 def run_monitor(
@@ -616,6 +705,8 @@ def run_monitor(
     logger.info(f"Momence hosts configured: {list(get_momence_hosts().keys())}")
     logger.info("=" * 50)
 
+    failed_count = None
+
     if reset_tracker:
         logger.warning("Resetting tracker - all entries will be treated as new!")
         # Reset by clearing the database tables
@@ -642,8 +733,10 @@ def run_monitor(
     try:
         # Process failed queue first (retry previously failed leads)
         if DLQ_ENABLED:
-            # Use count-only check to avoid loading all entries into memory
-            failed_count = storage.get_failed_queue_count()
+            # Use count-only check to avoid loading all entries into memory;
+            # reuse the count from the startup log when we already have it
+            if failed_count is None:
+                failed_count = storage.get_failed_queue_count()
             if failed_count > 0:
                 logger.info("Processing failed queue...")
                 dlq_success, dlq_failed, dlq_errors = process_failed_queue(dry_run=dry_run)
@@ -659,6 +752,7 @@ def run_monitor(
 
         if not dry_run:
             # Send error digest to admin if there were errors (only once per day)
+            digest_errors: List[Dict[str, Any]] = []
             if errors:
                 metadata = storage.get_tracker_metadata()
                 last_error_email = metadata.get('last_error_email_sent')
@@ -668,14 +762,12 @@ def run_monitor(
                     logger.info(f"Skipping error digest - already sent today at {last_error_email} ({len(errors)} errors queued)")
                 else:
                     logger.info(f"Sending error digest email ({len(errors)} errors)...")
-                    if send_error_digest(errors):
-                        storage.update_tracker_metadata(last_error_email_sent=utc_now().isoformat())
-
-            # Send leads digest for each location
-            for location_name, leads in leads_by_location.items():
-                if leads:
-                    logger.info(f"Sending leads digest for location '{location_name}' ({len(leads)} leads)...")
-                    send_location_leads_digest(location_name, leads)
+                    digest_errors = errors
+
+            # Send the per-location leads digests concurrently with the error digest
+            error_digest_sent, _ = send_all_digests(digest_errors, leads_by_location)
+            if digest_errors and error_digest_sent:
+                storage.update_tracker_metadata(last_error_email_sent=utc_now().isoformat())
         else:
             logger.info("[DRY RUN] Tracker not saved, emails not sent")
 
@@ -716,6 +808,7 @@ class GracefulShutdown:
 
     def __init__(self):
         self.should_stop = False
+        self._event = threading.Event()
         signal.signal(signal.SIGTERM, self._handle_signal)
         signal.signal(signal.SIGINT, self._handle_signal)
 
@@ -724,6 +817,16 @@ class GracefulShutdown:
         signal_name = signal.Signals(signum).name
         logger.info(f"Received {signal_name}, initiating graceful shutdown...")
         self.should_stop = True
+        self._event.set()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Sleep for up to timeout seconds, waking immediately on a shutdown signal.
+
+        Returns:
+            True if shutdown was requested
+        """
+        return self._event.wait(timeout)
 
 
 def run_daemon(dry_run: bool = False, verbose: bool = False):
@@ -795,7 +898,7 @@ def run_daemon(dry_run: bool = False, verbose: bool = False):
                 db_initialized = storage.init_database(allow_create=False)
                 if db_initialized:
                     break
-            time.sleep(10)  # Check every 10 seconds
+            shutdown_handler.wait(10)  # Check every 10 seconds
 
         if not db_initialized:
             logger.error("Shutdown requested before database was available")
@@ -808,6 +911,7 @@ def run_daemon(dry_run: bool = False, verbose: bool = False):
     health_server = start_health_server(metadata)
 
     while not shutdown_handler.should_stop:
+        cycle_start = time.monotonic()
         try:
             run_monitor(dry_run=dry_run, verbose=verbose, reset_tracker=False)
 
@@ -834,12 +938,15 @@ def run_daemon(dry_run: bool = False, verbose: bool = False):
         if shutdown_handler.should_stop:
             break
 
-        # Sleep in smaller increments to respond to shutdown faster
-        logger.info(f"Next check in {interval_minutes} minutes...")
-        sleep_seconds = interval_minutes * 60
-        while sleep_seconds > 0 and not shutdown_handler.should_stop:
-            time.sleep(min(5, sleep_seconds))  # Check every 5 seconds
-            sleep_seconds -= 5
+        # Subtract this cycle's run time so checks don't drift, then add jitter
+        interval_seconds = interval_minutes * 60
+        elapsed = time.monotonic() - cycle_start
+        jitter = random.uniform(-DAEMON_INTERVAL_JITTER, DAEMON_INTERVAL_JITTER) * interval_seconds
+        sleep_seconds = max(0.0, interval_seconds - elapsed + jitter)
+
+        # Returns as soon as a shutdown signal arrives
+        logger.info(f"Next check in {sleep_seconds / 60:.1f} minutes (cycle took {elapsed:.1f}s)...")
+        shutdown_handler.wait(sleep_seconds)
 
     # Graceful shutdown with timeout enforcement
     # Cloud Run sends SIGTERM with 60s hard timeout, so we must complete within GRACEFUL_SHUTDOWN_TIMEOUT
@@ -937,9 +1044,8 @@ def main():
     if args.queue_status:
         storage.init_database(allow_create=False)
         failed_queue = storage.get_failed_queue_entries()
-        dead_letters = storage.get_dead_letters()
         failed_count = len(failed_queue)
-        dead_count = len(dead_letters)
+        dead_count = storage.get_dead_letter_count()
         sent_count = storage.get_sent_hash_count()
         print(f"\nQueue Status:")
         print(f"  Failed queue: {failed_count} entries")
@@ -997,11 +1103,11 @@ def main():
 
     if args.retry_failed:
         storage.init_database(allow_create=False)
-        failed_queue = storage.get_failed_queue_entries()
-        if not failed_queue:
+        failed_count = storage.get_failed_queue_count()
+        if not failed_count:
             print("No entries in failed queue")
             return
-        print(f"Force retrying {len(failed_queue)} entries...")
+        print(f"Force retrying {failed_count} entries...")
         success, failed, errors = process_failed_queue(
             dry_run=args.dry_run, force_retry=True
         )
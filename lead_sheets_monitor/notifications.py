@@ -4,14 +4,22 @@ Handles sending digest emails for leads and errors.
 """
 
 import json
+import re
 import smtplib
+import ssl
+import threading
 import urllib.parse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from email import policy as email_policy
+from email.charset import Charset
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 from config import (
     get_host_config, get_sheet_config_by_name, get_smtp_config,
+    get_momence_hosts, get_sheets_config,
     resolve_email_list, get_email_config, ERROR_BODY_TRUNCATE_CHARS
 )
 from utils import utc_now, escape_html, logger
@@ -20,10 +28,272 @@ from utils import utc_now, escape_html, logger
 # SMTP timeout in seconds
 SMTP_TIMEOUT_SECONDS = 30
 
+# Reconnect after this many messages on one SMTP connection; long-lived
+# sessions are cut off by some providers
+SMTP_SESSION_MAX_MESSAGES = 1000
 
-def send_email(to_addresses: List[str], subject: str, html_body: str) -> bool:
-    """Send an HTML email via SMTP."""
-    smtp_cfg = get_smtp_config()
+# Concurrent SMTP connections used by send_all_digests
+DIGEST_SEND_WORKERS = 4
+
+# Line ending and dot-stuffing rules applied to message data (as in smtplib)
+_EOL_PATTERN = re.compile(r'(?:\r\n|\n|\r(?!\n))')
+_LEADING_PERIOD_PATTERN = re.compile(br'(?m)^\.')
+
+# Serialization policy for outgoing messages: the compat32 policy the MIME
+# classes are built with, but with the CRLF line endings SMTP requires
+_WIRE_POLICY = email_policy.compat32.clone(linesep='\r\n')
+
+# UTF-8 with the body left as raw 8-bit text, for servers that accept
+# 8BITMIME (RFC 6152); the default UTF-8 charset base64-encodes the body,
+# adding a third to its size
+_UTF8_8BIT = Charset('utf-8')
+_UTF8_8BIT.body_encoding = None
+
+# RFC 5321 line length limit (excluding CRLF), which also applies to 8bit bodies
+SMTP_MAX_LINE_BYTES = 998
+
+
+@lru_cache(maxsize=None)
+def _ssl_context() -> ssl.SSLContext:
+    """
+    Shared TLS context for STARTTLS.
+
+    Building a default context loads the system CA bundle, so it is done
+    once on first use and reused by every connection and thread.
+    """
+    return ssl.create_default_context()
+
+
+class PipeliningSMTP(smtplib.SMTP):
+    """
+    smtplib.SMTP that pipelines the envelope (RFC 2920).
+
+    When the server advertises PIPELINING, MAIL FROM, every RCPT TO and DATA
+    are written in a single packet and their replies read afterwards, so a
+    message costs one round trip before the body instead of 2 + recipients.
+    Falls back to smtplib's sequential sendmail otherwise.
+    """
+
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn('pipelining') or rcpt_options:
+            return super().sendmail(from_addr, to_addrs, msg, mail_options, rcpt_options)
+
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+        if isinstance(msg, str):
+            msg = _EOL_PATTERN.sub('\r\n', msg).encode('ascii')
+
+        mail_cmd = f"MAIL FROM:{smtplib.quoteaddr(from_addr)}"
+        if self.has_extn('size'):
+            mail_cmd += f" SIZE={len(msg)}"
+        mail_cmd += ''.join(f" {option}" for option in mail_options)
+        commands = [mail_cmd] + [f"RCPT TO:{smtplib.quoteaddr(addr)}" for addr in to_addrs] + ['DATA']
+        if any('\r' in cmd or '\n' in cmd for cmd in commands):
+            raise ValueError("Command and arguments contain prohibited newline characters")
+
+        # One write for the whole envelope - separate small writes would be
+        # held back by Nagle's algorithm until the previous one is ACKed
+        self.send(''.join(f"{cmd}\r\n" for cmd in commands))
+
+        mail_code, mail_resp = self.getreply()
+        senderrs = {}
+        for addr in to_addrs:
+            code, resp = self.getreply()
+            if code not in (250, 251):
+                senderrs[addr] = (code, resp)
+        data_code, data_resp = self.getreply()
+
+        if mail_code != 250:
+            self._abort_transaction(mail_code, data_code)
+            raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+        if len(senderrs) == len(to_addrs):
+            self._abort_transaction(mail_code, data_code)
+            raise smtplib.SMTPRecipientsRefused(senderrs)
+        if data_code != 354:
+            self._abort_transaction(data_code, data_code)
+            raise smtplib.SMTPDataError(data_code, data_resp)
+
+        body = _LEADING_PERIOD_PATTERN.sub(b'..', msg)
+        if not body.endswith(b'\r\n'):
+            body += b'\r\n'
+        self.send(body + b'.\r\n')
+
+        code, resp = self.getreply()
+        if code != 250:
+            self._abort_transaction(code, code)
+            raise smtplib.SMTPDataError(code, resp)
+        return senderrs
+
+    def _abort_transaction(self, code: int, data_code: int):
+        """Reset after a failed pipelined transaction, as smtplib's sendmail does."""
+        if code == 421 or data_code == 421:
+            self.close()
+            return
+        if data_code == 354:
+            # Server accepted DATA despite the failure; end it with an empty
+            # message so the connection is back in sync before resetting
+            self.send(b'.\r\n')
+            self.getreply()
+        try:
+            self.rset()
+        except smtplib.SMTPServerDisconnected:
+            pass
+
+
+class SmtpSession:
+    """
+    SMTP connection shared by several emails.
+
+    Connects, negotiates STARTTLS and logs in on the first send, then reuses
+    the connection so a cycle's error digest and location digests pay for
+    one handshake instead of one each. Use as a context manager; the
+    connection is closed on exit.
+    """
+
+    def __init__(self, smtp_cfg: Optional[Dict[str, Any]] = None):
+        self.smtp_cfg = smtp_cfg or get_smtp_config()
+        self._server: Optional[smtplib.SMTP] = None
+        self._messages_on_connection = 0
+        self.sent_count = 0
+
+    def __enter__(self) -> 'SmtpSession':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def _connect(self):
+        smtp_cfg = self.smtp_cfg
+        # Use timeout to prevent hanging indefinitely
+        server = PipeliningSMTP(smtp_cfg['host'], smtp_cfg['port'], timeout=SMTP_TIMEOUT_SECONDS)
+        try:
+            if smtp_cfg.get('use_tls', True):
+                # Explicit SSL context for starttls - ensures TLS negotiation respects timeout
+                server.starttls(context=_ssl_context())
+            server.login(smtp_cfg['username'], smtp_cfg['password'])
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self._messages_on_connection = 0
+
+    def close(self):
+        """Close the SMTP connection if open."""
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+
+    def supports_8bitmime(self) -> bool:
+        """Whether the server accepts 8-bit message bodies, connecting if needed."""
+        if self._server is None:
+            self._connect()
+        return self._server.has_extn('8bitmime')
+
+    def _sendmail(
+        self,
+        from_address: str,
+        to_addresses: List[str],
+        message: Union[str, bytes],
+        mail_options: Tuple[str, ...]
+    ):
+        try:
+            self._server.sendmail(from_address, to_addresses, message, mail_options)
+        except smtplib.SMTPServerDisconnected:
+            self._server = None
+            raise
+        except smtplib.SMTPException:
+            # Refused recipients/data: sendmail has reset the transaction and
+            # the connection is still usable
+            raise
+        except OSError:
+            # Socket error or timeout mid-transaction - the next send reconnects
+            self._server.close()
+            self._server = None
+            raise
+
+    def send(
+        self,
+        from_address: str,
+        to_addresses: List[str],
+        message: Union[str, bytes],
+        mail_options: Tuple[str, ...] = ()
+    ):
+        """
+        Send a message, connecting or reconnecting as needed.
+
+        Retries once on a fresh connection if the server dropped the
+        previous one. Other SMTP errors are raised to the caller.
+        """
+        if self._server is not None and self._messages_on_connection >= SMTP_SESSION_MAX_MESSAGES:
+            self.close()
+
+        if self._server is None:
+            self._connect()
+            self._sendmail(from_address, to_addresses, message, mail_options)
+        else:
+            try:
+                self._sendmail(from_address, to_addresses, message, mail_options)
+            except smtplib.SMTPServerDisconnected:
+                logger.debug("SMTP connection dropped, reconnecting")
+                self._connect()
+                self._sendmail(from_address, to_addresses, message, mail_options)
+
+        self._messages_on_connection += 1
+        self.sent_count += 1
+
+
+def _fits_8bit(html_body: str) -> bool:
+    """Whether a non-ASCII body can go out unencoded (no line over the SMTP limit)."""
+    return all(len(line) <= SMTP_MAX_LINE_BYTES for line in html_body.encode('utf-8').splitlines())
+
+
+def _send_html(
+    session: SmtpSession,
+    from_address: str,
+    to_addresses: List[str],
+    subject: str,
+    html_body: str
+):
+    """Build the HTML message and send it to all recipients in one transaction."""
+    # ASCII bodies go out as 7bit. Anything else is sent as raw 8-bit UTF-8
+    # when the server supports it, instead of the default base64.
+    eight_bit = not html_body.isascii() and _fits_8bit(html_body) and session.supports_8bitmime()
+
+    # Single-part HTML message; wrap in multipart/alternative only if a
+    # plain-text alternative is ever added
+    msg = MIMEText(html_body, 'html', _UTF8_8BIT if eight_bit else None)
+    msg['Subject'] = subject
+    msg['From'] = from_address
+    msg['To'] = ', '.join(to_addresses)
+
+    # Serialize once, straight to CRLF-terminated bytes, so smtplib doesn't
+    # have to re-scan the message to fix line endings and encode it.
+    # All recipients share this one payload in a single transaction.
+    payload = msg.as_bytes(policy=_WIRE_POLICY)
+
+    session.send(from_address, to_addresses, payload, ('BODY=8BITMIME',) if eight_bit else ())
+
+
+def send_email(
+    to_addresses: List[str],
+    subject: str,
+    html_body: str,
+    session: Optional[SmtpSession] = None
+) -> bool:
+    """
+    Send an HTML email via SMTP.
+
+    Pass an open SmtpSession to reuse its connection (and its already
+    resolved SMTP settings); otherwise a connection is opened just for this
+    email.
+    """
+    smtp_cfg = session.smtp_cfg if session is not None else get_smtp_config()
 
     if not smtp_cfg['username'] or not smtp_cfg['password']:
         logger.warning("SMTP credentials not configured, skipping email")
@@ -34,23 +304,12 @@ def send_email(to_addresses: List[str], subject: str, html_body: str) -> bool:
         return False
 
     try:
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = smtp_cfg['from_address'] or smtp_cfg['username']
-        msg['To'] = ', '.join(to_addresses)
-
-        html_part = MIMEText(html_body, 'html')
-        msg.attach(html_part)
-
-        # Use timeout to prevent hanging indefinitely
-        with smtplib.SMTP(smtp_cfg['host'], smtp_cfg['port'], timeout=SMTP_TIMEOUT_SECONDS) as server:
-            if smtp_cfg.get('use_tls', True):
-                # Create SSL context for starttls - ensures TLS negotiation respects timeout
-                import ssl
-                context = ssl.create_default_context()
-                server.starttls(context=context)
-            server.login(smtp_cfg['username'], smtp_cfg['password'])
-            server.sendmail(msg['From'], to_addresses, msg.as_string())
+        from_address = smtp_cfg['from_address'] or smtp_cfg['username']
+        if session is not None:
+            _send_html(session, from_address, to_addresses, subject, html_body)
+        else:
+            with SmtpSession(smtp_cfg) as single_use:
+                _send_html(single_use, from_address, to_addresses, subject, html_body)
 
         logger.info(f"Email sent successfully to {to_addresses}")
         return True
@@ -66,6 +325,138 @@ def send_email(to_addresses: List[str], subject: str, html_body: str) -> bool:
         return False
 
 
+def _json_preview(obj: Any, limit: int = ERROR_BODY_TRUNCATE_CHARS) -> str:
+    """
+    Pretty-print obj as JSON, cut off after limit characters.
+
+    Encodes incrementally and stops as soon as the limit is reached, so a
+    huge payload never gets serialized (or escaped) in full.
+    """
+    chunks = []
+    size = 0
+    for chunk in json.JSONEncoder(indent=2).iterencode(obj):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            return ''.join(chunks)[:limit] + '\n... [truncated]'
+    return ''.join(chunks)
+
+
+# (border color, status background) for error cards by HTTP status
+_STATUS_STYLE_SERVER = ("#dc2626", "#fee2e2")
+_STATUS_STYLE_RATE_LIMIT = ("#f59e0b", "#fef3c7")
+_STATUS_STYLE_CLIENT = ("#ea580c", "#ffedd5")
+_STATUS_STYLE_OTHER = ("#6366f1", "#e0e7ff")
+
+
+def _status_style(status_code: Any) -> Tuple[str, str]:
+    """Pick the error card colors for a status code (missing codes style as server errors)."""
+    if not isinstance(status_code, int) or not status_code or status_code >= 500:
+        return _STATUS_STYLE_SERVER
+    if status_code == 429:
+        return _STATUS_STYLE_RATE_LIMIT
+    if status_code >= 400:
+        return _STATUS_STYLE_CLIENT
+    return _STATUS_STYLE_OTHER
+
+
+def _render_error_type_badge(err_type: str, count: int) -> str:
+    """Render an error type count badge for the error digest summary."""
+    badge_color = "#dc2626" if count > 2 else "#f59e0b"
+    return f"""
+    <div style="display: inline-block; margin: 4px;">
+        <span style="background: {badge_color}; color: white; padding: 4px 10px; border-radius: 12px; font-size: 12px; font-weight: 500;">
+            {escape_html(err_type)}: {count}
+        </span>
+    </div>
+    """
+
+
+def _render_error_card(i: int, err: Dict[str, Any]) -> str:
+    """Render one error card of the error digest."""
+    # Optional request/response blobs (read once, rendered only if present)
+    response_headers = err.get('response_headers')
+    request_payload = err.get('request_payload')
+    headers_display = escape_html(_json_preview(dict(response_headers))) if response_headers else 'N/A'
+    payload_display = escape_html(_json_preview(request_payload)) if request_payload else 'N/A'
+    response_body = escape_html(err.get('response_body', 'N/A')[:ERROR_BODY_TRUNCATE_CHARS])
+
+    # Escape all user-provided data
+    lead_email = escape_html(err.get('lead_email', 'N/A'))
+    sheet_name = escape_html(err.get('sheet_name', 'N/A'))
+    momence_host = escape_html(err.get('momence_host', 'N/A'))
+    error_type = escape_html(err.get('error_type', 'N/A'))
+    cf_ray = escape_html(err.get('cf_ray', 'N/A'))
+    request_url = escape_html(err.get('request_url', 'N/A'))
+    status_code = err.get('status_code', 'N/A')
+    attempts = err.get('attempts', 1)
+    timestamp = err.get('request_timestamp', err.get('timestamp', 'N/A'))
+    duration_ms = err.get('request_duration_ms', 'N/A')
+
+    # Color code by error severity
+    border_color, status_bg = _status_style(status_code)
+
+    return f"""
+    <div style="background: #fef2f2; border-radius: 8px; padding: 16px; margin-bottom: 16px; border-left: 4px solid {border_color};">
+        <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 12px; flex-wrap: wrap; gap: 8px;">
+            <div>
+                <span style="color: #64748b; font-size: 11px; font-weight: 600;">#{i}</span>
+                <strong style="color: #1e293b; font-size: 16px; margin-left: 8px;">{lead_email}</strong>
+                <div style="color: #64748b; font-size: 13px; margin-top: 4px;">{sheet_name}</div>
+            </div>
+            <div style="text-align: right;">
+                <span style="background: {status_bg}; color: {border_color}; padding: 4px 12px; border-radius: 12px; font-weight: 600; font-size: 13px; display: inline-block;">
+                    HTTP {status_code}
+                </span>
+                {f'<div style="color: #64748b; font-size: 11px; margin-top: 4px;">Attempt {attempts}</div>' if attempts > 1 else ''}
+            </div>
+        </div>
+
+        <table style="width: 100%; font-size: 13px; color: #475569; border-collapse: collapse;">
+            <tr>
+                <td style="padding: 6px 0; width: 120px; vertical-align: top;"><strong>Momence Host:</strong></td>
+                <td style="padding: 6px 0;">{momence_host}</td>
+            </tr>
+            <tr>
+                <td style="padding: 6px 0; vertical-align: top;"><strong>Error Type:</strong></td>
+                <td style="padding: 6px 0;"><code style="background: #e2e8f0; padding: 2px 6px; border-radius: 3px; color: #be185d;">{error_type}</code></td>
+            </tr>
+            <tr>
+                <td style="padding: 6px 0; vertical-align: top;"><strong>Timestamp:</strong></td>
+                <td style="padding: 6px 0;">{timestamp}</td>
+            </tr>
+            <tr>
+                <td style="padding: 6px 0; vertical-align: top;"><strong>Duration:</strong></td>
+                <td style="padding: 6px 0;">{duration_ms}ms</td>
+            </tr>
+            <tr>
+                <td style="padding: 6px 0; vertical-align: top;"><strong>CF-Ray:</strong></td>
+                <td style="padding: 6px 0;"><code style="background: #e2e8f0; padding: 2px 6px; border-radius: 3px; font-size: 11px;">{cf_ray}</code></td>
+            </tr>
+            <tr>
+                <td style="padding: 6px 0; vertical-align: top;"><strong>URL:</strong></td>
+                <td style="padding: 6px 0; word-break: break-all;"><code style="background: #e2e8f0; padding: 2px 6px; border-radius: 3px; font-size: 11px;">{request_url}</code></td>
+            </tr>
+        </table>
+
+        <details style="cursor: pointer; margin-top: 12px;">
+            <summary style="color: #6366f1; font-weight: 500; font-size: 13px;">Request Payload</summary>
+            <pre style="background: #f1f5f9; padding: 10px; border-radius: 6px; font-size: 11px; overflow-x: auto; margin-top: 8px; white-space: pre-wrap;">{payload_display}</pre>
+        </details>
+
+        <details style="cursor: pointer; margin-top: 8px;">
+            <summary style="color: #6366f1; font-weight: 500; font-size: 13px;">Response Headers</summary>
+            <pre style="background: #f1f5f9; padding: 10px; border-radius: 6px; font-size: 11px; overflow-x: auto; margin-top: 8px; white-space: pre-wrap;">{headers_display}</pre>
+        </details>
+
+        <details style="cursor: pointer; margin-top: 8px;">
+            <summary style="color: #6366f1; font-weight: 500; font-size: 13px;">Response Body (first {ERROR_BODY_TRUNCATE_CHARS} chars)</summary>
+            <pre style="background: #f1f5f9; padding: 10px; border-radius: 6px; font-size: 11px; overflow-x: auto; margin-top: 8px; white-space: pre-wrap;">{response_body}</pre>
+        </details>
+    </div>
+    """
+
+
 def build_error_digest_html(errors: List[Dict[str, Any]]) -> str:
     """
     Build a pretty HTML email for error digest (sent to admin).
@@ -78,123 +469,17 @@ def build_error_digest_html(errors: List[Dict[str, Any]]) -> str:
     """
     timestamp = utc_now().strftime('%Y-%m-%d %H:%M:%S UTC')
 
-    # Group errors by type for summary
-    error_types: Dict[str, int] = {}
-    error_hosts: Dict[str, int] = {}
-    for err in errors:
-        err_type = err.get('error_type', 'unknown')
-        error_types[err_type] = error_types.get(err_type, 0) + 1
-        momence_host = err.get('momence_host', 'Unknown')
-        error_hosts[momence_host] = error_hosts.get(momence_host, 0) + 1
-
-    # Build summary stats using list + join (more memory efficient than string concat)
-    summary_items_list = []
-    for err_type, count in sorted(error_types.items(), key=lambda x: -x[1]):
-        badge_color = "#dc2626" if count > 2 else "#f59e0b"
-        summary_items_list.append(f"""
-        <div style="display: inline-block; margin: 4px;">
-            <span style="background: {badge_color}; color: white; padding: 4px 10px; border-radius: 12px; font-size: 12px; font-weight: 500;">
-                {escape_html(err_type)}: {count}
-            </span>
-        </div>
-        """)
-    summary_items = ''.join(summary_items_list)
-
-    # Build error cards using list + join (more memory efficient than string concat)
-    error_cards_list = []
-    for i, err in enumerate(errors, 1):
-        headers_display = escape_html(json.dumps(dict(err.get('response_headers', {})), indent=2)) if err.get('response_headers') else 'N/A'
-        payload_display = escape_html(json.dumps(err.get('request_payload', {}), indent=2)) if err.get('request_payload') else 'N/A'
-        response_body = escape_html(err.get('response_body', 'N/A')[:ERROR_BODY_TRUNCATE_CHARS])
-
-        # Escape all user-provided data
-        lead_email = escape_html(err.get('lead_email', 'N/A'))
-        sheet_name = escape_html(err.get('sheet_name', 'N/A'))
-        momence_host = escape_html(err.get('momence_host', 'N/A'))
-        error_type = escape_html(err.get('error_type', 'N/A'))
-        cf_ray = escape_html(err.get('cf_ray', 'N/A'))
-        request_url = escape_html(err.get('request_url', 'N/A'))
-        status_code = err.get('status_code', 'N/A')
-        attempts = err.get('attempts', 1)
-
-        # Color code by error severity
-        if status_code and isinstance(status_code, int):
-            if status_code >= 500:
-                border_color = "#dc2626"
-                status_bg = "#fee2e2"
-            elif status_code == 429:
-                border_color = "#f59e0b"
-                status_bg = "#fef3c7"
-            elif status_code >= 400:
-                border_color = "#ea580c"
-                status_bg = "#ffedd5"
-            else:
-                border_color = "#6366f1"
-                status_bg = "#e0e7ff"
-        else:
-            border_color = "#dc2626"
-            status_bg = "#fee2e2"
-
-        error_cards_list.append(f"""
-        <div style="background: #fef2f2; border-radius: 8px; padding: 16px; margin-bottom: 16px; border-left: 4px solid {border_color};">
-            <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 12px; flex-wrap: wrap; gap: 8px;">
-                <div>
-                    <span style="color: #64748b; font-size: 11px; font-weight: 600;">#{i}</span>
-                    <strong style="color: #1e293b; font-size: 16px; margin-left: 8px;">{lead_email}</strong>
-                    <div style="color: #64748b; font-size: 13px; margin-top: 4px;">{sheet_name}</div>
-                </div>
-                <div style="text-align: right;">
-                    <span style="background: {status_bg}; color: {border_color}; padding: 4px 12px; border-radius: 12px; font-weight: 600; font-size: 13px; display: inline-block;">
-                        HTTP {status_code}
-                    </span>
-                    {f'<div style="color: #64748b; font-size: 11px; margin-top: 4px;">Attempt {attempts}</div>' if attempts > 1 else ''}
-                </div>
-            </div>
-
-            <table style="width: 100%; font-size: 13px; color: #475569; border-collapse: collapse;">
-                <tr>
-                    <td style="padding: 6px 0; width: 120px; vertical-align: top;"><strong>Momence Host:</strong></td>
-                    <td style="padding: 6px 0;">{momence_host}</td>
-                </tr>
-                <tr>
-                    <td style="padding: 6px 0; vertical-align: top;"><strong>Error Type:</strong></td>
-                    <td style="padding: 6px 0;"><code style="background: #e2e8f0; padding: 2px 6px; border-radius: 3px; color: #be185d;">{error_type}</code></td>
-                </tr>
-                <tr>
-                    <td style="padding: 6px 0; vertical-align: top;"><strong>Timestamp:</strong></td>
-                    <td style="padding: 6px 0;">{err.get('request_timestamp', err.get('timestamp', 'N/A'))}</td>
-                </tr>
-                <tr>
-                    <td style="padding: 6px 0; vertical-align: top;"><strong>Duration:</strong></td>
-                    <td style="padding: 6px 0;">{err.get('request_duration_ms', 'N/A')}ms</td>
-                </tr>
-                <tr>
-                    <td style="padding: 6px 0; vertical-align: top;"><strong>CF-Ray:</strong></td>
-                    <td style="padding: 6px 0;"><code style="background: #e2e8f0; padding: 2px 6px; border-radius: 3px; font-size: 11px;">{cf_ray}</code></td>
-                </tr>
-                <tr>
-                    <td style="padding: 6px 0; vertical-align: top;"><strong>URL:</strong></td>
-                    <td style="padding: 6px 0; word-break: break-all;"><code style="background: #e2e8f0; padding: 2px 6px; border-radius: 3px; font-size: 11px;">{request_url}</code></td>
-                </tr>
-            </table>
-
-            <details style="cursor: pointer; margin-top: 12px;">
-                <summary style="color: #6366f1; font-weight: 500; font-size: 13px;">Request Payload</summary>
-                <pre style="background: #f1f5f9; padding: 10px; border-radius: 6px; font-size: 11px; overflow-x: auto; margin-top: 8px; white-space: pre-wrap;">{payload_display}</pre>
-            </details>
+    # Error counts by type and by host for the summary
+    error_types = Counter(err.get('error_type', 'unknown') for err in errors)
+    error_hosts = Counter(err.get('momence_host', 'Unknown') for err in errors)
 
-            <details style="cursor: pointer; margin-top: 8px;">
-                <summary style="color: #6366f1; font-weight: 500; font-size: 13px;">Response Headers</summary>
-                <pre style="background: #f1f5f9; padding: 10px; border-radius: 6px; font-size: 11px; overflow-x: auto; margin-top: 8px; white-space: pre-wrap;">{headers_display}</pre>
-            </details>
-
-            <details style="cursor: pointer; margin-top: 8px;">
-                <summary style="color: #6366f1; font-weight: 500; font-size: 13px;">Response Body (first {ERROR_BODY_TRUNCATE_CHARS} chars)</summary>
-                <pre style="background: #f1f5f9; padding: 10px; border-radius: 6px; font-size: 11px; overflow-x: auto; margin-top: 8px; white-space: pre-wrap;">{response_body}</pre>
-            </details>
-        </div>
-        """)
-    error_cards = ''.join(error_cards_list)
+    # str.join turns any iterable into a list before joining, so build the
+    # list directly with a comprehension rather than a generator
+    summary_items = ''.join([
+        _render_error_type_badge(err_type, count)
+        for err_type, count in error_types.most_common()
+    ])
+    error_cards = ''.join([_render_error_card(i, err) for i, err in enumerate(errors, 1)])
 
     html = f"""
     <!DOCTYPE html>
@@ -256,6 +541,107 @@ def build_error_digest_html(errors: List[Dict[str, Any]]) -> str:
     return html
 
 
+def _render_source_badge(source: str, count: int) -> str:
+    """Render a lead source count badge for the leads digest."""
+    return f"""
+    <span style="display: inline-block; background: #e0e7ff; color: #4338ca; padding: 4px 10px; border-radius: 12px; font-size: 12px; margin: 4px;">
+        {escape_html(source)}: {count}
+    </span>
+    """
+
+
+def _render_lead_card(lead: Dict[str, Any], host_id_escaped: str) -> str:
+    """
+    Render one lead card of the leads digest.
+
+    host_id_escaped is the already-escaped Momence host ID ('' if unknown),
+    escaped once per digest rather than once per card.
+    """
+    success = lead.get('success')
+    status_bg = '#d1fae5' if success else '#fef3c7'
+    status_color = '#059669' if success else '#d97706'
+    status_text = 'Synced to Momence' if success else 'Pending Retry'
+
+    # Escape all user-provided data
+    email = lead.get('email', '')
+    email_escaped = escape_html(email)
+    email_encoded = urllib.parse.quote(email)
+    first_name = escape_html(lead.get('firstName', ''))
+    last_name = escape_html(lead.get('lastName', ''))
+    phone_number = escape_html(lead.get('phoneNumber', ''))
+    sheet_name = escape_html(lead.get('sheetName', '-'))
+
+    momence_link = f"https://momence.com/dashboard/{host_id_escaped}/search?query={email_encoded}" if host_id_escaped else ""
+
+    # Build name display
+    full_name = f"{first_name} {last_name}".strip() or "Unknown"
+
+    # Build optional fields as a clean list
+    extra_fields_html = ""
+    extra_items = []
+    if lead.get('campaign'):
+        extra_items.append(f"<strong>Campaign:</strong> {escape_html(lead.get('campaign'))}")
+    if lead.get('form'):
+        extra_items.append(f"<strong>Form:</strong> {escape_html(lead.get('form'))}")
+    if lead.get('created'):
+        extra_items.append(f"<strong>Captured:</strong> {escape_html(lead.get('created'))}")
+    if lead.get('platform'):
+        extra_items.append(f"<strong>Platform:</strong> {escape_html(lead.get('platform'))}")
+    if lead.get('discoveryAnswer'):
+        extra_items.append(f"<strong>How they heard:</strong> {escape_html(lead.get('discoveryAnswer'))}")
+    if lead.get('zipCode'):
+        extra_items.append(f"<strong>Zip:</strong> {escape_html(lead.get('zipCode'))}")
+
+    if extra_items:
+        extra_fields_html = f"""
+        <div style="background: #f1f5f9; border-radius: 6px; padding: 10px; margin-top: 12px; font-size: 12px; color: #64748b;">
+            {' &bull; '.join(extra_items)}
+        </div>
+        """
+
+    momence_link_html = ""
+    if momence_link and success:
+        momence_link_html = f"""
+        <a href="{momence_link}" style="display: inline-block; background: #6366f1; color: white; padding: 8px 16px; border-radius: 6px; font-size: 13px; font-weight: 500; text-decoration: none; margin-top: 12px;">
+            View in Momence
+        </a>
+        """
+
+    return f"""
+        <div style="background: #ffffff; border-radius: 12px; padding: 20px; margin-bottom: 12px; border: 1px solid #e2e8f0; box-shadow: 0 1px 3px rgba(0,0,0,0.05);">
+            <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 12px;">
+                <div>
+                    <div style="font-size: 17px; font-weight: 600; color: #1e293b;">{full_name}</div>
+                    <div style="font-size: 12px; color: #94a3b8; margin-top: 2px;">{sheet_name}</div>
+                </div>
+                <span style="background: {status_bg}; color: {status_color}; padding: 4px 10px; border-radius: 12px; font-size: 11px; font-weight: 600;">
+                    {status_text}
+                </span>
+            </div>
+
+            <table style="width: 100%; font-size: 14px; color: #475569;">
+                <tr>
+                    <td style="padding: 4px 0; width: 30px; vertical-align: middle;">
+                        <span style="color: #6366f1;">@</span>
+                    </td>
+                    <td style="padding: 4px 0;">
+                        <a href="mailto:{email_escaped}" style="color: #1e293b; text-decoration: none;">{email_escaped}</a>
+                    </td>
+                </tr>
+                {f'''<tr>
+                    <td style="padding: 4px 0; vertical-align: middle;">
+                        <span style="color: #6366f1;">#</span>
+                    </td>
+                    <td style="padding: 4px 0; color: #1e293b;">{phone_number}</td>
+                </tr>''' if phone_number else ''}
+            </table>
+
+            {extra_fields_html}
+            {momence_link_html}
+        </div>
+    """
+
+
 def build_leads_digest_html(host_name: str, leads: List[Dict[str, Any]], host_id: Optional[str] = None) -> str:
     """
     Build a pretty HTML email for new leads digest.
@@ -270,113 +656,20 @@ def build_leads_digest_html(host_name: str, leads: List[Dict[str, Any]], host_id
     """
     timestamp = utc_now().strftime('%Y-%m-%d %H:%M:%S UTC')
 
-    # Group leads by source/sheet
-    leads_by_source: Dict[str, List] = {}
     successful_count = sum(1 for lead in leads if lead.get('success'))
     pending_count = len(leads) - successful_count
 
-    for lead in leads:
-        source = lead.get('sheetName', 'Unknown')
-        if source not in leads_by_source:
-            leads_by_source[source] = []
-        leads_by_source[source].append(lead)
-
-    # Build source summary badges using list + join (more memory efficient)
-    source_badges_list = []
-    for source, source_leads in sorted(leads_by_source.items(), key=lambda x: -len(x[1])):
-        source_badges_list.append(f"""
-        <span style="display: inline-block; background: #e0e7ff; color: #4338ca; padding: 4px 10px; border-radius: 12px; font-size: 12px; margin: 4px;">
-            {escape_html(source)}: {len(source_leads)}
-        </span>
-        """)
-    source_badges = ''.join(source_badges_list)
-
-    # Build lead cards using list + join (more memory efficient)
-    lead_cards_list = []
-    for lead in leads:
-        status_bg = '#d1fae5' if lead.get('success') else '#fef3c7'
-        status_color = '#059669' if lead.get('success') else '#d97706'
-        status_text = 'Synced to Momence' if lead.get('success') else 'Pending Retry'
-
-        # Escape all user-provided data
-        email = lead.get('email', '')
-        email_escaped = escape_html(email)
-        email_encoded = urllib.parse.quote(email)
-        first_name = escape_html(lead.get('firstName', ''))
-        last_name = escape_html(lead.get('lastName', ''))
-        phone_number = escape_html(lead.get('phoneNumber', ''))
-        sheet_name = escape_html(lead.get('sheetName', '-'))
-
-        momence_link = f"https://momence.com/dashboard/{escape_html(host_id)}/search?query={email_encoded}" if host_id else ""
-
-        # Build name display
-        full_name = f"{first_name} {last_name}".strip() or "Unknown"
-
-        # Build optional fields as a clean list
-        extra_fields_html = ""
-        extra_items = []
-        if lead.get('campaign'):
-            extra_items.append(f"<strong>Campaign:</strong> {escape_html(lead.get('campaign'))}")
-        if lead.get('form'):
-            extra_items.append(f"<strong>Form:</strong> {escape_html(lead.get('form'))}")
-        if lead.get('created'):
-            extra_items.append(f"<strong>Captured:</strong> {escape_html(lead.get('created'))}")
-        if lead.get('platform'):
-            extra_items.append(f"<strong>Platform:</strong> {escape_html(lead.get('platform'))}")
-        if lead.get('discoveryAnswer'):
-            extra_items.append(f"<strong>How they heard:</strong> {escape_html(lead.get('discoveryAnswer'))}")
-        if lead.get('zipCode'):
-            extra_items.append(f"<strong>Zip:</strong> {escape_html(lead.get('zipCode'))}")
-
-        if extra_items:
-            extra_fields_html = f"""
-            <div style="background: #f1f5f9; border-radius: 6px; padding: 10px; margin-top: 12px; font-size: 12px; color: #64748b;">
-                {' &bull; '.join(extra_items)}
-            </div>
-            """
-
-        momence_link_html = ""
-        if momence_link and lead.get('success'):
-            momence_link_html = f"""
-            <a href="{momence_link}" style="display: inline-block; background: #6366f1; color: white; padding: 8px 16px; border-radius: 6px; font-size: 13px; font-weight: 500; text-decoration: none; margin-top: 12px;">
-                View in Momence
-            </a>
-            """
-
-        lead_cards_list.append(f"""
-            <div style="background: #ffffff; border-radius: 12px; padding: 20px; margin-bottom: 12px; border: 1px solid #e2e8f0; box-shadow: 0 1px 3px rgba(0,0,0,0.05);">
-                <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 12px;">
-                    <div>
-                        <div style="font-size: 17px; font-weight: 600; color: #1e293b;">{full_name}</div>
-                        <div style="font-size: 12px; color: #94a3b8; margin-top: 2px;">{sheet_name}</div>
-                    </div>
-                    <span style="background: {status_bg}; color: {status_color}; padding: 4px 10px; border-radius: 12px; font-size: 11px; font-weight: 600;">
-                        {status_text}
-                    </span>
-                </div>
+    # Lead count per source/sheet, busiest first (ties keep first-seen order)
+    source_counts = Counter(lead.get('sheetName', 'Unknown') for lead in leads)
 
-                <table style="width: 100%; font-size: 14px; color: #475569;">
-                    <tr>
-                        <td style="padding: 4px 0; width: 30px; vertical-align: middle;">
-                            <span style="color: #6366f1;">@</span>
-                        </td>
-                        <td style="padding: 4px 0;">
-                            <a href="mailto:{email_escaped}" style="color: #1e293b; text-decoration: none;">{email_escaped}</a>
-                        </td>
-                    </tr>
-                    {f'''<tr>
-                        <td style="padding: 4px 0; vertical-align: middle;">
-                            <span style="color: #6366f1;">#</span>
-                        </td>
-                        <td style="padding: 4px 0; color: #1e293b;">{phone_number}</td>
-                    </tr>''' if phone_number else ''}
-                </table>
-
-                {extra_fields_html}
-                {momence_link_html}
-            </div>
-        """)
-    lead_cards = ''.join(lead_cards_list)
+    # str.join turns any iterable into a list before joining, so build the
+    # list directly with a comprehension rather than a generator
+    source_badges = ''.join([
+        _render_source_badge(source, count)
+        for source, count in source_counts.most_common()
+    ])
+    host_id_escaped = escape_html(host_id) if host_id else ''
+    lead_cards = ''.join([_render_lead_card(lead, host_id_escaped) for lead in leads])
 
     # Status summary section
     status_summary = ""
@@ -435,10 +728,10 @@ def build_leads_digest_html(host_name: str, leads: List[Dict[str, Any]], host_id
 
                 <!-- Momence Dashboard Link -->
                 {f'''<div style="text-align: center; margin-top: 16px;">
-                    <a href="https://momence.com/dashboard/{escape_html(host_id)}/leads?sortBy=createdAt&sortOrder=DESC" style="display: inline-block; background: #1e293b; color: white; padding: 12px 24px; border-radius: 8px; font-size: 14px; font-weight: 500; text-decoration: none;">
+                    <a href="https://momence.com/dashboard/{host_id_escaped}/leads?sortBy=createdAt&sortOrder=DESC" style="display: inline-block; background: #1e293b; color: white; padding: 12px 24px; border-radius: 8px; font-size: 14px; font-weight: 500; text-decoration: none;">
                         Open Momence Dashboard
                     </a>
-                </div>''' if host_id else ''}
+                </div>''' if host_id_escaped else ''}
 
                 <!-- Footer -->
                 <div style="margin-top: 24px; padding-top: 16px; border-top: 1px solid #e2e8f0; text-align: center;">
@@ -454,8 +747,8 @@ def build_leads_digest_html(host_name: str, leads: List[Dict[str, Any]], host_id
     return html
 
 
-def send_error_digest(errors: List[Dict[str, Any]]) -> bool:
-    """Send error digest email to admin."""
+def send_error_digest(errors: List[Dict[str, Any]], session: Optional[SmtpSession] = None) -> bool:
+    """Send error digest email to admin, optionally over an open SmtpSession."""
     email_config = get_email_config()
     admin_emails = resolve_email_list(email_config.get('admin_recipients', []))
     if not admin_emails:
@@ -467,21 +760,38 @@ def send_error_digest(errors: List[Dict[str, Any]]) -> bool:
 
     html = build_error_digest_html(errors)
     subject = f"Lead Monitor: {len(errors)} Error(s) Detected"
-    return send_email(admin_emails, subject, html)
+    return send_email(admin_emails, subject, html, session=session)
 
 
-def send_location_leads_digest(location_name: str, leads: List[Dict[str, Any]]) -> bool:
+def send_location_leads_digest(
+    location_name: str,
+    leads: List[Dict[str, Any]],
+    session: Optional[SmtpSession] = None,
+    sheets_by_name: Optional[Dict[str, Dict[str, Any]]] = None,
+    hosts: Optional[Dict[str, Dict[str, Any]]] = None
+) -> bool:
     """
     Send new leads digest email for a specific location.
     Only sends if location has notification_email configured.
+    Pass an open SmtpSession to share one connection across locations, and
+    sheet/host config snapshots (sheets keyed by name) to skip the database
+    lookups when sending many digests.
     """
-    sheet_cfg = get_sheet_config_by_name(location_name)
+    if sheets_by_name is not None:
+        sheet_cfg = sheets_by_name.get(location_name)
+    else:
+        sheet_cfg = get_sheet_config_by_name(location_name)
     if not sheet_cfg:
         logger.warning(f"No sheet config found for location '{location_name}'")
         return False
 
     momence_host_name = sheet_cfg.get('momence_host', '')
-    host_cfg = get_host_config(momence_host_name) if momence_host_name else None
+    if not momence_host_name:
+        host_cfg = None
+    elif hosts is not None:
+        host_cfg = hosts.get(momence_host_name)
+    else:
+        host_cfg = get_host_config(momence_host_name)
 
     # Only send if location has email configured
     location_email = sheet_cfg.get('notification_email', '').strip()
@@ -501,7 +811,84 @@ def send_location_leads_digest(location_name: str, leads: List[Dict[str, Any]])
     html = build_leads_digest_html(location_name, leads, host_id=host_id)
     subject = f"{len(leads)} New Lead(s) - {location_name}"
     logger.info(f"Sending location email for '{location_name}' to {recipients}")
-    return send_email(recipients, subject, html)
+    return send_email(recipients, subject, html, session=session)
+
+
+def send_all_digests(
+    errors: List[Dict[str, Any]],
+    leads_by_location: Dict[str, List[Dict[str, Any]]]
+) -> Tuple[bool, Dict[str, bool]]:
+    """
+    Send the error digest and every location's leads digest concurrently.
+
+    Each digest spends most of its time waiting on the SMTP server, so they
+    are spread over a small thread pool. Every worker thread keeps its own
+    SmtpSession (sessions aren't thread-safe) and reuses it for the
+    digests it picks up.
+
+    Args:
+        errors: Errors for the admin digest; pass an empty list to skip it
+        leads_by_location: Leads per location name
+
+    Returns:
+        Tuple of (error digest sent, dict of location name -> digest sent)
+    """
+    tasks = {}
+    if errors:
+        tasks[None] = lambda session: send_error_digest(errors, session=session)
+
+    if any(leads_by_location.values()):
+        # Read sheet and host configs once for all locations instead of
+        # querying the database for each digest
+        sheets_by_name: Dict[str, Dict[str, Any]] = {}
+        for sheet in get_sheets_config():
+            sheets_by_name.setdefault(sheet.get('name'), sheet)
+        hosts = get_momence_hosts()
+
+        for location_name, leads in leads_by_location.items():
+            if leads:
+                tasks[location_name] = (
+                    lambda session, name=location_name, leads=leads:
+                    send_location_leads_digest(
+                        name, leads, session=session, sheets_by_name=sheets_by_name, hosts=hosts
+                    )
+                )
+
+    error_digest_sent = False
+    location_results: Dict[str, bool] = {}
+    if not tasks:
+        return error_digest_sent, location_results
+
+    smtp_cfg = get_smtp_config()
+    sessions: List[SmtpSession] = []
+    thread_state = threading.local()
+
+    def run_task(task):
+        session = getattr(thread_state, 'session', None)
+        if session is None:
+            session = thread_state.session = SmtpSession(smtp_cfg)
+            sessions.append(session)
+        return task(session)
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(DIGEST_SEND_WORKERS, len(tasks))) as executor:
+            futures = {executor.submit(run_task, task): name for name, task in tasks.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    sent = bool(future.result())
+                except Exception as e:
+                    logger.error(f"Failed to send {'error' if name is None else repr(name)} digest: {type(e).__name__}: {e}")
+                    sent = False
+                if name is None:
+                    error_digest_sent = sent
+                else:
+                    location_results[name] = sent
+    finally:
+        for session in sessions:
+            session.close()
+
+    return error_digest_sent, location_results
 
 
 def send_test_location_email(location_name: str) -> Dict[str, Any]:
@@ -20,7 +20,10 @@ Usage:
 
 import os
 import logging
-from typing import Optional, Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Optional, Dict, Set, Tuple
 from functools import lru_cache
 
 logger = logging.getLogger(__name__)
@@ -39,10 +42,42 @@ if IS_CLOUD_RUN and not _gcp_project_env:
     # Don't fail immediately - let the secret access fail with a clear error
 GCP_PROJECT_ID = _gcp_project_env or 'tvs-dashboard'  # Fallback for local dev only
 
-# Secret Manager client (lazy loaded)
+# Where secrets are resolved from on Cloud Run:
+# - 'secret_manager' (default): Secret Manager first, env var as fallback
+# - 'env': env vars only, Secret Manager is never called
+# - 'auto': the env var when it is set, otherwise Secret Manager
+SECRETS_SOURCE = os.getenv('SECRETS_SOURCE', 'secret_manager').strip().lower()
+if SECRETS_SOURCE not in ('secret_manager', 'env', 'auto'):
+    logger.warning(f"Unknown SECRETS_SOURCE '{SECRETS_SOURCE}', using 'secret_manager'")
+    SECRETS_SOURCE = 'secret_manager'
+
+# Secret Manager client (lazy loaded, created once per process)
 _client = None
-_secrets_cache: Dict[str, tuple] = {}  # {cache_key: (value, timestamp)}
+_client_lock = threading.Lock()
+_secrets_cache: Dict[str, Tuple[Any, float, float]] = {}  # {cache_key: (value or _MISSING, expires_at, refresh_at)}
+_cache_lock = threading.Lock()
 SECRET_CACHE_TTL = 3600  # 1 hour TTL for cached secrets
+SECRET_REFRESH_FRACTION = 0.9  # Refresh in the background once 90% of the TTL has passed
+
+# Background refreshes of secrets close to expiry (keys in flight are tracked
+# so each secret is refreshed at most once at a time)
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="secret-refresh")
+_refreshing: Set[str] = set()
+_refresh_lock = threading.Lock()
+SECRET_CACHE_MAX_ENTRIES = 256  # Bound for tenant-specific secret names
+SECRET_NEGATIVE_CACHE_TTL = 300  # Remember secrets missing from Secret Manager for 5 minutes
+
+# Cache TTL overrides by secret name (also applied to tenant-specific
+# variants, '<name>-<tenant>'): API tokens may be rotated from another
+# instance, while the credentials and encryption key practically never change
+SECRET_TTL_OVERRIDES: Dict[str, int] = {
+    'lead-monitor-momence-api-token': 300,
+    'lead-monitor-google-credentials': 86400,
+    'lead-monitor-encryption-key': 86400,
+}
+
+# Cache marker for a secret that Secret Manager reported as not found
+_MISSING = object()
 
 # Mapping of secret names to environment variable fallbacks
 # Secret names use "lead-monitor-" prefix in Secret Manager
@@ -57,27 +92,158 @@ SECRET_ENV_MAPPING = {
     'lead-monitor-slack-webhook-url': 'SLACK_WEBHOOK_URL',
 }
 
+# Retry budget for reading a secret: transient UNAVAILABLE / DEADLINE_EXCEEDED
+# errors are retried with jittered backoff for at most a few seconds (the
+# library default retries for up to a minute) before falling back to env vars
+SECRET_ACCESS_RETRY_DEADLINE = 3.0
+SECRET_ACCESS_TIMEOUT = 5.0
+
+# gRPC channel options for the Secret Manager client. The message size
+# limits are the library defaults. Keepalive pings are also sent while no
+# call is in flight, so the HTTP/2 connection stays open between bursts of
+# secret lookups; every 5 minutes is well above the interval Google's
+# frontends answer with GOAWAY too_many_pings.
+GRPC_CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+    ("grpc.keepalive_time_ms", 300000),
+    ("grpc.keepalive_timeout_ms", 20000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
 
 def _get_client():
-    """Get or create the Secret Manager client."""
+    """
+    Get or create the Secret Manager client.
+
+    The library is imported on first use only (it pulls in gRPC, which
+    local runs never need). Creation is locked so concurrent first calls,
+    e.g. from prefetch_all(), share one client and channel.
+    """
     global _client
     if _client is None:
-        try:
-            from google.cloud import secretmanager
-            _client = secretmanager.SecretManagerServiceClient()
-            logger.info("Secret Manager client initialized")
-        except ImportError:
-            logger.warning(
-                "google-cloud-secret-manager not installed. "
-                "Install with: pip install google-cloud-secret-manager"
-            )
-            _client = False  # Mark as unavailable
-        except Exception as e:
-            logger.warning(f"Failed to initialize Secret Manager client: {e}")
-            _client = False
+        with _client_lock:
+            if _client is None:
+                _client = _create_client()
     return _client if _client else None
 
 
+def _create_client():
+    """Create the client on a keepalive gRPC channel, or return False if unavailable."""
+    try:
+        from google.cloud import secretmanager
+        from google.cloud.secretmanager_v1.services.secret_manager_service.transports import (
+            SecretManagerServiceGrpcTransport
+        )
+    except ImportError:
+        logger.warning(
+            "google-cloud-secret-manager not installed. "
+            "Install with: pip install google-cloud-secret-manager"
+        )
+        return False  # Mark as unavailable
+
+    try:
+        channel = SecretManagerServiceGrpcTransport.create_channel(options=GRPC_CHANNEL_OPTIONS)
+        client = secretmanager.SecretManagerServiceClient(
+            transport=SecretManagerServiceGrpcTransport(channel=channel)
+        )
+        logger.info("Secret Manager client initialized")
+        return client
+    except Exception as e:
+        logger.warning(f"Failed to initialize Secret Manager client: {e}")
+        return False
+
+
+def _secret_ttl(secret_name: str) -> int:
+    """Cache TTL for a secret, honoring SECRET_TTL_OVERRIDES."""
+    for name, ttl in SECRET_TTL_OVERRIDES.items():
+        if secret_name == name or secret_name.startswith(f"{name}-"):
+            return ttl
+    return SECRET_CACHE_TTL
+
+
+def _cache_get(cache_key: str) -> Tuple[Any, bool]:
+    """
+    Look up a cached secret.
+
+    Returns:
+        Tuple of (value, or _MISSING, or None if absent/expired;
+        whether the entry is due for a background refresh)
+    """
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _secrets_cache.get(cache_key)
+        if entry is None:
+            return None, False
+        value, expires_at, refresh_at = entry
+        if now >= expires_at:
+            del _secrets_cache[cache_key]
+            return None, False
+        return value, now >= refresh_at
+
+
+def _cache_put(cache_key: str, value: Any, ttl: float = SECRET_CACHE_TTL):
+    """Cache a secret for ttl seconds, evicting expired (then oldest) entries when full."""
+    now = time.monotonic()
+    with _cache_lock:
+        _secrets_cache.pop(cache_key, None)
+        if len(_secrets_cache) >= SECRET_CACHE_MAX_ENTRIES:
+            for key in [k for k, entry in _secrets_cache.items() if now >= entry[1]]:
+                del _secrets_cache[key]
+            while len(_secrets_cache) >= SECRET_CACHE_MAX_ENTRIES:
+                del _secrets_cache[next(iter(_secrets_cache))]
+        _secrets_cache[cache_key] = (value, now + ttl, now + ttl * SECRET_REFRESH_FRACTION)
+
+
+def _cache_invalidate(cache_key: str):
+    """Drop a cached secret so the next lookup fetches it again."""
+    with _cache_lock:
+        _secrets_cache.pop(cache_key, None)
+
+
+def _use_secret_manager(env_fallback: Optional[str]) -> bool:
+    """Whether a secret should be looked up in Secret Manager, per IS_CLOUD_RUN and SECRETS_SOURCE."""
+    if not IS_CLOUD_RUN or SECRETS_SOURCE == 'env':
+        return False
+    if SECRETS_SOURCE == 'auto' and env_fallback and os.getenv(env_fallback):
+        return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def _access_retry():
+    """Retry policy for access_secret_version (built on first use, like the client)."""
+    from google.api_core import exceptions as core_exceptions
+    from google.api_core import retry as retries
+    return retries.Retry(
+        predicate=retries.if_exception_type(
+            core_exceptions.ServiceUnavailable,
+            core_exceptions.DeadlineExceeded,
+        ),
+        initial=0.1,
+        maximum=1.0,
+        multiplier=2.0,
+        deadline=SECRET_ACCESS_RETRY_DEADLINE,
+    )
+
+
+def _access_secret(client, secret_name: str, version: str = "latest") -> str:
+    """Read a secret version from Secret Manager within the retry budget."""
+    name = f"projects/{GCP_PROJECT_ID}/secrets/{secret_name}/versions/{version}"
+    response = client.access_secret_version(
+        request={"name": name},
+        retry=_access_retry(),
+        timeout=SECRET_ACCESS_TIMEOUT,
+    )
+    return response.payload.data.decode("UTF-8")
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Whether a Secret Manager error means the secret (version) doesn't exist."""
+    return getattr(error, 'code', None) == 404 or "NOT_FOUND" in str(error)
+
+
 def get_secret(
     secret_name: str,
     env_fallback: str = None,
@@ -102,36 +268,54 @@ def get_secret(
     Raises:
         ValueError: If required=True and secret is not found
     """
-    import time
-
-    # Check cache first (with TTL)
-    cache_key = f"{secret_name}:{version}"
-    if cache_key in _secrets_cache:
-        cached_value, cached_time = _secrets_cache[cache_key]
-        if time.time() - cached_time < SECRET_CACHE_TTL:
-            return cached_value
-        # Cache expired, remove it
-        del _secrets_cache[cache_key]
-
     # Determine env var fallback
     if env_fallback is None:
         env_fallback = SECRET_ENV_MAPPING.get(secret_name)
 
+    # Check cache first (with TTL); a value close to expiry is still served
+    # while a background refresh fetches the new one
+    cache_key = f"{secret_name}:{version}"
+    cached_value, refresh_due = _cache_get(cache_key)
+    if cached_value is not None and cached_value is not _MISSING:
+        if refresh_due and IS_CLOUD_RUN:
+            _schedule_refresh(secret_name, env_fallback, version)
+        return cached_value
+
+    secret_value = _resolve_secret(secret_name, env_fallback, version, skip_secret_manager=cached_value is _MISSING)
+
+    # Handle required secrets
+    if required and not secret_value:
+        raise ValueError(
+            f"Required secret '{secret_name}' not found. "
+            f"Set it in Secret Manager or as env var '{env_fallback}'"
+        )
+
+    return secret_value
+
+
+def _resolve_secret(
+    secret_name: str,
+    env_fallback: Optional[str],
+    version: str,
+    skip_secret_manager: bool = False
+) -> Optional[str]:
+    """Fetch a secret from Secret Manager (on Cloud Run) or the env var, and cache it."""
+    cache_key = f"{secret_name}:{version}"
     secret_value = None
 
-    # On Cloud Run, try Secret Manager first
-    if IS_CLOUD_RUN:
+    # On Cloud Run, try Secret Manager first (unless it recently reported
+    # the secret as missing - the env var is still checked below)
+    if not skip_secret_manager and _use_secret_manager(env_fallback):
         client = _get_client()
         if client:
             try:
-                # Build the resource name
-                name = f"projects/{GCP_PROJECT_ID}/secrets/{secret_name}/versions/{version}"
-                response = client.access_secret_version(request={"name": name})
-                secret_value = response.payload.data.decode("UTF-8")
+                secret_value = _access_secret(client, secret_name, version)
                 logger.debug(f"Retrieved secret '{secret_name}' from Secret Manager")
             except Exception as e:
                 # Debug level - expected when secrets are in env vars instead of Secret Manager
                 logger.debug(f"Secret '{secret_name}' not in Secret Manager, will try env var: {e}")
+                if _is_not_found(e):
+                    _cache_put(cache_key, _MISSING, SECRET_NEGATIVE_CACHE_TTL)
 
     # Fall back to environment variable
     if secret_value is None and env_fallback:
@@ -139,20 +323,81 @@ def get_secret(
         if secret_value:
             logger.debug(f"Using environment variable '{env_fallback}' for secret '{secret_name}'")
 
-    # Cache the result with timestamp (even if None, to avoid repeated lookups)
+    # Cache the result until its TTL expires
     if secret_value:
-        _secrets_cache[cache_key] = (secret_value, time.time())
-
-    # Handle required secrets
-    if required and not secret_value:
-        raise ValueError(
-            f"Required secret '{secret_name}' not found. "
-            f"Set it in Secret Manager or as env var '{env_fallback}'"
-        )
+        _cache_put(cache_key, secret_value, _secret_ttl(secret_name))
 
     return secret_value
 
 
+def _schedule_refresh(secret_name: str, env_fallback: Optional[str], version: str):
+    """Re-resolve a secret in the background unless a refresh is already running."""
+    cache_key = f"{secret_name}:{version}"
+    with _refresh_lock:
+        if cache_key in _refreshing:
+            return
+        _refreshing.add(cache_key)
+
+    def refresh():
+        try:
+            _resolve_secret(secret_name, env_fallback, version)
+        except Exception as e:
+            logger.debug(f"Background refresh of secret '{secret_name}' failed: {e}")
+        finally:
+            with _refresh_lock:
+                _refreshing.discard(cache_key)
+
+    try:
+        _refresh_executor.submit(refresh)
+    except RuntimeError:
+        # Executor shut down (interpreter exiting) - the entry just expires
+        with _refresh_lock:
+            _refreshing.discard(cache_key)
+
+
+def prefetch_all(max_workers: int = 8) -> int:
+    """
+    Fetch every secret in SECRET_ENV_MAPPING from Secret Manager in parallel.
+
+    Warms the cache at startup so the first get_secret() calls don't each
+    pay a serial round trip. Secrets that can't be fetched are left for
+    get_secret() to resolve (and fall back to env vars) as usual.
+    Secrets that SECRETS_SOURCE resolves from env vars, or that are
+    already cached, are skipped. No-op outside Cloud Run.
+
+    Returns:
+        Number of secrets fetched
+    """
+    secret_names = [
+        name for name, env_var in SECRET_ENV_MAPPING.items()
+        if _use_secret_manager(env_var) and _cache_get(f"{name}:latest")[0] is None
+    ]
+    if not secret_names:
+        return 0
+    client = _get_client()
+    if not client:
+        return 0
+
+    fetched = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_access_secret, client, secret_name): secret_name for secret_name in secret_names}
+        for future in as_completed(futures):
+            secret_name = futures[future]
+            try:
+                secret_value = future.result()
+            except Exception as e:
+                logger.debug(f"Secret '{secret_name}' not prefetched: {e}")
+                if _is_not_found(e):
+                    _cache_put(f"{secret_name}:latest", _MISSING, SECRET_NEGATIVE_CACHE_TTL)
+                continue
+            if secret_value:
+                _cache_put(f"{secret_name}:latest", secret_value, _secret_ttl(secret_name))
+                fetched += 1
+
+    logger.info(f"Prefetched {fetched}/{len(secret_names)} secrets from Secret Manager")
+    return fetched
+
+
 def get_google_credentials_json() -> Optional[str]:
     """Get Google Service Account credentials JSON."""
     return get_secret('lead-monitor-google-credentials', 'GOOGLE_CREDENTIALS_JSON')
@@ -192,11 +437,19 @@ def get_dashboard_credentials() -> Dict[str, Optional[str]]:
     Returns:
         Dict with 'api_key', 'username', and 'password' keys
     """
-    return {
-        'api_key': get_secret('lead-monitor-dashboard-api-key', 'DASHBOARD_API_KEY'),
-        'username': get_secret('lead-monitor-dashboard-username', 'DASHBOARD_USERNAME'),
-        'password': get_secret('lead-monitor-dashboard-password', 'DASHBOARD_PASSWORD'),
+    secrets = {
+        'api_key': ('lead-monitor-dashboard-api-key', 'DASHBOARD_API_KEY'),
+        'username': ('lead-monitor-dashboard-username', 'DASHBOARD_USERNAME'),
+        'password': ('lead-monitor-dashboard-password', 'DASHBOARD_PASSWORD'),
     }
+    if not IS_CLOUD_RUN:
+        # Env vars only - nothing to wait on
+        return {key: get_secret(*names) for key, names in secrets.items()}
+
+    # On a cold cache each lookup is a Secret Manager round trip; run them together
+    with ThreadPoolExecutor(max_workers=len(secrets)) as executor:
+        futures = {key: executor.submit(get_secret, *names) for key, names in secrets.items()}
+        return {key: future.result() for key, future in futures.items()}
 
 
 def get_encryption_key() -> Optional[str]:
@@ -206,8 +459,8 @@ def get_encryption_key() -> Optional[str]:
 
 def clear_cache():
     """Clear the secrets cache (useful for testing or key rotation)."""
-    global _secrets_cache
-    _secrets_cache = {}
+    with _cache_lock:
+        _secrets_cache.clear()
     logger.info("Secrets cache cleared")
 
 
@@ -232,20 +485,24 @@ def set_secret(secret_name: str, secret_value: str) -> bool:
         return False
 
     try:
-        from google.cloud import secretmanager
-
         parent = f"projects/{GCP_PROJECT_ID}"
         secret_path = f"{parent}/secrets/{secret_name}"
 
-        # Try to get the secret first to see if it exists
-        try:
-            client.get_secret(request={"name": secret_path})
-            secret_exists = True
-        except Exception:
-            secret_exists = False
+        def add_version():
+            client.add_secret_version(
+                request={
+                    "parent": secret_path,
+                    "payload": {"data": secret_value.encode("UTF-8")},
+                }
+            )
 
-        # Create the secret if it doesn't exist
-        if not secret_exists:
+        # Add the new version straight away - the secret usually exists
+        # already - and only create it when Secret Manager says it doesn't
+        try:
+            add_version()
+        except Exception as e:
+            if not _is_not_found(e):
+                raise
             client.create_secret(
                 request={
                     "parent": parent,
@@ -254,20 +511,11 @@ def set_secret(secret_name: str, secret_value: str) -> bool:
                 }
             )
             logger.info(f"Created new secret '{secret_name}'")
-
-        # Add a new version with the secret value
-        client.add_secret_version(
-            request={
-                "parent": secret_path,
-                "payload": {"data": secret_value.encode("UTF-8")},
-            }
-        )
+            add_version()
         logger.info(f"Added new version to secret '{secret_name}'")
 
         # Clear cache so next get_secret call fetches the new value
-        cache_key = f"{secret_name}:latest"
-        if cache_key in _secrets_cache:
-            del _secrets_cache[cache_key]
+        _cache_invalidate(f"{secret_name}:latest")
 
         return True
 
@@ -301,9 +549,7 @@ def delete_secret(secret_name: str) -> bool:
         logger.info(f"Deleted secret '{secret_name}'")
 
         # Clear from cache
-        cache_key = f"{secret_name}:latest"
-        if cache_key in _secrets_cache:
-            del _secrets_cache[cache_key]
+        _cache_invalidate(f"{secret_name}:latest")
 
         return True
 
@@ -9,23 +9,66 @@ import json
 import time
 import random
 import threading
-from typing import Optional, Dict, Any, List, Tuple
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 
 import requests
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+from googleapiclient.model import JsonModel
+from urllib3.exceptions import NewConnectionError
+
+# Optional faster JSON decoding for Sheets API responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from config import (
-    SCOPES, API_TIMEOUT_SECONDS, RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY
+    SCOPES, API_TIMEOUT_SECONDS, RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_TOTAL_WAIT
 )
 from utils import normalize_phone, logger
 
 # Facebook Lead Ads expected headers
-FB_LEAD_HEADERS = {'id', 'created_time', 'ad_id', 'ad_name'}
+FB_LEAD_HEADERS = frozenset({'id', 'created_time', 'ad_id', 'ad_name'})
+
+# Valid spreadsheet ID pattern: alphanumeric, hyphens, and underscores (typically 44 chars but can vary).
+# \Z rather than $ so a trailing newline isn't accepted.
+SPREADSHEET_ID_MIN_LENGTH = 20
+SPREADSHEET_ID_MAX_LENGTH = 100
+SPREADSHEET_ID_PATTERN = re.compile(
+    rf'\A[a-zA-Z0-9_-]{{{SPREADSHEET_ID_MIN_LENGTH},{SPREADSHEET_ID_MAX_LENGTH}}}\Z'
+)
+
+# Spreadsheet ID and tab gid within a Google Sheets URL
+SHEET_URL_PATTERN = re.compile(r'spreadsheets/d/(?P<id>[a-zA-Z0-9_-]+)(?:.*?[#&]gid=(?P<gid>\d+))?')
+
+# Upper bound for a computed retry delay (Retry-After headers are honored up to 5 minutes)
+RETRY_MAX_DELAY_SECONDS = 30.0
+
+# Client-side limit for Sheets API calls, kept just under the per-user read
+# quota (60 requests/minute) so bursts are smoothed out instead of answered
+# with 429s. Retries count against it too.
+SHEETS_RATE_LIMIT_PER_SECOND = 0.9
+SHEETS_RATE_LIMIT_BURST = 10
+
+# Most tabs fetched in one values.batchGet call. Ranges travel as query
+# parameters, so this keeps the request URL well under Google's length limit.
+SHEETS_BATCH_MAX_TABS = 50
 
-# Valid spreadsheet ID pattern: alphanumeric, hyphens, and underscores (typically 44 chars but can vary)
-SPREADSHEET_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]{20,100}$')
+# Spreadsheets fetched concurrently per cycle, so one spreadsheet in retry
+# backoff doesn't hold up the others. The rate limiter still paces the calls.
+SHEETS_FETCH_MAX_WORKERS = 4
+
+# Long-lived pool for those fetches. Its threads outlive a cycle, so each
+# keeps its authorized Http (and open TLS connection) from one cycle to the
+# next instead of reconnecting to Google every cycle.
+_fetch_executor: Optional[ThreadPoolExecutor] = None
+_fetch_executor_lock = threading.Lock()
 
 # Thread lock for cached service access (prevents race conditions during refresh)
 _service_lock = threading.Lock()
@@ -35,6 +78,57 @@ _cached_service = None
 _service_created_at = None
 SERVICE_MAX_AGE_SECONDS = 3600  # Refresh service every hour to handle credential refresh
 
+# Drive API service used for spreadsheet modifiedTime lookups. Shares the
+# authorized HTTP of the Sheets service it was built from and is rebuilt
+# whenever that service is refreshed.
+_cached_drive_service = None
+_drive_service_parent = None
+
+# Set to False once Drive metadata lookups are refused (Drive API disabled or
+# scope not granted) so we stop asking and always fetch values instead
+_drive_mtime_available = True
+
+# Drive error reasons meaning lookups will keep failing until the project or
+# credentials change. Other 403s (e.g. rateLimitExceeded) only fail one call.
+# errors[].reason and google.rpc ErrorInfo spellings are both listed.
+DRIVE_ACCESS_DENIED_REASONS = frozenset({
+    'accessNotConfigured', 'insufficientPermissions',
+    'SERVICE_DISABLED', 'ACCESS_TOKEN_SCOPE_INSUFFICIENT',
+})
+
+# Tab titles by gid for each spreadsheet, from the last metadata fetch, so
+# resolving a gid doesn't cost a spreadsheets.get per sheet per cycle.
+# Dropped after SERVICE_MAX_AGE_SECONDS or when a fetch from the spreadsheet
+# fails (e.g. a tab was renamed).
+_sheet_titles_lock = threading.Lock()
+_sheet_titles: Dict[str, Tuple[Dict[str, str], float]] = {}
+
+
+class _TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = rate_per_second
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0
+            # Take the token now (the balance may go negative) so waiting
+            # callers queue up behind each other instead of all waking at once
+            self.tokens -= 1
+        if wait > 0:
+            time.sleep(wait)
+
+
+_sheets_rate_limiter = _TokenBucket(SHEETS_RATE_LIMIT_PER_SECOND, SHEETS_RATE_LIMIT_BURST)
+
 
 def validate_spreadsheet_id(spreadsheet_id: str) -> bool:
     """
@@ -49,9 +143,30 @@ def validate_spreadsheet_id(spreadsheet_id: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    if not spreadsheet_id or not isinstance(spreadsheet_id, str):
+    if not isinstance(spreadsheet_id, str):
+        return False
+    # Length check first so obvious rejects never reach the regex engine
+    if not SPREADSHEET_ID_MIN_LENGTH <= len(spreadsheet_id) <= SPREADSHEET_ID_MAX_LENGTH:
         return False
-    return bool(SPREADSHEET_ID_PATTERN.match(spreadsheet_id))
+    return SPREADSHEET_ID_PATTERN.match(spreadsheet_id) is not None
+
+
+def _error_status(error: Exception) -> Optional[int]:
+    """
+    Return the HTTP status code carried by an API error, if any.
+
+    Args:
+        error: The exception to check
+
+    Returns:
+        Status code from a Google HttpError or requests HTTPError, else None
+    """
+    if isinstance(error, HttpError):
+        return error.resp.status or None
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = error.response
+        return response.status_code if response is not None else None
+    return None
 
 
 def is_retryable_error(error: Exception) -> bool:
@@ -67,40 +182,41 @@ def is_retryable_error(error: Exception) -> bool:
     Returns:
         True if the error should be retried, False otherwise
     """
-    # HttpError from Google API
-    if isinstance(error, HttpError):
-        status = error.resp.status if hasattr(error, 'resp') else None
-        if status:
-            # Don't retry client errors (except 429)
-            if status == 429:
-                return True  # Rate limited - retry with backoff
-            if 400 <= status < 500:
-                return False  # Client errors are permanent
-            if status >= 500:
-                return True  # Server errors are transient
-        return True  # Default to retry for unknown status
-
-    # requests library errors
-    if isinstance(error, requests.exceptions.RequestException):
-        if isinstance(error, requests.exceptions.HTTPError):
-            response = getattr(error, 'response', None)
-            if response is not None:
-                status = response.status_code
-                if status == 429:
-                    return True  # Rate limited
-                if 400 <= status < 500:
-                    return False  # Client errors are permanent
-                if status >= 500:
-                    return True  # Server errors are transient
-        # Connection/timeout errors are transient
+    status = _error_status(error)
+    if status is None:
+        # Timeouts, connection errors and errors without a status are transient
         return True
+    if status == 429:
+        return True  # Rate limited - retry with backoff
+    # Client errors are permanent; server errors are transient
+    return not 400 <= status < 500
 
-    # Timeouts and connection errors are transient
-    if isinstance(error, (TimeoutError, ConnectionError)):
-        return True
 
-    # Default to retry for unknown errors
-    return True
+def _is_safe_to_resend(error: Exception) -> bool:
+    """
+    Determine if a failed call with side effects can be sent again.
+
+    True when the server answered with a status (is_retryable_error decides
+    whether that status is worth retrying), or when no connection was made:
+    a connect timeout, a refused connection or a DNS failure (urllib3 raises
+    NameResolutionError as a NewConnectionError). Anything else may have
+    reached the server.
+
+    Args:
+        error: The exception to check
+
+    Returns:
+        True if resending can't duplicate the call's effect
+    """
+    if _error_status(error) is not None or isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError):
+        return False
+    # requests wraps urllib3's MaxRetryError, whose reason is the real failure
+    for cause in (error.args[0] if error.args else None, error.__context__):
+        if isinstance(cause, NewConnectionError) or isinstance(getattr(cause, 'reason', None), NewConnectionError):
+            return True
+    return False
 
 
 def get_retry_after(error: Exception) -> Optional[float]:
@@ -113,40 +229,57 @@ def get_retry_after(error: Exception) -> Optional[float]:
     Returns:
         Number of seconds to wait, or None if not available
     """
-    response = None
-
-    if isinstance(error, HttpError) and hasattr(error, 'resp'):
-        response = error.resp
+    retry_after = None
+    if isinstance(error, HttpError):
+        # httplib2 responses are dicts keyed by lowercased header name
+        retry_after = error.resp.get('retry-after')
     elif isinstance(error, requests.exceptions.RequestException):
-        response = getattr(error, 'response', None)
+        # Compared against None: a requests Response is falsy for 4xx/5xx
+        response = error.response
+        if response is not None:
+            # requests headers are case-insensitive
+            retry_after = response.headers.get('Retry-After')
 
-    if response:
-        retry_after = None
-        if hasattr(response, 'headers'):
-            retry_after = response.headers.get('Retry-After') or response.headers.get('retry-after')
-        elif hasattr(response, 'get'):
-            retry_after = response.get('retry-after')
-
-        if retry_after:
-            try:
-                return float(retry_after)
-            except (ValueError, TypeError):
-                pass
+    if retry_after:
+        try:
+            return float(retry_after)
+        except (ValueError, TypeError):
+            pass
 
     return None
 
 
-def retry_with_backoff(func, max_retries: int = None, base_delay: float = None):
+def retry_with_backoff(
+    func,
+    max_retries: int = None,
+    base_delay: float = None,
+    idempotent: bool = True,
+    max_total_wait: float = None
+):
     """
     Execute a function with exponential backoff retry logic.
 
     Distinguishes between retryable (transient) and non-retryable (permanent) errors.
-    Respects Retry-After headers when available.
+    Respects Retry-After headers when available. Otherwise delays use
+    decorrelated jitter: each is drawn between base_delay and three times the
+    previous delay (capped at RETRY_MAX_DELAY_SECONDS), so concurrent callers
+    that failed together spread out instead of retrying in lockstep.
+
+    The total time spent sleeping is capped at max_total_wait: the last delay
+    is shortened to fit, and a Retry-After longer than what remains ends the
+    retries instead, so a caller's worst case is bounded up front.
+
+    Pass idempotent=False for calls with side effects (e.g. creating a lead).
+    Those are only retried when the server answered with 429/5xx, or when the
+    connection was never established; a timeout or dropped connection may
+    mean the server acted on the request, so it is raised instead of repeated.
 
     Args:
         func: Callable to execute
         max_retries: Maximum number of retry attempts (default: RETRY_MAX_ATTEMPTS)
         base_delay: Base delay in seconds for backoff calculation (default: RETRY_BASE_DELAY)
+        idempotent: Whether func is safe to repeat after an ambiguous failure
+        max_total_wait: Budget in seconds for all retry sleeps combined (default: RETRY_MAX_TOTAL_WAIT)
 
     Returns:
         Result from successful function call
@@ -159,8 +292,12 @@ def retry_with_backoff(func, max_retries: int = None, base_delay: float = None):
         max_retries = RETRY_MAX_ATTEMPTS
     if base_delay is None:
         base_delay = RETRY_BASE_DELAY
+    if max_total_wait is None:
+        max_total_wait = RETRY_MAX_TOTAL_WAIT
 
     last_exception = None
+    delay = base_delay
+    waited = 0.0
     for attempt in range(max_retries):
         try:
             return func()
@@ -169,34 +306,62 @@ def retry_with_backoff(func, max_retries: int = None, base_delay: float = None):
 
             # Check if this is a permanent error
             if not is_retryable_error(e):
-                status_code = None
-                if isinstance(e, HttpError) and hasattr(e, 'resp'):
-                    status_code = e.resp.status
-                elif isinstance(e, requests.exceptions.HTTPError):
-                    response = getattr(e, 'response', None)
-                    if response is not None:
-                        status_code = response.status_code
-
-                logger.error(f"Non-retryable error (HTTP {status_code}): {e}")
+                logger.error(f"Non-retryable error (HTTP {_error_status(e)}): {e}")
                 raise  # Re-raise original exception for caller to handle
 
+            if not idempotent and not _is_safe_to_resend(e):
+                logger.error(f"Not retrying non-idempotent call after ambiguous failure: {e}")
+                raise
+
             # For retryable errors, continue with backoff
             if attempt < max_retries - 1:
+                remaining = max_total_wait - waited
                 # Check for Retry-After header
                 retry_after = get_retry_after(e)
                 if retry_after and retry_after < 300:  # Cap at 5 minutes
                     delay = retry_after
+                    if delay > remaining:
+                        logger.error(
+                            f"Attempt {attempt + 1}/{max_retries} failed: {e}. Retry-After of {delay:.1f}s "
+                            f"exceeds the remaining retry budget ({remaining:.1f}s), giving up"
+                        )
+                        break
                 else:
-                    delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
+                    delay = min(RETRY_MAX_DELAY_SECONDS, remaining,
+                                random.uniform(base_delay, delay * 3))
+                    if delay <= 0:
+                        logger.error(f"Retry budget of {max_total_wait:.1f}s exhausted after attempt {attempt + 1}: {e}")
+                        break
 
                 logger.warning(f"Attempt {attempt + 1}/{max_retries} failed: {e}. Retrying in {delay:.1f}s...")
                 time.sleep(delay)
+                waited += delay
             else:
                 logger.error(f"All {max_retries} attempts failed: {e}")
 
     raise last_exception
 
 
+class OrjsonModel(JsonModel):
+    """
+    JsonModel that decodes API responses with orjson.
+
+    values.get responses for large tabs are big arrays of strings, which
+    orjson parses several times faster than the stdlib json module the
+    client library uses by default.
+    """
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Match JsonModel: non-JSON bodies are returned as-is
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
+
 def get_google_sheets_service(force_refresh: bool = False):
     """
     Get or create a cached Google Sheets API service with timeout.
@@ -238,13 +403,7 @@ def get_google_sheets_service(force_refresh: bool = False):
         # Close old service's HTTP connection if exists
         if _cached_service:
             try:
-                # Access the underlying http object and close it
-                if hasattr(_cached_service, '_http'):
-                    http_obj = _cached_service._http
-                    if hasattr(http_obj, 'http') and hasattr(http_obj.http, 'close'):
-                        http_obj.http.close()
-                    elif hasattr(http_obj, 'close'):
-                        http_obj.close()
+                _close_service_http(_cached_service)
                 logger.debug("Closed previous Google Sheets service connection")
             except Exception as e:
                 logger.debug(f"Could not close previous service connection: {e}")
@@ -274,7 +433,12 @@ def get_google_sheets_service(force_refresh: bool = False):
         http = httplib2.Http(timeout=API_TIMEOUT_SECONDS)
         authed_http = AuthorizedHttp(credentials, http=http)
 
-        service = build('sheets', 'v4', http=authed_http, cache_discovery=False)
+        # static_discovery: build from the discovery document bundled with
+        # google-api-python-client, so a refresh never downloads it again
+        model = OrjsonModel() if ORJSON_AVAILABLE else None
+        service = build('sheets', 'v4', http=authed_http, cache_discovery=False,
+                        static_discovery=True, model=model,
+                        requestBuilder=_thread_local_request_builder(credentials, authed_http))
 
         # Cache the new service
         _cached_service = service
@@ -284,6 +448,74 @@ def get_google_sheets_service(force_refresh: bool = False):
         return service
 
 
+def _thread_local_request_builder(credentials, owner_http):
+    """
+    Build a requestBuilder for build() that gives each thread its own HTTP object.
+
+    httplib2.Http isn't thread-safe, so requests made from other threads
+    (the fetch_spreadsheets_data pool, dashboard request threads) each get a
+    separate authorized Http, reused for every request from that thread.
+    The thread that created the service keeps using owner_http.
+
+    Every Http created here is listed in the builder's thread_https, so
+    _close_service_http closes them along with owner_http. An Http is also
+    closed and dropped from the list as soon as its thread exits.
+    """
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
+
+    local = threading.local()
+    local.http = owner_http
+    thread_https: List[Any] = []
+    thread_https_lock = threading.Lock()
+
+    def release(thread_http):
+        with thread_https_lock:
+            if thread_http in thread_https:
+                thread_https.remove(thread_http)
+        thread_http.http.close()
+
+    def build_request(http, *args, **kwargs):
+        thread_http = getattr(local, 'http', None)
+        if thread_http is None:
+            thread_http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=API_TIMEOUT_SECONDS))
+            local.http = thread_http
+            with thread_https_lock:
+                thread_https.append(thread_http)
+            weakref.finalize(threading.current_thread(), release, thread_http)
+        return HttpRequest(thread_http, *args, **kwargs)
+
+    build_request.thread_https = thread_https
+    build_request.thread_https_lock = thread_https_lock
+    return build_request
+
+
+def _close_service_http(service):
+    """
+    Close the persistent connections of a service's HTTP object.
+
+    The service wraps an AuthorizedHttp around an httplib2.Http, which
+    keeps one open connection per host until closed; Http.close() closes
+    them all and empties its connection pool. The per-thread Https made by
+    _thread_local_request_builder are closed the same way.
+    """
+    http_objs = [getattr(service, '_http', None)]
+    builder = getattr(service, '_requestBuilder', None)
+    if hasattr(builder, 'thread_https'):
+        with builder.thread_https_lock:
+            http_objs.extend(builder.thread_https)
+            builder.thread_https.clear()
+
+    for http_obj in http_objs:
+        if http_obj is None:
+            continue
+        inner_http = getattr(http_obj, 'http', None)
+        if inner_http is not None and hasattr(inner_http, 'close'):
+            inner_http.close()
+        elif hasattr(http_obj, 'close'):
+            http_obj.close()
+
+
 def close_google_service():
     """
     Close the cached Google Sheets service and release resources.
@@ -291,18 +523,20 @@ def close_google_service():
     Call this on shutdown to ensure proper cleanup of HTTP connections.
     Thread-safe: Uses a lock to prevent race conditions.
     """
-    global _cached_service, _service_created_at
+    global _cached_service, _service_created_at, _cached_drive_service, _drive_service_parent
+    global _fetch_executor
+
+    with _fetch_executor_lock:
+        if _fetch_executor is not None:
+            _fetch_executor.shutdown(wait=False)
+            _fetch_executor = None
 
     with _service_lock:
+        _cached_drive_service = None
+        _drive_service_parent = None
         if _cached_service:
             try:
-                # Access the underlying http object and close it
-                if hasattr(_cached_service, '_http'):
-                    http_obj = _cached_service._http
-                    if hasattr(http_obj, 'http') and hasattr(http_obj.http, 'close'):
-                        http_obj.http.close()
-                    elif hasattr(http_obj, 'close'):
-                        http_obj.close()
+                _close_service_http(_cached_service)
                 logger.info("Google Sheets service closed")
             except Exception as e:
                 logger.warning(f"Error closing Google Sheets service: {e}")
@@ -311,27 +545,129 @@ def close_google_service():
                 _service_created_at = None
 
 
+def _get_drive_service(service):
+    """Get a Drive API service sharing the Sheets service's authorized HTTP."""
+    global _cached_drive_service, _drive_service_parent
+
+    with _service_lock:
+        if _cached_drive_service is None or _drive_service_parent is not service:
+            _cached_drive_service = build('drive', 'v3', http=service._http, cache_discovery=False,
+                                          static_discovery=True)
+            _drive_service_parent = service
+        return _cached_drive_service
+
+
+def get_spreadsheet_modified_time(service, spreadsheet_id: str) -> Optional[str]:
+    """
+    Get a spreadsheet's last modification time from the Drive API.
+
+    One small metadata request that lets callers skip fetching values for
+    spreadsheets that haven't changed since the last check.
+
+    Args:
+        service: Google Sheets API service (its credentials are reused for Drive)
+        spreadsheet_id: Google Sheets spreadsheet ID
+
+    Returns:
+        RFC 3339 modifiedTime string, or None if unavailable (callers should
+        then fall back to fetching the sheet data)
+    """
+    global _drive_mtime_available
+
+    if not _drive_mtime_available or not hasattr(service, '_http'):
+        return None
+
+    if not validate_spreadsheet_id(spreadsheet_id):
+        logger.error(f"Invalid spreadsheet ID format: {spreadsheet_id[:20]}...")
+        return None
+
+    try:
+        drive = _get_drive_service(service)
+
+        def fetch():
+            return drive.files().get(
+                fileId=spreadsheet_id,
+                fields='modifiedTime',
+                supportsAllDrives=True
+            ).execute()
+
+        result = retry_with_backoff(fetch)
+        return result.get('modifiedTime')
+    except HttpError as e:
+        status = e.resp.status if hasattr(e, 'resp') else None
+        details = getattr(e, 'error_details', None)
+        reasons = {d.get('reason') for d in details if isinstance(d, dict)} if isinstance(details, list) else set()
+        if status == 401 or (status == 403 and reasons & DRIVE_ACCESS_DENIED_REASONS):
+            _drive_mtime_available = False
+            logger.warning(
+                f"Drive metadata not accessible (HTTP {status}) - change detection disabled, "
+                "sheets will be fetched every cycle. Enable the Drive API to restore it."
+            )
+        else:
+            logger.debug(f"Could not get modifiedTime for spreadsheet: {e}")
+        return None
+    except Exception as e:
+        logger.debug(f"Could not get modifiedTime for spreadsheet: {type(e).__name__}: {e}")
+        return None
+
+
+def _remember_sheet_titles(spreadsheet_id: str, sheets_metadata: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Cache the gid -> title map from a spreadsheets.get response's 'sheets' list."""
+    titles = {}
+    for sheet_meta in sheets_metadata:
+        props = sheet_meta.get('properties', {})
+        titles[str(props.get('sheetId', 0))] = props.get('title', '')
+    with _sheet_titles_lock:
+        _sheet_titles[spreadsheet_id] = (titles, time.monotonic())
+    return titles
+
+
+def forget_sheet_titles(spreadsheet_id: str):
+    """Drop a spreadsheet's cached tab titles so the next lookup refetches them."""
+    with _sheet_titles_lock:
+        _sheet_titles.pop(spreadsheet_id, None)
+
+
 def get_sheet_name_by_gid(service, spreadsheet_id: str, gid: str) -> Optional[str]:
-    """Get the actual sheet name from its gid."""
+    """
+    Get the actual sheet name from its gid.
+
+    Titles of all tabs in the spreadsheet are cached together, so sheets
+    sharing a spreadsheet cost one metadata call between them.
+    """
     # Validate spreadsheet ID before API call
     if not validate_spreadsheet_id(spreadsheet_id):
         logger.error(f"Invalid spreadsheet ID format: {spreadsheet_id[:20]}...")
         return None
 
+    with _sheet_titles_lock:
+        cached = _sheet_titles.get(spreadsheet_id)
+    if cached:
+        titles, cached_at = cached
+        # A gid missing from a fresh map may be a newly added tab - refetch
+        if gid in titles and time.monotonic() - cached_at < SERVICE_MAX_AGE_SECONDS:
+            return titles[gid]
+
     try:
         def fetch():
-            return service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
+            _sheets_rate_limiter.acquire()
+            return service.spreadsheets().get(
+                spreadsheetId=spreadsheet_id,
+                fields='sheets.properties(sheetId,title)'
+            ).execute()
 
         spreadsheet = retry_with_backoff(fetch)
-        for sheet in spreadsheet.get('sheets', []):
-            if str(sheet['properties']['sheetId']) == gid:
-                return sheet['properties']['title']
-        return None
+        return _remember_sheet_titles(spreadsheet_id, spreadsheet.get('sheets', [])).get(gid)
     except (HttpError, TimeoutError) as e:
         logger.error(f"Error getting sheet name: {e}")
         return None
 
 
+def _quote_sheet_name(sheet_name: str) -> str:
+    """Quote a tab title for an A1 range, doubling any single quotes in it."""
+    return "'{}'".format(sheet_name.replace("'", "''"))
+
+
 def fetch_sheet_data(
     service,
     spreadsheet_id: str,
@@ -364,9 +700,12 @@ def fetch_sheet_data(
         if start_row > 1:
             # Incremental mode: fetch headers + new rows in one API call
             def fetch_incremental():
+                _sheets_rate_limiter.acquire()
                 ranges = [
-                    f"'{sheet_name}'!1:1",  # Headers only
-                    f"'{sheet_name}'!{start_row}:{start_row + 10000}"  # New rows
+                    f"{_quote_sheet_name(sheet_name)}!1:1",  # Headers only
+                    # Open-ended: every populated row from start_row down,
+                    # with no fixed slab to pad or silently truncate
+                    f"{_quote_sheet_name(sheet_name)}!A{start_row}:ZZ"
                 ]
                 return service.spreadsheets().values().batchGet(
                     spreadsheetId=spreadsheet_id,
@@ -385,20 +724,25 @@ def fetch_sheet_data(
             data_rows = []
             if len(value_ranges) > 1 and value_ranges[1].get('values'):
                 data_rows = value_ranges[1]['values']
+            logger.debug(f"Fetched {len(data_rows)} new rows from '{sheet_name}' starting at row {start_row}")
 
-            # Return headers + data rows (same format as full fetch)
+            # Return headers + data rows (same format as full fetch).
+            # Prepend in place rather than concatenating so the row list
+            # isn't copied.
             if headers:
-                return [headers] + data_rows
+                data_rows.insert(0, headers)
+                return data_rows
             return []
 
         else:
             # Full fetch mode (original behavior)
             def fetch_full():
+                _sheets_rate_limiter.acquire()
                 # Use sheet name only (no column range) to fetch all data
                 # This handles sheets with more than 26 columns (beyond column Z)
                 return service.spreadsheets().values().get(
                     spreadsheetId=spreadsheet_id,
-                    range=f"'{sheet_name}'"
+                    range=_quote_sheet_name(sheet_name)
                 ).execute()
 
             result = retry_with_backoff(fetch_full)
@@ -406,9 +750,158 @@ def fetch_sheet_data(
 
     except (HttpError, TimeoutError) as e:
         logger.error(f"Error fetching sheet data: {e}")
+        # The tab may have been renamed; resolve its gid afresh next time
+        forget_sheet_titles(spreadsheet_id)
         return []
 
 
+def fetch_sheets_data(
+    service,
+    spreadsheet_id: str,
+    tabs: List[Tuple[str, int]]
+) -> List[List[List[str]]]:
+    """
+    Fetch data from several tabs of one spreadsheet in a single API call.
+
+    Each tab is fetched the way fetch_sheet_data would fetch it (the whole
+    tab, or headers plus rows from start_row), but all of them share one
+    values.batchGet request. If the batch fails, each tab is fetched on its
+    own so one bad tab doesn't hold back the others.
+
+    Args:
+        service: Google Sheets API service
+        spreadsheet_id: Google Sheets spreadsheet ID
+        tabs: (sheet_name, start_row) pairs, with start_row as in fetch_sheet_data
+
+    Returns:
+        One entry per tab, in order, in the same format as fetch_sheet_data
+        (empty list if that tab couldn't be fetched)
+    """
+    if len(tabs) == 1:
+        return [fetch_sheet_data(service, spreadsheet_id, tabs[0][0], tabs[0][1])]
+
+    if not validate_spreadsheet_id(spreadsheet_id):
+        logger.error(f"Invalid spreadsheet ID format: {spreadsheet_id[:20]}...")
+        return [[] for _ in tabs]
+
+    results: List[List[List[str]]] = []
+    for chunk_start in range(0, len(tabs), SHEETS_BATCH_MAX_TABS):
+        chunk = tabs[chunk_start:chunk_start + SHEETS_BATCH_MAX_TABS]
+
+        ranges = []
+        for sheet_name, start_row in chunk:
+            quoted = _quote_sheet_name(sheet_name)
+            if start_row > 1:
+                ranges.append(f"{quoted}!1:1")
+                ranges.append(f"{quoted}!A{start_row}:ZZ")
+            else:
+                ranges.append(quoted)
+
+        def fetch_batch():
+            _sheets_rate_limiter.acquire()
+            return service.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id,
+                ranges=ranges
+            ).execute()
+
+        try:
+            value_ranges = retry_with_backoff(fetch_batch).get('valueRanges', [])
+        except (HttpError, TimeoutError) as e:
+            logger.warning(f"Batch fetch of {len(chunk)} tabs failed, fetching individually: {e}")
+            results.extend(
+                fetch_sheet_data(service, spreadsheet_id, sheet_name, start_row)
+                for sheet_name, start_row in chunk
+            )
+            continue
+
+        position = 0
+        for sheet_name, start_row in chunk:
+            if start_row > 1:
+                header_values = value_ranges[position].get('values') if position < len(value_ranges) else None
+                data_rows = value_ranges[position + 1].get('values', []) if position + 1 < len(value_ranges) else []
+                position += 2
+                if header_values:
+                    data_rows.insert(0, header_values[0])
+                    results.append(data_rows)
+                else:
+                    results.append([])
+            else:
+                values = value_ranges[position].get('values', []) if position < len(value_ranges) else []
+                position += 1
+                results.append(values)
+
+    return results
+
+
+def _get_fetch_executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool for fetch_spreadsheets_data, creating it on first use."""
+    global _fetch_executor
+
+    with _fetch_executor_lock:
+        if _fetch_executor is None:
+            _fetch_executor = ThreadPoolExecutor(max_workers=SHEETS_FETCH_MAX_WORKERS,
+                                                 thread_name_prefix='sheets-fetch')
+        return _fetch_executor
+
+
+def fetch_spreadsheets_data(
+    service,
+    tabs_by_spreadsheet: Dict[str, List[Tuple[str, int]]]
+) -> Dict[Tuple[str, str, int], List[List[str]]]:
+    """
+    Fetch the due tabs of several spreadsheets, one spreadsheet per worker.
+
+    Each spreadsheet is a single fetch_sheets_data call; running them on a
+    small thread pool means a spreadsheet sleeping in retry backoff doesn't
+    stall the rest of the cycle. The pool is kept between cycles so its
+    threads reuse their connections. Calls still pass through the shared
+    rate limiter.
+
+    Args:
+        service: Google Sheets API service (from get_google_sheets_service)
+        tabs_by_spreadsheet: (sheet_name, start_row) pairs per spreadsheet ID
+
+    Returns:
+        Dict mapping (spreadsheet_id, sheet_name, start_row) to the tab's
+        rows, in the format of fetch_sheet_data
+    """
+    def fetch(spreadsheet_id):
+        tabs = tabs_by_spreadsheet[spreadsheet_id]
+        return spreadsheet_id, zip(tabs, fetch_sheets_data(service, spreadsheet_id, tabs))
+
+    spreadsheet_ids = list(tabs_by_spreadsheet)
+    if len(spreadsheet_ids) <= 1:
+        results = map(fetch, spreadsheet_ids)
+    else:
+        results = list(_get_fetch_executor().map(fetch, spreadsheet_ids))
+
+    fetched: Dict[Tuple[str, str, int], List[List[str]]] = {}
+    for spreadsheet_id, tab_results in results:
+        for (sheet_name, start_row), data in tab_results:
+            fetched[(spreadsheet_id, sheet_name, start_row)] = data
+    return fetched
+
+
+def iter_sheet_rows(data: List[List[Any]], first_row_index: int = 2) -> Iterator[Tuple[int, List[Any]]]:
+    """
+    Iterate over the non-empty data rows of fetched sheet data.
+
+    Walks the list returned by fetch_sheet_data in place, so large sheets
+    aren't sliced into a second list just to skip the header row.
+
+    Args:
+        data: Rows from fetch_sheet_data (first row is headers)
+        first_row_index: Sheet row number (1-indexed) of data[1]
+
+    Yields:
+        (row_index, row) for each row with at least one non-blank cell
+    """
+    for offset in range(1, len(data)):
+        row = data[offset]
+        if any(cell.strip() if isinstance(cell, str) else cell for cell in row):
+            yield first_row_index + offset - 1, row
+
+
 def parse_spreadsheet_url(url: str) -> Optional[Tuple[str, Optional[str]]]:
     """
     Parse a Google Sheets URL to extract spreadsheet_id and optional gid.
@@ -426,33 +919,27 @@ def parse_spreadsheet_url(url: str) -> Optional[Tuple[str, Optional[str]]]:
 
     url = url.strip()
 
-    # If it's just an ID (no slashes), validate and return it
+    # A bare spreadsheet ID is returned as is
+    if SPREADSHEET_ID_PATTERN.match(url):
+        return (url, None)
     if '/' not in url and len(url) > 20:
-        # Validate the ID format before returning
-        if validate_spreadsheet_id(url):
-            return (url, None)
-        else:
-            logger.warning(f"Invalid spreadsheet ID format: {url[:30]}...")
-            return None
+        logger.warning(f"Invalid spreadsheet ID format: {url[:30]}...")
+        return None
 
     # Match Google Sheets URL pattern
-    pattern = r'spreadsheets/d/([a-zA-Z0-9_-]+)'
-    match = re.search(pattern, url)
+    match = SHEET_URL_PATTERN.search(url)
     if not match:
         return None
 
-    spreadsheet_id = match.group(1)
+    spreadsheet_id = match['id']
 
     # Validate the extracted ID
     if not validate_spreadsheet_id(spreadsheet_id):
         logger.warning(f"Invalid spreadsheet ID extracted from URL: {spreadsheet_id[:30]}...")
         return None
 
-    # Try to extract gid
-    gid = None
-    gid_match = re.search(r'[#&]gid=(\d+)', url)
-    if gid_match:
-        gid = gid_match.group(1)
+    # gid from the same match (None when the URL doesn't name a tab)
+    gid = match['gid']
 
     return (spreadsheet_id, gid)
 
@@ -480,106 +967,168 @@ def discover_fb_lead_tabs(service, spreadsheet_id: str) -> List[Dict[str, Any]]:
     try:
         # Get spreadsheet metadata (all sheet names and IDs)
         def fetch_metadata():
-            return service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
+            _sheets_rate_limiter.acquire()
+            return service.spreadsheets().get(
+                spreadsheetId=spreadsheet_id,
+                fields='sheets.properties(sheetId,title,sheetType,gridProperties.rowCount)'
+            ).execute()
 
         spreadsheet = retry_with_backoff(fetch_metadata)
-        sheets_metadata = spreadsheet.get('sheets', [])
-
-        for sheet_meta in sheets_metadata:
-            props = sheet_meta.get('properties', {})
-            sheet_name = props.get('title', '')
-            sheet_id = str(props.get('sheetId', 0))
-
-            # Fetch first row to check headers
-            try:
-                def fetch_headers():
-                    return service.spreadsheets().values().get(
-                        spreadsheetId=spreadsheet_id,
-                        range=f"'{sheet_name}'!1:1"
-                    ).execute()
-
-                result = retry_with_backoff(fetch_headers)
-                rows = result.get('values', [])
-
-                if rows:
-                    # Normalize headers (lowercase, strip whitespace)
-                    headers = {str(h).lower().strip() for h in rows[0]}
-
-                    # Check if this tab has FB Lead headers
-                    if FB_LEAD_HEADERS.issubset(headers):
-                        # Get row count
-                        grid_props = sheet_meta.get('properties', {}).get('gridProperties', {})
-                        row_count = grid_props.get('rowCount', 0)
-
-                        discovered.append({
-                            'name': sheet_name,
-                            'gid': sheet_id,
-                            'row_count': row_count,
-                            'headers': list(headers)
-                        })
-                        logger.info(f"Discovered FB Lead tab: {sheet_name} (gid={sheet_id})")
-
-            except (HttpError, TimeoutError) as e:
-                logger.warning(f"Could not check headers for sheet '{sheet_name}': {e}")
+        _remember_sheet_titles(spreadsheet_id, spreadsheet.get('sheets', []))
+
+        # Only grid sheets have cells; a chart sheet in the batch would fail it
+        grid_props_list = [
+            sheet_meta.get('properties', {}) for sheet_meta in spreadsheet.get('sheets', [])
+            if sheet_meta.get('properties', {}).get('sheetType', 'GRID') == 'GRID'
+        ]
+        if not grid_props_list:
+            return discovered
+
+        # Fetch every tab's header row in one request. batchGet returns
+        # ranges in request order.
+        ranges = [
+            f"{_quote_sheet_name(props.get('title', ''))}!1:1"
+            for props in grid_props_list
+        ]
+
+        def fetch_headers():
+            _sheets_rate_limiter.acquire()
+            return service.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id,
+                ranges=ranges,
+                majorDimension='ROWS'
+            ).execute()
+
+        value_ranges = retry_with_backoff(fetch_headers).get('valueRanges', [])
+
+        for props, value_range in zip(grid_props_list, value_ranges):
+            rows = value_range.get('values', [])
+            if not rows:
                 continue
 
+            # Normalize headers (lowercase, strip whitespace)
+            headers = {str(h).lower().strip() for h in rows[0]}
+
+            # Check if this tab has FB Lead headers
+            if FB_LEAD_HEADERS.issubset(headers):
+                sheet_name = props.get('title', '')
+                sheet_id = str(props.get('sheetId', 0))
+                discovered.append({
+                    'name': sheet_name,
+                    'gid': sheet_id,
+                    'row_count': props.get('gridProperties', {}).get('rowCount', 0),
+                    'headers': list(headers)
+                })
+                logger.info(f"Discovered FB Lead tab: {sheet_name} (gid={sheet_id})")
+
     except (HttpError, TimeoutError) as e:
         logger.error(f"Error discovering tabs in spreadsheet: {e}")
 
     return discovered
 
 
-def build_momence_lead_data(headers: List[str], row: List[Any], sheet_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """Build Momence lead data from sheet row."""
-    data = {}
-    for i, value in enumerate(row):
-        if i < len(headers) and value:
-            data[headers[i].lower()] = value
+# Lowercased sheet headers read by build_momence_lead_data
+LEAD_FIELDS = (
+    'email', 'first_name', 'last_name', 'phone_number',
+    'zip_code', 'discovery_answer',
+    'campaign', 'form', 'created', 'platform', 'created_time',
+)
+
+# Alternative headers for a lead field, read only when the field's own
+# columns are empty
+LEAD_FIELD_ALIASES = {
+    'zipcode': 'zip_code',
+    'discoveryanswer': 'discovery_answer',
+}
+
+# Fields copied into the lead data as-is when present
+LEAD_EXTRA_FIELDS = ('campaign', 'form', 'created', 'platform', 'created_time')
+
+
+def compile_schema(headers: List[str]) -> Dict[str, Tuple[int, ...]]:
+    """
+    Resolve the column positions of the lead fields for a sheet's headers.
+
+    Computed once per sheet so each row is read by index instead of being
+    zipped into a dict of every column.
+
+    Args:
+        headers: Header row of the sheet
+
+    Returns:
+        Dict mapping each field in LEAD_FIELDS present in the headers to its
+        column indices, last column first (later duplicate headers win),
+        followed by the columns of any LEAD_FIELD_ALIASES for it
+    """
+    schema: Dict[str, Tuple[int, ...]] = {}
+    aliased: Dict[str, Tuple[int, ...]] = {}
+    for i, header in enumerate(headers):
+        key = str(header).lower()
+        if key in LEAD_FIELDS:
+            schema[key] = (i,) + schema.get(key, ())
+        elif key in LEAD_FIELD_ALIASES:
+            field = LEAD_FIELD_ALIASES[key]
+            aliased[field] = (i,) + aliased.get(field, ())
+    for field, indices in aliased.items():
+        schema[field] = schema.get(field, ()) + indices
+    return schema
+
+
+def build_momence_lead_data(
+    headers: List[str],
+    row: List[Any],
+    sheet_config: Dict[str, Any],
+    schema: Optional[Dict[str, Tuple[int, ...]]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Build Momence lead data from sheet row.
 
+    Pass the result of compile_schema(headers) as schema when building many
+    rows from the same sheet; it is compiled on the fly otherwise.
+    """
     lead_source_id = sheet_config.get('lead_source_id')
     if not lead_source_id:
         logger.warning(f"No lead_source_id configured for sheet: {sheet_config.get('name')}")
         return None
 
+    if schema is None:
+        schema = compile_schema(headers)
+
+    row_len = len(row)
+    data = {}
+    for field, indices in schema.items():
+        for i in indices:
+            if i < row_len and row[i]:
+                data[field] = row[i]
+                break
+
     email = data.get('email')
     if not email:
         logger.warning("Cannot create lead without email")
         return None
 
-    first_name = data.get('first_name', '')
-    last_name = data.get('last_name', '')
-
-    phone = normalize_phone(data.get('phone_number', ''))
-
-    sheet_name = sheet_config.get('name', '')
-
     lead_data = {
         "leadSourceId": lead_source_id,
-        "firstName": first_name,
-        "lastName": last_name,
+        "firstName": data.get('first_name', ''),
+        "lastName": data.get('last_name', ''),
         "email": email,
-        "sheetName": sheet_name,
+        "sheetName": sheet_config.get('name', ''),
     }
 
+    phone = normalize_phone(data.get('phone_number', ''))
     if phone:
         lead_data["phoneNumber"] = phone
-    if data.get('zip_code') or data.get('zipcode'):
-        lead_data["zipCode"] = data.get('zip_code') or data.get('zipcode')
-    if data.get('discovery_answer') or data.get('discoveryanswer'):
-        lead_data["discoveryAnswer"] = data.get('discovery_answer') or data.get('discoveryanswer')
-
-    # Extra fields for email notification (not sent to Momence API)
-    if data.get('campaign'):
-        lead_data["campaign"] = data['campaign']
-    if data.get('form'):
-        lead_data["form"] = data['form']
-    if data.get('created'):
-        lead_data["created"] = data['created']
-    if data.get('platform'):
-        lead_data["platform"] = data['platform']
-
-    # Include created_time from spreadsheet for metrics (date lead was actually created)
-    if data.get('created_time'):
-        lead_data["created_time"] = data['created_time']
+    # Aliased headers (zipcode, discoveryanswer) are already folded in by compile_schema
+    if 'zip_code' in data:
+        lead_data["zipCode"] = data['zip_code']
+    if 'discovery_answer' in data:
+        lead_data["discoveryAnswer"] = data['discovery_answer']
+
+    # Extra fields for email notification (not sent to Momence API), plus
+    # created_time from the spreadsheet for metrics (date lead was actually created).
+    # Only non-empty cells make it into data, so presence is enough.
+    for field in LEAD_EXTRA_FIELDS:
+        if field in data:
+            lead_data[field] = data[field]
 
     return lead_data
@@ -125,6 +125,12 @@ _local = threading.local()
 _connection_registry: Dict[int, sqlite3.Connection] = {}
 _registry_lock = threading.Lock()
 
+# Serializes write transactions across this process's threads (monitor loop,
+# dashboard handlers). Writers queue here instead of polling SQLite's file
+# lock through busy_timeout; readers never take it, and under WAL they read
+# alongside the writer. Reentrant so a write helper can call another.
+_write_lock = threading.RLock()
+
 # Database connection retry settings
 DB_CONNECT_MAX_RETRIES = 3
 DB_CONNECT_RETRY_DELAY = 1.0  # seconds
@@ -172,6 +178,10 @@ def _get_connection(allow_create: bool = False) -> sqlite3.Connection:
                 conn.execute('PRAGMA journal_mode=WAL')
                 conn.execute('PRAGMA synchronous=NORMAL')  # Good balance of safety and speed
                 conn.execute('PRAGMA foreign_keys=ON')
+                # Keep temp tables/indices (ORDER BY, GROUP BY in the dashboard
+                # queries) in memory, with a ~20 MB page cache per connection
+                conn.execute('PRAGMA temp_store=MEMORY')
+                conn.execute('PRAGMA cache_size=-20000')
                 # Enable incremental auto-vacuum for automatic space reclamation
                 # This prevents database file bloat after deletions (cleanup operations)
                 conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
@@ -305,21 +315,40 @@ def cleanup_stale_connections() -> int:
 
 
 @contextmanager
-def get_db(allow_create: bool = False):
+def get_db(allow_create: bool = False, readonly: bool = False):
     """
     Context manager for database operations with automatic commit/rollback.
 
+    Write blocks (the default) hold the process-wide write lock and open the
+    transaction with BEGIN IMMEDIATE, so the SQLite write lock is taken up
+    front: a busy database is reported at BEGIN rather than at the first
+    write or at commit, and a block never upgrades from read to write
+    midway. Read-only blocks skip both and run concurrently with each other
+    and with the writer (WAL mode).
+
     Args:
         allow_create: If True, creates database if it doesn't exist.
                      If False (default), raises DatabaseNotAvailableError if DB missing.
+        readonly: If True, the block only reads; no lock, transaction or commit.
     """
     conn = _get_connection(allow_create=allow_create)
-    try:
+    if readonly:
         yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
+        return
+
+    with _write_lock:
+        # Nested write blocks join the outer transaction
+        owns_transaction = not conn.in_transaction
+        if owns_transaction:
+            conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            if owns_transaction:
+                conn.commit()
+        except Exception:
+            if owns_transaction:
+                conn.rollback()
+            raise
 
 
 def init_database(allow_create: bool = True) -> bool:
@@ -436,6 +465,16 @@ def init_database(allow_create: bool = True) -> bool:
             VALUES (1, ?, '{}')
         ''', (utc_now().isoformat(),))
 
+        # Location counts table - one row per location so increments are a
+        # single upsert instead of rewriting a JSON blob in tracker_metadata
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS location_counts (
+                location TEXT PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        _migrate_location_counts(conn)
+
         # Admin activity log table - replaces JSON file
         conn.execute('''
             CREATE TABLE IF NOT EXISTS admin_activity (
@@ -508,6 +547,16 @@ def init_database(allow_create: bool = True) -> bool:
             )
         ''')
 
+        # Spreadsheet state table - last seen Drive modifiedTime per spreadsheet,
+        # used to skip fetching spreadsheets that haven't changed since last check
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS spreadsheet_state (
+                spreadsheet_id TEXT PRIMARY KEY,
+                modified_time TEXT NOT NULL,
+                last_check TEXT NOT NULL
+            )
+        ''')
+
         # Momence hosts table - stores host configurations (replaces config.json momence_hosts)
         conn.execute('''
             CREATE TABLE IF NOT EXISTS momence_hosts (
@@ -546,6 +595,25 @@ def init_database(allow_create: bool = True) -> bool:
     return True
 
 
+def _migrate_location_counts(conn: sqlite3.Connection) -> None:
+    """Move counts from the legacy tracker_metadata.location_counts JSON blob into the location_counts table."""
+    row = conn.execute(
+        'SELECT location_counts FROM tracker_metadata WHERE id = 1'
+    ).fetchone()
+    if not row or not row['location_counts'] or row['location_counts'] == '{}':
+        return
+
+    legacy_counts = _safe_json_loads(row['location_counts'], {}, 'location_counts')
+    if isinstance(legacy_counts, dict) and legacy_counts:
+        conn.executemany('''
+            INSERT INTO location_counts (location, count) VALUES (?, ?)
+            ON CONFLICT(location) DO UPDATE SET count = count + excluded.count
+        ''', [(location, int(count)) for location, count in legacy_counts.items()])
+        logger.info(f"Migrated {len(legacy_counts)} location counts from tracker metadata")
+
+    conn.execute("UPDATE tracker_metadata SET location_counts = '{}' WHERE id = 1")
+
+
 def create_fresh_database() -> bool:
     """
     Create a fresh database, deleting any existing one.
@@ -603,7 +671,7 @@ def create_fresh_database() -> bool:
 
 def hash_exists(hash_value: str) -> bool:
     """Check if a hash exists in the sent_hashes table."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         result = conn.execute(
             'SELECT 1 FROM sent_hashes WHERE hash = ?',
             (hash_value,)
@@ -653,7 +721,7 @@ def get_all_sent_hashes() -> Set[str]:
             "for individual checks or iter_sent_hashes() for streaming."
         )
 
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute('SELECT hash FROM sent_hashes').fetchall()
         return {row['hash'] for row in rows}
 
@@ -673,7 +741,7 @@ def iter_sent_hashes(batch_size: int = 10000):
     """
     offset = 0
     while True:
-        with get_db() as conn:
+        with get_db(readonly=True) as conn:
             rows = conn.execute(
                 'SELECT hash FROM sent_hashes ORDER BY rowid LIMIT ? OFFSET ?',
                 (batch_size, offset)
@@ -699,7 +767,7 @@ def get_sent_hashes_batch(offset: int = 0, limit: int = 10000) -> List[str]:
     Returns:
         List of hash strings
     """
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute(
             'SELECT hash FROM sent_hashes ORDER BY rowid LIMIT ? OFFSET ?',
             (limit, offset)
@@ -709,7 +777,7 @@ def get_sent_hashes_batch(offset: int = 0, limit: int = 10000) -> List[str]:
 
 def get_sent_hash_count() -> int:
     """Get the count of sent hashes."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         result = conn.execute('SELECT COUNT(*) FROM sent_hashes').fetchone()
         return result[0]
 
@@ -736,6 +804,30 @@ def cleanup_old_hashes(days: int = 90) -> int:
         return deleted
 
 
+def optimize_database() -> int:
+    """
+    Run periodic SQLite maintenance to keep lookups fast in long-running daemons.
+
+    The dedup path (get_existing_hashes) relies on the sent_hashes primary key
+    index. After steady insert/delete churn from cleanup_old_hashes, the index
+    statistics go stale and freed pages are never returned, since
+    auto_vacuum=INCREMENTAL only reclaims space when asked to. This refreshes
+    planner statistics (PRAGMA optimize) and reclaims free pages
+    (PRAGMA incremental_vacuum).
+
+    Returns:
+        Number of free pages before reclaiming
+    """
+    with get_db() as conn:
+        free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        conn.execute('PRAGMA optimize')
+        if free_pages > 0:
+            # incremental_vacuum frees one page per result row - drain it fully
+            conn.execute('PRAGMA incremental_vacuum').fetchall()
+            logger.debug(f"Reclaimed {free_pages} free database pages")
+        return free_pages
+
+
 # ============================================================================
 # Sheet Progress Operations (Incremental Fetching)
 # ============================================================================
@@ -751,7 +843,7 @@ def get_sheet_progress(spreadsheet_id: str, gid: str) -> int:
         Last processed row index (1-indexed), or 0 if not tracked yet
     """
     sheet_key = f"{spreadsheet_id}_{gid}"
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         row = conn.execute(
             'SELECT last_row_index FROM sheet_progress WHERE sheet_key = ?',
             (sheet_key,)
@@ -805,6 +897,40 @@ def reset_sheet_progress(spreadsheet_id: str = None, gid: str = None) -> int:
         return deleted
 
 
+def get_spreadsheet_mtime(spreadsheet_id: str) -> Optional[str]:
+    """Get the Drive modifiedTime recorded at the last completed check of a spreadsheet.
+
+    Args:
+        spreadsheet_id: The Google Sheets spreadsheet ID
+
+    Returns:
+        RFC 3339 modifiedTime string, or None if not tracked yet
+    """
+    with get_db(readonly=True) as conn:
+        row = conn.execute(
+            'SELECT modified_time FROM spreadsheet_state WHERE spreadsheet_id = ?',
+            (spreadsheet_id,)
+        ).fetchone()
+        return row['modified_time'] if row else None
+
+
+def update_spreadsheet_mtime(spreadsheet_id: str, modified_time: str) -> None:
+    """Record the Drive modifiedTime of a spreadsheet after all its sheets were checked.
+
+    Args:
+        spreadsheet_id: The Google Sheets spreadsheet ID
+        modified_time: RFC 3339 modifiedTime reported by the Drive API
+    """
+    with get_db() as conn:
+        conn.execute('''
+            INSERT INTO spreadsheet_state (spreadsheet_id, modified_time, last_check)
+            VALUES (?, ?, ?)
+            ON CONFLICT(spreadsheet_id) DO UPDATE SET
+                modified_time = excluded.modified_time,
+                last_check = excluded.last_check
+        ''', (spreadsheet_id, modified_time, utc_now().isoformat()))
+
+
 def get_existing_hashes(hashes: List[str]) -> Set[str]:
     """Return set of hashes that already exist in sent_hashes.
 
@@ -828,7 +954,7 @@ def get_existing_hashes(hashes: List[str]) -> Set[str]:
     BATCH_SIZE = 500
     existing = set()
 
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         for i in range(0, len(hashes), BATCH_SIZE):
             batch = hashes[i:i + BATCH_SIZE]
             placeholders = ','.join('?' * len(batch))
@@ -847,9 +973,9 @@ def get_existing_hashes(hashes: List[str]) -> Set[str]:
 
 def get_tracker_metadata() -> Dict[str, Any]:
     """Get tracker metadata."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         row = conn.execute(
-            'SELECT last_check, cache_built_at, last_error_email_sent, location_counts FROM tracker_metadata WHERE id = 1'
+            'SELECT last_check, cache_built_at, last_error_email_sent FROM tracker_metadata WHERE id = 1'
         ).fetchone()
 
         if row:
@@ -857,7 +983,7 @@ def get_tracker_metadata() -> Dict[str, Any]:
                 'last_check': row['last_check'],
                 'cache_built_at': row['cache_built_at'],
                 'last_error_email_sent': row['last_error_email_sent'],
-                'location_counts': _safe_json_loads(row['location_counts'], {}, 'location_counts')
+                'location_counts': _get_location_counts(conn)
             }
         return {
             'last_check': None,
@@ -872,7 +998,7 @@ def update_tracker_metadata(
     last_error_email_sent: str = None,
     location_counts: Dict[str, int] = None
 ):
-    """Update tracker metadata fields."""
+    """Update tracker metadata fields. location_counts replaces all stored counts."""
     with get_db() as conn:
         updates = []
         params = []
@@ -885,64 +1011,51 @@ def update_tracker_metadata(
             updates.append('last_error_email_sent = ?')
             params.append(last_error_email_sent)
 
-        if location_counts is not None:
-            updates.append('location_counts = ?')
-            params.append(json.dumps(location_counts))
-
         if updates:
             conn.execute(
                 f'UPDATE tracker_metadata SET {", ".join(updates)} WHERE id = 1',
                 params
             )
 
+        if location_counts is not None:
+            conn.execute('DELETE FROM location_counts')
+            conn.executemany(
+                'INSERT INTO location_counts (location, count) VALUES (?, ?)',
+                list(location_counts.items())
+            )
 
-def increment_location_count(location: str, increment: int = 1):
-    """
-    Increment the count for a specific location atomically.
 
-    Uses SQLite's json_set function for atomic read-modify-write to prevent
-    race conditions when multiple threads increment simultaneously.
-    """
-    # Build JSON path with proper quoting for keys with spaces/special chars
-    # e.g., '$."Eden Prairie"' instead of '$.Eden Prairie'
-    json_path = f'$."{location}"'
+def _get_location_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Read all location counts on an open connection, ordered by location."""
+    rows = conn.execute(
+        'SELECT location, count FROM location_counts ORDER BY location'
+    ).fetchall()
+    return {row['location']: row['count'] for row in rows}
 
-    with get_db() as conn:
-        # First, try atomic update using json_set (SQLite 3.38+)
-        # This handles the case where the key already exists
-        cursor = conn.execute('''
-            UPDATE tracker_metadata
-            SET location_counts = json_set(
-                COALESCE(location_counts, '{}'),
-                ?,
-                COALESCE(
-                    json_extract(location_counts, ?),
-                    0
-                ) + ?
-            )
-            WHERE id = 1
-        ''', (json_path, json_path, increment))
 
-        # If json_set is not available (older SQLite), fall back to serialized update
-        if cursor.rowcount == 0:
-            # Ensure row exists
-            conn.execute('''
-                INSERT OR IGNORE INTO tracker_metadata (id, cache_built_at, location_counts)
-                VALUES (1, ?, '{}')
-            ''', (utc_now().isoformat(),))
+def get_location_counts() -> Dict[str, int]:
+    """Get cumulative lead counts per location, ordered by location."""
+    with get_db(readonly=True) as conn:
+        return _get_location_counts(conn)
 
-            # Use a transaction with IMMEDIATE to serialize access
-            row = conn.execute(
-                'SELECT location_counts FROM tracker_metadata WHERE id = 1'
-            ).fetchone()
 
-            counts = json.loads(row['location_counts'] or '{}') if row else {}
-            counts[location] = counts.get(location, 0) + increment
+def _increment_location_count(conn: sqlite3.Connection, location: str, increment: int) -> None:
+    """Apply a location count increment on an open connection (caller owns the transaction)."""
+    conn.execute('''
+        INSERT INTO location_counts (location, count) VALUES (?, ?)
+        ON CONFLICT(location) DO UPDATE SET count = count + excluded.count
+    ''', (location, increment))
 
-            conn.execute(
-                'UPDATE tracker_metadata SET location_counts = ? WHERE id = 1',
-                (json.dumps(counts),)
-            )
+
+def increment_location_count(location: str, increment: int = 1):
+    """
+    Increment the count for a specific location atomically.
+
+    A single upsert on the location_counts row, so concurrent increments
+    can't lose updates and the cost doesn't grow with the number of locations.
+    """
+    with get_db() as conn:
+        _increment_location_count(conn, location, increment)
 
 
 # ============================================================================
@@ -1033,7 +1146,7 @@ def add_to_failed_queue(
 
 def get_failed_queue_entries() -> List[Dict[str, Any]]:
     """Get all entries in the failed queue."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute('''
             SELECT entry_hash, lead_data, momence_host, attempts,
                    last_error, last_error_message, last_error_details, error_history,
@@ -1060,7 +1173,7 @@ def get_failed_queue_entries() -> List[Dict[str, Any]]:
 
 def get_failed_queue_count() -> int:
     """Get the count of failed queue entries."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         result = conn.execute('SELECT COUNT(*) FROM failed_queue').fetchone()
         return result[0]
 
@@ -1079,7 +1192,7 @@ def get_failed_queue_entries_paginated(limit: int = 100, offset: int = 0) -> Lis
     Returns:
         List of failed queue entry dictionaries
     """
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute('''
             SELECT entry_hash, lead_data, momence_host, attempts,
                    last_error, last_error_message, last_error_details, error_history,
@@ -1224,7 +1337,7 @@ def move_to_dead_letters(entry_hash: str):
 
 def get_dead_letters() -> List[Dict[str, Any]]:
     """Get all dead letter entries."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute('''
             SELECT entry_hash, lead_data, momence_host, attempts,
                    last_error, last_error_message, last_error_details, error_history,
@@ -1252,7 +1365,7 @@ def get_dead_letters() -> List[Dict[str, Any]]:
 
 def get_dead_letter_count() -> int:
     """Get the count of dead letter entries."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         result = conn.execute('SELECT COUNT(*) FROM dead_letters').fetchone()
         return result[0]
 
@@ -1329,7 +1442,7 @@ def cleanup_expired_dead_letters(ttl_days: int = 90) -> int:
 
 def get_dead_letter_stats() -> Dict[str, Any]:
     """Get statistics about dead letters."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         count = conn.execute('SELECT COUNT(*) FROM dead_letters').fetchone()[0]
 
         if count == 0:
@@ -1438,7 +1551,7 @@ def get_admin_activity_log(limit: int = 50, action_filter: str = None) -> List[D
     Returns:
         List of activity entries, newest first
     """
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         if action_filter:
             rows = conn.execute('''
                 SELECT id, timestamp, action, details, username, ip_address, session_id, user_agent, metadata
@@ -1554,6 +1667,26 @@ def _normalize_date(date_str: str) -> str:
     return utc_now().strftime('%Y-%m-%d')
 
 
+def _lead_metric_row(location: str, momence_host: str, lead_date: str = None, success: bool = True) -> tuple:
+    """Build the lead_metrics insert parameters for a single lead."""
+    # Store full datetime if provided, otherwise use current time
+    if lead_date and 'T' in str(lead_date):
+        lead_datetime = str(lead_date)
+    else:
+        lead_datetime = utc_now().isoformat()
+
+    # Normalize to date only for daily aggregation
+    normalized_date = _normalize_date(lead_date)
+
+    return (lead_datetime, normalized_date, location, momence_host, 1 if success else 0, utc_now().isoformat())
+
+
+_INSERT_LEAD_METRIC_SQL = '''
+    INSERT INTO lead_metrics (lead_datetime, lead_date, location, momence_host, success, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+
 def record_lead_metric(location: str, momence_host: str, lead_date: str = None, success: bool = True):
     """
     Record a lead metric with full datetime for hourly tracking.
@@ -1566,20 +1699,45 @@ def record_lead_metric(location: str, momence_host: str, lead_date: str = None,
                    If not provided, uses current UTC time.
         success: True if lead was sent successfully, False if failed
     """
-    # Store full datetime if provided, otherwise use current time
-    if lead_date and 'T' in str(lead_date):
-        lead_datetime = str(lead_date)
-    else:
-        lead_datetime = utc_now().isoformat()
+    row = _lead_metric_row(location, momence_host, lead_date, success)
+    with get_db() as conn:
+        conn.execute(_INSERT_LEAD_METRIC_SQL, row)
 
-    # Normalize to date only for daily aggregation
-    normalized_date = _normalize_date(lead_date)
+
+def bulk_commit(
+    sent_hashes: List[tuple] = None,
+    location_increments: Dict[str, int] = None,
+    metrics: List[tuple] = None
+) -> None:
+    """
+    Persist a processing cycle's deferred writes in a single transaction.
+
+    Collapses the per-lead add_sent_hash / increment_location_count /
+    record_lead_metric calls into one commit (one fsync) per cycle.
+
+    Args:
+        sent_hashes: List of (hash, location) tuples
+        location_increments: Dict mapping location name to count increment
+        metrics: List of (location, momence_host, lead_date, success) tuples
+    """
+    if not sent_hashes and not location_increments and not metrics:
+        return
 
     with get_db() as conn:
-        conn.execute('''
-            INSERT INTO lead_metrics (lead_datetime, lead_date, location, momence_host, success, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (lead_datetime, normalized_date, location, momence_host, 1 if success else 0, utc_now().isoformat()))
+        if sent_hashes:
+            now = utc_now().isoformat()
+            conn.executemany(
+                'INSERT OR IGNORE INTO sent_hashes (hash, location, created_at) VALUES (?, ?, ?)',
+                [(h, loc, now) for h, loc in sent_hashes]
+            )
+        if location_increments:
+            for location, increment in location_increments.items():
+                _increment_location_count(conn, location, increment)
+        if metrics:
+            conn.executemany(
+                _INSERT_LEAD_METRIC_SQL,
+                [_lead_metric_row(*metric) for metric in metrics]
+            )
 
 
 def get_leads_by_location_daily(days: int = 30) -> List[Dict[str, Any]]:
@@ -1594,7 +1752,7 @@ def get_leads_by_location_daily(days: int = 30) -> List[Dict[str, Any]]:
     """
     cutoff = (utc_now() - timedelta(days=days)).strftime('%Y-%m-%d')
 
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute('''
             SELECT lead_date, location, momence_host,
                    SUM(success) as leads_sent,
@@ -1631,7 +1789,7 @@ def get_leads_by_hour(hours: int = 24) -> List[Dict[str, Any]]:
     """
     cutoff = (utc_now() - timedelta(hours=hours)).isoformat()
 
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute('''
             SELECT
                 SUBSTR(lead_datetime, 1, 13) || ':00' as hour,
@@ -1723,7 +1881,7 @@ def get_leads_summary_stats(days: int = 30) -> Dict[str, Any]:
     """
     cutoff = (utc_now() - timedelta(days=days)).strftime('%Y-%m-%d')
 
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         # Total leads by location
         location_totals = conn.execute('''
             SELECT location, momence_host,
@@ -1887,7 +2045,7 @@ def get_session_info(token: str) -> Optional[Dict[str, Any]]:
     if not token:
         return None
 
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         row = conn.execute('''
             SELECT token, username, ip_address, created_at, last_accessed_at, expires_at
             FROM web_sessions WHERE token = ?
@@ -1917,7 +2075,7 @@ def cleanup_expired_sessions() -> int:
 def get_active_session_count() -> int:
     """Get count of active (non-expired) sessions."""
     now = utc_now().isoformat()
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         result = conn.execute(
             'SELECT COUNT(*) FROM web_sessions WHERE expires_at >= ?',
             (now,)
@@ -2007,7 +2165,7 @@ def get_all_hosts() -> List[Dict[str, Any]]:
     Returns:
         List of host dictionaries
     """
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute('''
             SELECT name, host_id, token, enabled, created_at, updated_at
             FROM momence_hosts
@@ -2037,7 +2195,7 @@ def get_host(name: str) -> Optional[Dict[str, Any]]:
     Returns:
         Host dictionary or None if not found
     """
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         row = conn.execute('''
             SELECT name, host_id, token, enabled, created_at, updated_at
             FROM momence_hosts WHERE name = ?
@@ -2063,7 +2221,7 @@ def get_enabled_hosts() -> List[Dict[str, Any]]:
     Returns:
         List of enabled host dictionaries
     """
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute('''
             SELECT name, host_id, token, enabled, created_at, updated_at
             FROM momence_hosts
@@ -2226,7 +2384,7 @@ def get_all_sheets() -> List[Dict[str, Any]]:
     Returns:
         List of sheet dictionaries
     """
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute('''
             SELECT id, spreadsheet_id, gid, name, momence_host, lead_source_id,
                    enabled, notification_email, created_at, updated_at
@@ -2261,7 +2419,7 @@ def get_sheet(sheet_id: int) -> Optional[Dict[str, Any]]:
     Returns:
         Sheet dictionary or None if not found
     """
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         row = conn.execute('''
             SELECT id, spreadsheet_id, gid, name, momence_host, lead_source_id,
                    enabled, notification_email, created_at, updated_at
@@ -2296,7 +2454,7 @@ def get_sheet_by_spreadsheet(spreadsheet_id: str, gid: str) -> Optional[Dict[str
     Returns:
         Sheet dictionary or None if not found
     """
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         row = conn.execute('''
             SELECT id, spreadsheet_id, gid, name, momence_host, lead_source_id,
                    enabled, notification_email, created_at, updated_at
@@ -2327,7 +2485,7 @@ def get_enabled_sheets_db() -> List[Dict[str, Any]]:
     Returns:
         List of enabled sheet dictionaries
     """
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute('''
             SELECT s.id, s.spreadsheet_id, s.gid, s.name, s.momence_host, s.lead_source_id,
                    s.enabled, s.notification_email, s.created_at, s.updated_at
@@ -2364,7 +2522,7 @@ def get_sheets_by_host(momence_host: str) -> List[Dict[str, Any]]:
     Returns:
         List of sheet dictionaries
     """
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         rows = conn.execute('''
             SELECT id, spreadsheet_id, gid, name, momence_host, lead_source_id,
                    enabled, notification_email, created_at, updated_at
@@ -2551,13 +2709,13 @@ def get_sheets_as_config_list() -> List[Dict[str, Any]]:
 
 def get_host_count() -> int:
     """Get the count of Momence hosts."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         result = conn.execute('SELECT COUNT(*) FROM momence_hosts').fetchone()
         return result[0]
 
 
 def get_sheet_count() -> int:
     """Get the count of sheets/locations."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         result = conn.execute('SELECT COUNT(*) FROM sheets').fetchone()
         return result[0]
@@ -449,6 +449,93 @@ class TestEndToEndFlow:
         assert storage.hash_exists(hash1) is True
         assert storage.hash_exists(hash3) is False
 
+    @patch('monitor.time.sleep')
+    @patch('monitor.create_momence_lead')
+    def test_duplicate_leads_posted_once_per_cycle(self, mock_create_lead, mock_sleep, integration_env):
+        """Test that the same lead in two sheets is only posted once per cycle."""
+        import storage
+        import monitor
+        storage.init_database()
+
+        mock_create_lead.return_value = {'success': True}
+
+        headers = ['id', 'email', 'first_name', 'last_name']
+        entries = []
+        for i, sheet_name in enumerate(['Sheet A', 'Sheet B']):
+            entries.append({
+                'sheet_config': {'name': sheet_name, 'lead_source_id': 123},
+                'sheet_name': sheet_name,
+                'gid': str(i),
+                'spreadsheet_id': 'test-spreadsheet-id-1234567890',
+                'row_index': 2,
+                'headers': headers,
+                'data': [str(i), 'Dup@Example.com ', 'Jane', 'Smith'],
+                'hash': f'dup-hash-{i}',
+                'momence_host': 'TestTenant'
+            })
+
+        errors, leads_by_location = monitor.process_new_entries(entries)
+
+        assert errors == []
+        assert mock_create_lead.call_count == 1
+        assert list(leads_by_location) == ['Sheet A']
+        # Both rows are marked processed so neither is picked up again
+        assert storage.hash_exists('dup-hash-0') is True
+        assert storage.hash_exists('dup-hash-1') is True
+
+    @patch('monitor.time.sleep')
+    @patch('monitor.create_momence_lead')
+    def test_progress_saved_when_processing_interrupted(self, mock_create_lead, mock_sleep, integration_env):
+        """Test that leads sent before an error are committed and the error still propagates."""
+        import storage
+        import monitor
+        storage.init_database()
+
+        mock_create_lead.side_effect = [{'success': True}, RuntimeError('connection pool exploded')]
+
+        headers = ['id', 'email', 'first_name', 'last_name']
+        entries = [{
+            'sheet_config': {'name': 'Sheet A', 'lead_source_id': 123},
+            'sheet_name': 'Sheet A',
+            'gid': '0',
+            'spreadsheet_id': 'test-spreadsheet-id-1234567890',
+            'row_index': i + 2,
+            'headers': headers,
+            'data': [str(i), f'lead{i}@example.com', 'Jane', 'Smith'],
+            'hash': f'interrupted-hash-{i}',
+            'momence_host': 'TestTenant'
+        } for i in range(2)]
+
+        with pytest.raises(RuntimeError, match='connection pool exploded'):
+            monitor.process_new_entries(entries)
+
+        assert storage.get_location_counts() == {'Sheet A': 1}
+
+    @patch('monitor.time.sleep')
+    @patch('monitor.create_momence_lead')
+    def test_commit_failure_does_not_mask_processing_error(self, mock_create_lead, mock_sleep, integration_env):
+        """Test that a failing progress commit doesn't replace the error that interrupted processing."""
+        import sqlite3
+        import monitor
+
+        mock_create_lead.side_effect = RuntimeError('connection pool exploded')
+        entry = {
+            'sheet_config': {'name': 'Sheet A', 'lead_source_id': 123},
+            'sheet_name': 'Sheet A',
+            'gid': '0',
+            'spreadsheet_id': 'test-spreadsheet-id-1234567890',
+            'row_index': 2,
+            'headers': ['id', 'email', 'first_name', 'last_name'],
+            'data': ['0', 'lead@example.com', 'Jane', 'Smith'],
+            'hash': 'masked-hash',
+            'momence_host': 'TestTenant'
+        }
+
+        with patch('monitor.storage.add_sent_hash'), \
+                patch('monitor.storage.bulk_commit', side_effect=sqlite3.OperationalError('database is locked')):
+            with pytest.raises(RuntimeError, match='connection pool exploded'):
+                monitor.process_new_entries([entry])
+
 
 # ============================================================================
 # Performance Tests
@@ -0,0 +1,371 @@
+"""
+Tests for notifications module.
+"""
+
+import smtplib
+
+import pytest
+
+
+class FakeSMTP:
+    """Minimal stand-in for smtplib.SMTP that records calls."""
+
+    instances = []
+    extensions = ()
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.messages = []
+        self.mail_options = []
+        self.logins = 0
+        self.closed = False
+        self.fail_next_send = None
+        FakeSMTP.instances.append(self)
+
+    def starttls(self, context=None):
+        pass
+
+    def login(self, username, password):
+        self.logins += 1
+
+    def has_extn(self, name):
+        return name in self.extensions
+
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=()):
+        if self.fail_next_send:
+            error, self.fail_next_send = self.fail_next_send, None
+            raise error
+        self.sent.append((from_addr, list(to_addrs)))
+        self.messages.append(msg)
+        self.mail_options.append(tuple(mail_options))
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    """Replace the SMTP client with FakeSMTP and configure SMTP credentials."""
+    import notifications
+
+    FakeSMTP.instances = []
+    FakeSMTP.extensions = ()
+    monkeypatch.setattr(notifications, 'PipeliningSMTP', FakeSMTP)
+    monkeypatch.setattr(notifications, 'get_smtp_config', lambda: {
+        'host': 'smtp.example.com',
+        'port': 587,
+        'username': 'user@example.com',
+        'password': 'secret',
+        'from_address': 'monitor@example.com',
+        'use_tls': True,
+    })
+    return FakeSMTP
+
+
+class TestSmtpSession:
+    """Tests for SMTP connection reuse."""
+
+    def test_session_reuses_connection(self, fake_smtp):
+        """Test that several emails in one session share a single login."""
+        from notifications import SmtpSession, send_email
+
+        with SmtpSession() as session:
+            assert send_email(['a@example.com'], 'One', '<p>1</p>', session=session)
+            assert send_email(['b@example.com'], 'Two', '<p>2</p>', session=session)
+
+        assert len(fake_smtp.instances) == 1
+        server = fake_smtp.instances[0]
+        assert server.logins == 1
+        assert [to for _, to in server.sent] == [['a@example.com'], ['b@example.com']]
+        assert server.closed
+        assert session.sent_count == 2
+
+    def test_session_reconnects_after_disconnect(self, fake_smtp):
+        """Test that a dropped connection is reopened and the email retried."""
+        from notifications import SmtpSession, send_email
+
+        with SmtpSession() as session:
+            assert send_email(['a@example.com'], 'One', '<p>1</p>', session=session)
+            fake_smtp.instances[0].fail_next_send = smtplib.SMTPServerDisconnected('gone')
+            assert send_email(['b@example.com'], 'Two', '<p>2</p>', session=session)
+
+        assert len(fake_smtp.instances) == 2
+        assert fake_smtp.instances[1].sent == [('monitor@example.com', ['b@example.com'])]
+
+    def test_message_serialized_once_with_crlf(self, fake_smtp):
+        """Test that all recipients share one CRLF-terminated byte payload."""
+        from notifications import send_email
+
+        assert send_email(['a@example.com', 'b@example.com'], '2 New Lead(s) - Café', '<p>Hi\nthere</p>')
+
+        server = fake_smtp.instances[0]
+        assert server.sent == [('monitor@example.com', ['a@example.com', 'b@example.com'])]
+        payload = server.messages[0]
+        assert isinstance(payload, bytes)
+        assert b'\r\n' in payload
+        assert b'\n' not in payload.replace(b'\r\n', b'')
+        assert b'Subject: =?utf-8?' in payload
+
+    def test_non_ascii_body_sent_8bit_when_supported(self, fake_smtp):
+        """Test that a UTF-8 body goes out unencoded to servers with 8BITMIME."""
+        from notifications import send_email
+
+        fake_smtp.extensions = ('8bitmime',)
+        assert send_email(['a@example.com'], 'Leads', '<p>Café</p>')
+
+        server = fake_smtp.instances[0]
+        assert server.mail_options == [('BODY=8BITMIME',)]
+        assert b'Content-Transfer-Encoding: 8bit' in server.messages[0]
+        assert '<p>Café</p>'.encode('utf-8') in server.messages[0]
+
+    def test_non_ascii_body_base64_without_8bitmime(self, fake_smtp):
+        """Test that a UTF-8 body falls back to base64 for 7-bit servers."""
+        from notifications import send_email
+
+        assert send_email(['a@example.com'], 'Leads', '<p>Café</p>')
+
+        server = fake_smtp.instances[0]
+        assert server.mail_options == [()]
+        assert b'Content-Transfer-Encoding: base64' in server.messages[0]
+        assert server.messages[0].isascii()
+
+    def test_send_email_without_session(self, fake_smtp):
+        """Test that send_email opens and closes its own connection by default."""
+        from notifications import send_email
+
+        assert send_email(['a@example.com'], 'One', '<p>1</p>')
+
+        assert len(fake_smtp.instances) == 1
+        assert fake_smtp.instances[0].closed
+
+
+class ScriptedSMTP:
+    """Build a PipeliningSMTP whose socket writes and replies are scripted."""
+
+    @staticmethod
+    def create(replies, features=('pipelining', 'size')):
+        from notifications import PipeliningSMTP
+
+        server = PipeliningSMTP()
+        server.ehlo_resp = b'ok'
+        server.does_esmtp = True
+        server.esmtp_features = {name: '' for name in features}
+        server.events = []
+        pending = list(replies)
+
+        def send(data):
+            server.events.append(('send', data if isinstance(data, bytes) else data.encode('ascii')))
+
+        def getreply():
+            server.events.append(('reply',))
+            return pending.pop(0)
+
+        def rset():
+            server.events.append(('rset',))
+            return (250, b'OK')
+
+        server.send = send
+        server.getreply = getreply
+        server.rset = rset
+        return server
+
+
+class TestPipeliningSMTP:
+    """Tests for pipelined SMTP envelopes."""
+
+    def test_envelope_sent_in_one_write(self):
+        """Test that MAIL, RCPT and DATA go out together before any reply is read."""
+        server = ScriptedSMTP.create([
+            (250, b'OK'), (250, b'OK'), (250, b'OK'), (354, b'Go ahead'), (250, b'Queued'),
+        ])
+
+        refused = server.sendmail('from@example.com', ['a@example.com', 'b@example.com'], 'Subject: Hi\n\n.dot line\n')
+
+        assert refused == {}
+        assert server.events[0] == (
+            'send',
+            b'MAIL FROM:<from@example.com> SIZE=26\r\n'
+            b'RCPT TO:<a@example.com>\r\n'
+            b'RCPT TO:<b@example.com>\r\n'
+            b'DATA\r\n'
+        )
+        assert server.events[1:5] == [('reply',)] * 4
+        assert server.events[5] == ('send', b'Subject: Hi\r\n\r\n..dot line\r\n.\r\n')
+
+    def test_partial_recipient_refusal(self):
+        """Test that refused recipients are reported like smtplib does."""
+        server = ScriptedSMTP.create([
+            (250, b'OK'), (550, b'No such user'), (250, b'OK'), (354, b'Go ahead'), (250, b'Queued'),
+        ])
+
+        refused = server.sendmail('from@example.com', ['bad@example.com', 'a@example.com'], 'body')
+
+        assert refused == {'bad@example.com': (550, b'No such user')}
+
+    def test_all_recipients_refused(self):
+        """Test that refusing every recipient raises and resets the transaction."""
+        server = ScriptedSMTP.create([
+            (250, b'OK'), (550, b'No such user'), (503, b'No valid recipients'),
+        ])
+
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            server.sendmail('from@example.com', ['bad@example.com'], 'body')
+
+        assert server.events[-1] == ('rset',)
+
+    def test_mail_options_pipelined(self):
+        """Test that MAIL FROM parameters are kept in the pipelined envelope."""
+        server = ScriptedSMTP.create([
+            (250, b'OK'), (250, b'OK'), (354, b'Go ahead'), (250, b'Queued'),
+        ], features=('pipelining', '8bitmime'))
+
+        server.sendmail('from@example.com', ['a@example.com'], b'body', ['BODY=8BITMIME'])
+
+        assert server.events[0] == (
+            'send',
+            b'MAIL FROM:<from@example.com> BODY=8BITMIME\r\n'
+            b'RCPT TO:<a@example.com>\r\n'
+            b'DATA\r\n'
+        )
+
+    def test_falls_back_without_pipelining(self):
+        """Test that servers without PIPELINING get sequential commands."""
+        server = ScriptedSMTP.create([
+            (250, b'OK'), (250, b'OK'), (354, b'Go ahead'), (250, b'Queued'),
+        ], features=())
+
+        server.sendmail('from@example.com', ['a@example.com'], 'body')
+
+        assert server.events[0] == ('send', b'mail FROM:<from@example.com>\r\n')
+        assert server.events[1] == ('reply',)
+
+
+class TestSendAllDigests:
+    """Tests for concurrent digest sending."""
+
+    def test_send_all_digests(self, fake_smtp, monkeypatch):
+        """Test that every digest is sent and all pooled connections are closed."""
+        import notifications
+
+        def fake_error_digest(errors, session=None):
+            session.send('monitor@example.com', ['admin@example.com'], 'errors')
+            return True
+
+        def fake_location_digest(location_name, leads, session=None, **config):
+            if location_name == 'Broken':
+                raise RuntimeError('boom')
+            session.send('monitor@example.com', [f'{location_name}@example.com'], 'leads')
+            return True
+
+        monkeypatch.setattr(notifications, 'send_error_digest', fake_error_digest)
+        monkeypatch.setattr(notifications, 'send_location_leads_digest', fake_location_digest)
+        monkeypatch.setattr(notifications, 'get_sheets_config', lambda: [])
+        monkeypatch.setattr(notifications, 'get_momence_hosts', lambda: {})
+
+        leads_by_location = {f'loc{i}': [{'email': 'x@example.com'}] for i in range(6)}
+        leads_by_location['Empty'] = []
+        leads_by_location['Broken'] = [{'email': 'y@example.com'}]
+
+        error_sent, results = notifications.send_all_digests([{'error': 'x'}], leads_by_location)
+
+        assert error_sent is True
+        assert results == {**{f'loc{i}': True for i in range(6)}, 'Broken': False}
+        assert 1 <= len(fake_smtp.instances) <= notifications.DIGEST_SEND_WORKERS
+        assert sum(len(server.sent) for server in fake_smtp.instances) == 7
+        assert all(server.closed for server in fake_smtp.instances)
+
+    def test_send_all_digests_nothing_to_send(self, fake_smtp):
+        """Test that no connection is opened when there is nothing to send."""
+        from notifications import send_all_digests
+
+        assert send_all_digests([], {'loc': []}) == (False, {})
+        assert fake_smtp.instances == []
+
+
+class TestDigestHtml:
+    """Tests for digest HTML builders."""
+
+    def test_error_digest_html(self):
+        """Test that every error gets an escaped card and summary badge."""
+        from notifications import build_error_digest_html
+
+        errors = [
+            {'error_type': 'rate_limit', 'momence_host': 'HostA', 'status_code': 429,
+             'lead_email': '<script>@example.com', 'attempts': 2},
+            {'error_type': 'server_error', 'momence_host': 'HostB', 'status_code': 503},
+        ]
+
+        html = build_error_digest_html(errors)
+
+        assert '&lt;script&gt;@example.com' in html
+        assert '<script>' not in html
+        assert 'rate_limit: 1' in html and 'server_error: 1' in html
+        assert 'Attempt 2' in html
+        assert '#2' in html
+
+    def test_large_payload_truncated(self):
+        """Test that large payloads and headers are cut off before rendering."""
+        from config import ERROR_BODY_TRUNCATE_CHARS
+        from notifications import _json_preview, build_error_digest_html
+
+        payload = {'notes': ['x' * 100 for _ in range(10000)]}
+
+        preview = _json_preview(payload)
+        assert len(preview) == ERROR_BODY_TRUNCATE_CHARS + len('\n... [truncated]')
+        assert preview.endswith('... [truncated]')
+        assert _json_preview({'a': 1}) == '{\n  "a": 1\n}'
+
+        html = build_error_digest_html([{'error_type': 'x', 'request_payload': payload}])
+        assert len(html) < 20000
+
+    def test_leads_digest_html(self):
+        """Test that leads are rendered with source badges and Momence links."""
+        from notifications import build_leads_digest_html
+
+        leads = [
+            {'email': 'a@example.com', 'firstName': 'Ann', 'sheetName': 'Form A', 'success': True},
+            {'email': 'b@example.com', 'firstName': 'Bob', 'sheetName': 'Form A', 'success': False,
+             'phoneNumber': '555-123-4567'},
+        ]
+
+        html = build_leads_digest_html('Eden Prairie', leads, host_id='42')
+
+        assert 'Form A: 2' in html
+        assert 'Ann' in html and 'Bob' in html
+        assert '555-123-4567' in html
+        assert 'https://momence.com/dashboard/42/search?query=a%40example.com' in html
+        assert 'query=b%40example.com' not in html
+
+    def test_location_digests_share_config_snapshot(self, fake_smtp, monkeypatch):
+        """Test that sheet and host configs are read once for all location digests."""
+        import notifications
+
+        calls = {'sheets': 0, 'hosts': 0}
+
+        def fake_sheets_config():
+            calls['sheets'] += 1
+            return [
+                {'name': f'loc{i}', 'momence_host': 'Tenant', 'notification_email': f'loc{i}@example.com'}
+                for i in range(3)
+            ]
+
+        def fake_hosts():
+            calls['hosts'] += 1
+            return {'Tenant': {'host_id': '42'}}
+
+        def fail_lookup(*args):
+            raise AssertionError('per-location config lookup')
+
+        monkeypatch.setattr(notifications, 'get_sheets_config', fake_sheets_config)
+        monkeypatch.setattr(notifications, 'get_momence_hosts', fake_hosts)
+        monkeypatch.setattr(notifications, 'get_sheet_config_by_name', fail_lookup)
+        monkeypatch.setattr(notifications, 'get_host_config', fail_lookup)
+
+        leads = [{'email': 'a@example.com', 'success': True}]
+        _, results = notifications.send_all_digests([], {f'loc{i}': leads for i in range(3)})
+
+        assert results == {'loc0': True, 'loc1': True, 'loc2': True}
+        assert calls == {'sheets': 1, 'hosts': 1}
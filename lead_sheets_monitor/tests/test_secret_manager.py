@@ -0,0 +1,284 @@
+"""
+Tests for secret_manager module.
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeNotFound(Exception):
+    """Stand-in for google.api_core.exceptions.NotFound."""
+
+    code = 404
+
+
+class FakeSecretClient:
+    """Stand-in for SecretManagerServiceClient backed by a dict of secrets."""
+
+    def __init__(self, secrets):
+        self.secrets = secrets
+        self.accessed = []
+        self._lock = threading.Lock()
+
+    def access_secret_version(self, request, retry=None, timeout=None):
+        name = request['name']
+        with self._lock:
+            self.accessed.append(name)
+        secret_name = name.split('/secrets/')[1].split('/')[0]
+        if secret_name not in self.secrets:
+            raise FakeNotFound(f"Secret [{name}] not found or has no versions.")
+        return SimpleNamespace(payload=SimpleNamespace(data=self.secrets[secret_name].encode('UTF-8')))
+
+    def create_secret(self, request):
+        self.accessed.append(('create', request['secret_id']))
+        self.secrets.setdefault(request['secret_id'], None)
+
+    def add_secret_version(self, request):
+        secret_name = request['parent'].split('/secrets/')[1]
+        self.accessed.append(('add_version', secret_name))
+        if secret_name not in self.secrets:
+            raise FakeNotFound(f"Secret [{request['parent']}] not found.")
+        self.secrets[secret_name] = request['payload']['data'].decode('UTF-8')
+
+
+@pytest.fixture
+def fake_secret_client(monkeypatch):
+    """Run secret_manager as if on Cloud Run with a fake Secret Manager client."""
+    import secret_manager
+
+    client = FakeSecretClient({
+        'lead-monitor-momence-api-token': 'token-123',
+        'lead-monitor-smtp-password': 'smtp-secret',
+    })
+    monkeypatch.setattr(secret_manager, 'IS_CLOUD_RUN', True)
+    monkeypatch.setattr(secret_manager, '_client', client)
+    secret_manager.clear_cache()
+    yield client
+    secret_manager.clear_cache()
+
+
+class TestPrefetch:
+    """Tests for warming the secrets cache at startup."""
+
+    def test_prefetch_all_fills_cache(self, fake_secret_client):
+        """Test that prefetched secrets are served without another API call."""
+        import secret_manager
+
+        assert secret_manager.prefetch_all() == 2
+        assert len(fake_secret_client.accessed) == len(secret_manager.SECRET_ENV_MAPPING)
+
+        fake_secret_client.accessed.clear()
+        assert secret_manager.get_secret('lead-monitor-momence-api-token') == 'token-123'
+        assert secret_manager.get_smtp_password() == 'smtp-secret'
+        assert fake_secret_client.accessed == []
+
+    def test_prefetch_all_skips_cached_secrets(self, fake_secret_client):
+        """Test that a second prefetch doesn't fetch secrets that are already cached."""
+        import secret_manager
+
+        assert secret_manager.prefetch_all() == 2
+        fake_secret_client.accessed.clear()
+
+        assert secret_manager.prefetch_all() == 0
+        assert fake_secret_client.accessed == []
+
+    def test_prefetch_all_noop_outside_cloud_run(self, fake_secret_client, monkeypatch):
+        """Test that local runs never touch Secret Manager."""
+        import secret_manager
+
+        monkeypatch.setattr(secret_manager, 'IS_CLOUD_RUN', False)
+
+        assert secret_manager.prefetch_all() == 0
+        assert fake_secret_client.accessed == []
+
+
+class TestSecretCache:
+    """Tests for the secrets TTL cache."""
+
+    def test_cached_secret_expires(self, fake_secret_client, monkeypatch):
+        """Test that a secret is refetched once its TTL has passed."""
+        import secret_manager
+
+        now = [1000.0]
+        monkeypatch.setattr(secret_manager.time, 'monotonic', lambda: now[0])
+
+        assert secret_manager.get_secret('lead-monitor-momence-api-token') == 'token-123'
+        assert secret_manager.get_secret('lead-monitor-momence-api-token') == 'token-123'
+        assert len(fake_secret_client.accessed) == 1
+
+        now[0] += secret_manager.SECRET_CACHE_TTL
+        assert secret_manager.get_secret('lead-monitor-momence-api-token') == 'token-123'
+        assert len(fake_secret_client.accessed) == 2
+
+    def test_cache_is_bounded(self, fake_secret_client, monkeypatch):
+        """Test that the oldest entries are evicted once the cache is full."""
+        import secret_manager
+
+        monkeypatch.setattr(secret_manager, 'SECRET_CACHE_MAX_ENTRIES', 3)
+        for i in range(5):
+            secret_manager._cache_put(f'secret-{i}:latest', f'value-{i}')
+
+        assert list(secret_manager._secrets_cache) == ['secret-2:latest', 'secret-3:latest', 'secret-4:latest']
+
+    def test_missing_secret_negatively_cached(self, fake_secret_client, monkeypatch):
+        """Test that a secret missing from Secret Manager isn't refetched, but env vars still apply."""
+        import secret_manager
+
+        monkeypatch.delenv('SLACK_WEBHOOK_URL', raising=False)
+        assert secret_manager.get_secret('lead-monitor-slack-webhook-url') is None
+        assert secret_manager.get_secret('lead-monitor-slack-webhook-url') is None
+        assert len(fake_secret_client.accessed) == 1
+
+        monkeypatch.setenv('SLACK_WEBHOOK_URL', 'https://hooks.example.com/x')
+        assert secret_manager.get_secret('lead-monitor-slack-webhook-url') == 'https://hooks.example.com/x'
+        assert len(fake_secret_client.accessed) == 1
+
+    def test_transient_errors_not_negatively_cached(self, fake_secret_client, monkeypatch):
+        """Test that errors other than not-found are retried on the next call."""
+        import secret_manager
+
+        def unavailable(request, retry=None, timeout=None):
+            fake_secret_client.accessed.append(request['name'])
+            raise Exception("503 Service Unavailable")
+
+        monkeypatch.setattr(fake_secret_client, 'access_secret_version', unavailable)
+        monkeypatch.delenv('MOMENCE_API_TOKEN', raising=False)
+
+        assert secret_manager.get_secret('lead-monitor-momence-api-token') is None
+        assert secret_manager.get_secret('lead-monitor-momence-api-token') is None
+        assert len(fake_secret_client.accessed) == 2
+
+    def test_ttl_overrides(self):
+        """Test that overrides apply to a secret and its tenant-specific variants."""
+        import secret_manager
+
+        assert secret_manager._secret_ttl('lead-monitor-momence-api-token') == 300
+        assert secret_manager._secret_ttl('lead-monitor-momence-api-token-TwinCities') == 300
+        assert secret_manager._secret_ttl('lead-monitor-encryption-key') == 86400
+        assert secret_manager._secret_ttl('lead-monitor-smtp-password') == secret_manager.SECRET_CACHE_TTL
+
+    def test_refresh_ahead_of_expiry(self, fake_secret_client, monkeypatch):
+        """Test that a secret near expiry is served from cache and refreshed in the background."""
+        import secret_manager
+
+        class ImmediateExecutor:
+            def submit(self, fn):
+                fn()
+
+        now = [1000.0]
+        monkeypatch.setattr(secret_manager.time, 'monotonic', lambda: now[0])
+        monkeypatch.setattr(secret_manager, '_refresh_executor', ImmediateExecutor())
+
+        assert secret_manager.get_secret('lead-monitor-smtp-password') == 'smtp-secret'
+        fake_secret_client.secrets['lead-monitor-smtp-password'] = 'rotated'
+
+        now[0] += secret_manager.SECRET_CACHE_TTL * 0.95
+        assert secret_manager.get_secret('lead-monitor-smtp-password') == 'smtp-secret'
+        assert len(fake_secret_client.accessed) == 2
+
+        now[0] += secret_manager.SECRET_CACHE_TTL * 0.5
+        assert secret_manager.get_secret('lead-monitor-smtp-password') == 'rotated'
+        assert len(fake_secret_client.accessed) == 2
+        assert secret_manager._refreshing == set()
+
+
+class TestDashboardCredentials:
+    """Tests for dashboard credential lookup."""
+
+    def test_dashboard_credentials_from_secret_manager_and_env(self, fake_secret_client, monkeypatch):
+        """Test that all three credentials resolve, mixing Secret Manager and env vars."""
+        import secret_manager
+
+        fake_secret_client.secrets['lead-monitor-dashboard-api-key'] = 'api-key'
+        monkeypatch.setenv('DASHBOARD_USERNAME', 'admin')
+        monkeypatch.delenv('DASHBOARD_PASSWORD', raising=False)
+
+        assert secret_manager.get_dashboard_credentials() == {
+            'api_key': 'api-key',
+            'username': 'admin',
+            'password': None,
+        }
+        assert len(fake_secret_client.accessed) == 3
+
+
+class TestSetSecret:
+    """Tests for writing secrets."""
+
+    def test_update_existing_secret(self, fake_secret_client):
+        """Test that updating a secret is a single add-version call and refreshes the cache."""
+        import secret_manager
+
+        assert secret_manager.get_secret('lead-monitor-smtp-password') == 'smtp-secret'
+        fake_secret_client.accessed.clear()
+
+        assert secret_manager.set_secret('lead-monitor-smtp-password', 'new-password')
+        assert fake_secret_client.accessed == [('add_version', 'lead-monitor-smtp-password')]
+        assert secret_manager.get_secret('lead-monitor-smtp-password') == 'new-password'
+
+    def test_create_missing_secret(self, fake_secret_client):
+        """Test that a missing secret is created before its first version is added."""
+        import secret_manager
+
+        assert secret_manager.set_secret('lead-monitor-momence-api-token-Studio', 'tenant-token')
+        assert fake_secret_client.accessed == [
+            ('add_version', 'lead-monitor-momence-api-token-Studio'),
+            ('create', 'lead-monitor-momence-api-token-Studio'),
+            ('add_version', 'lead-monitor-momence-api-token-Studio'),
+        ]
+        assert fake_secret_client.secrets['lead-monitor-momence-api-token-Studio'] == 'tenant-token'
+
+
+class TestSecretsSource:
+    """Tests for the SECRETS_SOURCE switch."""
+
+    def test_env_source_never_calls_secret_manager(self, fake_secret_client, monkeypatch):
+        """Test that SECRETS_SOURCE=env resolves only from env vars."""
+        import secret_manager
+
+        monkeypatch.setattr(secret_manager, 'SECRETS_SOURCE', 'env')
+        monkeypatch.setenv('SMTP_PASSWORD', 'from-env')
+        monkeypatch.delenv('MOMENCE_API_TOKEN', raising=False)
+
+        assert secret_manager.prefetch_all() == 0
+        assert secret_manager.get_smtp_password() == 'from-env'
+        assert secret_manager.get_secret('lead-monitor-momence-api-token') is None
+        assert fake_secret_client.accessed == []
+
+    def test_auto_source_prefers_env_when_set(self, fake_secret_client, monkeypatch):
+        """Test that SECRETS_SOURCE=auto only calls Secret Manager for secrets without an env var."""
+        import secret_manager
+
+        monkeypatch.setattr(secret_manager, 'SECRETS_SOURCE', 'auto')
+        monkeypatch.setenv('SMTP_PASSWORD', 'from-env')
+        monkeypatch.delenv('MOMENCE_API_TOKEN', raising=False)
+
+        assert secret_manager.get_smtp_password() == 'from-env'
+        assert secret_manager.get_secret('lead-monitor-momence-api-token') == 'token-123'
+        assert len(fake_secret_client.accessed) == 1
+
+    def test_default_source_prefers_secret_manager(self, fake_secret_client, monkeypatch):
+        """Test that by default Secret Manager wins over a set env var."""
+        import secret_manager
+
+        monkeypatch.setenv('SMTP_PASSWORD', 'from-env')
+
+        assert secret_manager.get_smtp_password() == 'smtp-secret'
+
+
+class TestAccessRetry:
+    """Tests for the Secret Manager read retry budget."""
+
+    def test_retry_only_transient_errors(self):
+        """Test that only UNAVAILABLE/DEADLINE_EXCEEDED are retried, within a short deadline."""
+        core_exceptions = pytest.importorskip('google.api_core.exceptions')
+        import secret_manager
+
+        retry = secret_manager._access_retry()
+
+        assert retry._predicate(core_exceptions.ServiceUnavailable('down'))
+        assert retry._predicate(core_exceptions.DeadlineExceeded('slow'))
+        assert not retry._predicate(core_exceptions.NotFound('missing'))
+        assert not retry._predicate(core_exceptions.ResourceExhausted('quota'))
+        assert retry._timeout == secret_manager.SECRET_ACCESS_RETRY_DEADLINE
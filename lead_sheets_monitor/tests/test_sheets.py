@@ -2,6 +2,8 @@
 Tests for sheets.py - Google Sheets API functions.
 """
 
+import json
+
 import pytest
 from unittest.mock import MagicMock, patch
 
@@ -23,6 +25,7 @@ class TestSpreadsheetIdValidation:
 
         assert validate_spreadsheet_id('short') is False
         assert validate_spreadsheet_id('a' * 19) is False
+        assert validate_spreadsheet_id('a' * 101) is False
 
     def test_invalid_spreadsheet_id_special_chars(self):
         """Test spreadsheet IDs with invalid chars fail."""
@@ -31,6 +34,7 @@ class TestSpreadsheetIdValidation:
         assert validate_spreadsheet_id('abc/def') is False
         assert validate_spreadsheet_id('abc..def') is False
         assert validate_spreadsheet_id('abc<script>def') is False
+        assert validate_spreadsheet_id('a' * 44 + '\n') is False
 
     def test_invalid_spreadsheet_id_empty(self):
         """Test empty/None spreadsheet IDs fail validation."""
@@ -83,6 +87,14 @@ class TestUrlParsing:
         assert parse_spreadsheet_url('https://example.com/not-a-sheet') is None
         assert parse_spreadsheet_url('random-text') is None
 
+    def test_parse_url_gid_in_query(self):
+        """Test that a gid after other query parameters is found."""
+        from sheets import parse_spreadsheet_url
+
+        url = 'https://docs.google.com/spreadsheets/d/1BxiMVs0XRA5nFMdKvBdBZjgmUUqptlbs74OgvE2upms/edit?usp=sharing&gid=7'
+
+        assert parse_spreadsheet_url(url) == ('1BxiMVs0XRA5nFMdKvBdBZjgmUUqptlbs74OgvE2upms', '7')
+
 
 class TestRetryLogic:
     """Tests for retry with backoff logic."""
@@ -143,6 +155,576 @@ class TestRetryLogic:
         assert is_retryable_error(ConnectionError('Connection refused')) is True
 
 
+class TestCloseGoogleService:
+    """Tests for releasing the cached service's connections."""
+
+    def test_close_releases_pooled_connections(self, monkeypatch):
+        """Test that every pooled httplib2 connection is closed and the cache emptied."""
+        httplib2 = pytest.importorskip('httplib2')
+        import sheets
+
+        http = httplib2.Http()
+        conn = MagicMock()
+        http.connections['https:sheets.googleapis.com'] = conn
+        service = MagicMock()
+        service._http.http = http
+        monkeypatch.setattr(sheets, '_cached_service', service)
+
+        sheets.close_google_service()
+
+        conn.close.assert_called_once()
+        assert http.connections == {}
+        assert sheets._cached_service is None
+
+
+class TestRetryBackoff:
+    """Tests for retry delays."""
+
+    def test_decorrelated_jitter_delays(self, monkeypatch):
+        """Test that each delay falls between the base delay and 3x the previous one, capped."""
+        import sheets
+
+        delays = []
+        monkeypatch.setattr(sheets.time, 'sleep', delays.append)
+        monkeypatch.setattr(sheets.random, 'uniform', lambda low, high: high)
+
+        def always_times_out():
+            raise TimeoutError('slow')
+
+        with pytest.raises(TimeoutError):
+            sheets.retry_with_backoff(always_times_out, max_retries=5, base_delay=2.0, max_total_wait=300)
+
+        assert delays == [6.0, 18.0, sheets.RETRY_MAX_DELAY_SECONDS, sheets.RETRY_MAX_DELAY_SECONDS]
+
+    def test_total_wait_budget(self, monkeypatch):
+        """Test that the last delay is trimmed to the budget and retries stop once it is spent."""
+        import sheets
+
+        delays = []
+        calls = []
+        monkeypatch.setattr(sheets.time, 'sleep', delays.append)
+        monkeypatch.setattr(sheets.random, 'uniform', lambda low, high: high)
+
+        def always_times_out():
+            calls.append(1)
+            raise TimeoutError('slow')
+
+        with pytest.raises(TimeoutError):
+            sheets.retry_with_backoff(always_times_out, max_retries=5, base_delay=2.0, max_total_wait=30)
+
+        assert delays == [6.0, 18.0, 6.0]
+        assert len(calls) == 4
+
+    def test_retry_after_beyond_budget_gives_up(self, monkeypatch):
+        """Test that a Retry-After longer than the remaining budget isn't slept through."""
+        import httplib2
+        from googleapiclient.errors import HttpError
+        import sheets
+
+        delays = []
+        monkeypatch.setattr(sheets.time, 'sleep', delays.append)
+        resp = httplib2.Response({'status': 429, 'retry-after': '120'})
+
+        def rate_limited():
+            raise HttpError(resp, b'rate limited')
+
+        with pytest.raises(HttpError):
+            sheets.retry_with_backoff(rate_limited, max_retries=3, max_total_wait=60)
+        assert delays == []
+
+    def test_retry_after_honored(self, monkeypatch):
+        """Test that a Retry-After header sets the delay exactly."""
+        import httplib2
+        from googleapiclient.errors import HttpError
+        import sheets
+
+        delays = []
+        monkeypatch.setattr(sheets.time, 'sleep', delays.append)
+        resp = httplib2.Response({'status': 429, 'retry-after': '7'})
+        calls = []
+
+        def rate_limited_once():
+            calls.append(1)
+            if len(calls) == 1:
+                raise HttpError(resp, b'rate limited')
+            return 'ok'
+
+        assert sheets.retry_with_backoff(rate_limited_once, max_retries=3, base_delay=2.0) == 'ok'
+        assert delays == [7.0]
+
+    def test_non_idempotent_call_not_retried_after_timeout(self, monkeypatch):
+        """Test that a write isn't resent when it may already have reached the server."""
+        import requests
+        import sheets
+
+        monkeypatch.setattr(sheets.time, 'sleep', lambda _: None)
+        calls = []
+
+        def timed_out():
+            calls.append(1)
+            raise requests.exceptions.ReadTimeout('read timed out')
+
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            sheets.retry_with_backoff(timed_out, max_retries=3, idempotent=False)
+        assert len(calls) == 1
+
+    def test_non_idempotent_call_retried_on_server_error(self, monkeypatch):
+        """Test that a write is resent after a 5xx answer or a connect timeout."""
+        import requests
+        import sheets
+
+        monkeypatch.setattr(sheets.time, 'sleep', lambda _: None)
+        response = requests.Response()
+        response.status_code = 503
+        failures = [
+            requests.exceptions.HTTPError(response=response),
+            requests.exceptions.ConnectTimeout('connect timed out'),
+        ]
+
+        def flaky():
+            if failures:
+                raise failures.pop(0)
+            return 'created'
+
+        assert sheets.retry_with_backoff(flaky, max_retries=3, idempotent=False) == 'created'
+
+    def test_non_idempotent_call_retried_after_refused_connection(self, monkeypatch):
+        """Test that a write is resent when the connection was refused and nothing was sent."""
+        import requests
+        import sheets
+        from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+        monkeypatch.setattr(sheets.time, 'sleep', lambda _: None)
+        calls = []
+
+        def refused():
+            calls.append(1)
+            if len(calls) == 1:
+                reason = NewConnectionError(None, 'Connection refused')
+                raise requests.exceptions.ConnectionError(MaxRetryError(None, '/api/leads', reason=reason))
+            return 'created'
+
+        assert sheets.retry_with_backoff(refused, max_retries=3, idempotent=False) == 'created'
+        assert len(calls) == 2
+
+    def test_retry_after_from_requests_error_response(self):
+        """Test that Retry-After is read from a requests error response, which is falsy for 4xx."""
+        import requests
+        from sheets import get_retry_after
+
+        response = requests.Response()
+        response.status_code = 429
+        response.headers['Retry-After'] = '12'
+
+        assert get_retry_after(requests.exceptions.HTTPError(response=response)) == 12.0
+        assert get_retry_after(requests.exceptions.ConnectionError()) is None
+
+
+class TestRateLimiter:
+    """Tests for the client-side Sheets rate limiter."""
+
+    def test_burst_then_throttle(self, monkeypatch):
+        """Test that calls beyond the burst wait for tokens to refill."""
+        import sheets
+
+        now = [100.0]
+        sleeps = []
+        monkeypatch.setattr(sheets.time, 'monotonic', lambda: now[0])
+        monkeypatch.setattr(sheets.time, 'sleep', sleeps.append)
+        bucket = sheets._TokenBucket(rate_per_second=2.0, burst=3)
+
+        for _ in range(3):
+            bucket.acquire()
+        assert sleeps == []
+
+        bucket.acquire()
+        bucket.acquire()
+        assert sleeps == [0.5, 1.0]
+
+        now[0] += 10
+        bucket.acquire()
+        assert sleeps == [0.5, 1.0]
+
+
+class TestSpreadsheetModifiedTime:
+    """Tests for Drive modifiedTime change detection."""
+
+    def test_returns_modified_time(self, monkeypatch):
+        """Test modifiedTime is read from the Drive files metadata."""
+        import sheets
+
+        drive = MagicMock()
+        drive.files().get().execute.return_value = {'modifiedTime': '2024-01-15T12:00:00.000Z'}
+        monkeypatch.setattr(sheets, 'build', MagicMock(return_value=drive))
+        monkeypatch.setattr(sheets, '_drive_mtime_available', True)
+        monkeypatch.setattr(sheets, '_cached_drive_service', None)
+
+        result = sheets.get_spreadsheet_modified_time(MagicMock(), 'a' * 44)
+
+        assert result == '2024-01-15T12:00:00.000Z'
+
+    def test_forbidden_disables_lookups(self, monkeypatch):
+        """Test a 403 from Drive disables further lookups instead of retrying every cycle."""
+        import sheets
+        from googleapiclient.errors import HttpError
+
+        resp = MagicMock()
+        resp.status = 403
+        content = json.dumps({'error': {
+            'code': 403,
+            'message': 'Drive API has not been used in project 123 before or it is disabled.',
+            'errors': [{'reason': 'accessNotConfigured'}],
+        }}).encode()
+        drive = MagicMock()
+        drive.files().get().execute.side_effect = HttpError(resp, content)
+        build = MagicMock(return_value=drive)
+        monkeypatch.setattr(sheets, 'build', build)
+        monkeypatch.setattr(sheets, '_drive_mtime_available', True)
+        monkeypatch.setattr(sheets, '_cached_drive_service', None)
+
+        service = MagicMock()
+        assert sheets.get_spreadsheet_modified_time(service, 'a' * 44) is None
+        assert sheets._drive_mtime_available is False
+
+        build.reset_mock()
+        assert sheets.get_spreadsheet_modified_time(service, 'a' * 44) is None
+        build.assert_not_called()
+
+    def test_rate_limited_lookup_keeps_lookups_enabled(self, monkeypatch):
+        """Test a rate-limit 403 only fails that lookup instead of disabling change detection."""
+        import sheets
+        from googleapiclient.errors import HttpError
+
+        resp = MagicMock()
+        resp.status = 403
+        content = json.dumps({'error': {
+            'code': 403,
+            'message': 'User rate limit exceeded.',
+            'errors': [{'reason': 'userRateLimitExceeded'}],
+        }}).encode()
+        drive = MagicMock()
+        drive.files().get().execute.side_effect = HttpError(resp, content)
+        monkeypatch.setattr(sheets, 'build', MagicMock(return_value=drive))
+        monkeypatch.setattr(sheets, 'retry_with_backoff', lambda func, **kwargs: func())
+        monkeypatch.setattr(sheets, '_drive_mtime_available', True)
+        monkeypatch.setattr(sheets, '_cached_drive_service', None)
+
+        assert sheets.get_spreadsheet_modified_time(MagicMock(), 'a' * 44) is None
+        assert sheets._drive_mtime_available is True
+
+
+class TestOrjsonModel:
+    """Tests for decoding API responses with orjson."""
+
+    def test_deserialize_matches_json_model(self):
+        """Test that responses decode the same as the default JsonModel."""
+        pytest.importorskip('orjson')
+        from googleapiclient.model import JsonModel
+        from sheets import OrjsonModel
+
+        content = b'{"range": "Sheet1!A1:B2", "values": [["email", "name"], ["a@example.com", "\\u00c9lise"]]}'
+
+        assert OrjsonModel().deserialize(content) == JsonModel().deserialize(content)
+
+    def test_deserialize_non_json(self):
+        """Test that non-JSON bodies are returned as text like JsonModel."""
+        pytest.importorskip('orjson')
+        from sheets import OrjsonModel
+
+        assert OrjsonModel().deserialize(b'not json') == 'not json'
+
+
+class TestIterSheetRows:
+    """Tests for iterating fetched sheet rows."""
+
+    def test_skips_headers_and_empty_rows(self):
+        """Test that row indices are preserved while empty rows are skipped."""
+        from sheets import iter_sheet_rows
+
+        data = [
+            ['email', 'name'],
+            ['a@example.com', 'A'],
+            ['', '  '],
+            [],
+            ['b@example.com', 'B'],
+        ]
+
+        rows = list(iter_sheet_rows(data, first_row_index=10))
+
+        assert rows == [(10, ['a@example.com', 'A']), (13, ['b@example.com', 'B'])]
+
+    def test_headers_only(self):
+        """Test that a sheet with only headers yields nothing."""
+        from sheets import iter_sheet_rows
+
+        assert list(iter_sheet_rows([['email']])) == []
+
+
+class TestSheetNameByGid:
+    """Tests for resolving tab names from gids."""
+
+    @pytest.fixture(autouse=True)
+    def clear_titles(self, monkeypatch):
+        import sheets
+        monkeypatch.setattr(sheets, '_sheet_titles', {})
+
+    def _service(self):
+        service = MagicMock()
+        service.spreadsheets().get().execute.return_value = {'sheets': [
+            {'properties': {'sheetId': 0, 'title': 'Leads'}},
+            {'properties': {'sheetId': 42, 'title': 'Old Leads'}},
+        ]}
+        service.spreadsheets().get.reset_mock()
+        return service
+
+    def test_titles_cached_per_spreadsheet(self):
+        """Test that all tabs of a spreadsheet resolve from one metadata call."""
+        from sheets import get_sheet_name_by_gid
+
+        service = self._service()
+
+        assert get_sheet_name_by_gid(service, 'a' * 44, '0') == 'Leads'
+        assert get_sheet_name_by_gid(service, 'a' * 44, '42') == 'Old Leads'
+        assert service.spreadsheets().get.call_count == 1
+
+    def test_unknown_gid_refetches(self):
+        """Test that a gid missing from the cache triggers a fresh lookup."""
+        from sheets import get_sheet_name_by_gid
+
+        service = self._service()
+
+        assert get_sheet_name_by_gid(service, 'a' * 44, '0') == 'Leads'
+        assert get_sheet_name_by_gid(service, 'a' * 44, '7') is None
+        assert service.spreadsheets().get.call_count == 2
+
+    def test_fetch_failure_forgets_titles(self):
+        """Test that a failed data fetch drops the spreadsheet's cached titles."""
+        from googleapiclient.errors import HttpError
+        import sheets
+
+        service = self._service()
+        sheets.get_sheet_name_by_gid(service, 'a' * 44, '0')
+
+        resp = MagicMock()
+        resp.status = 400
+        service.spreadsheets().values().get().execute.side_effect = HttpError(resp, b'Unable to parse range')
+        assert sheets.fetch_sheet_data(service, 'a' * 44, 'Leads') == []
+
+        assert 'a' * 44 not in sheets._sheet_titles
+
+
+class TestDiscoverFbLeadTabs:
+    """Tests for discovering Facebook Lead Ads tabs."""
+
+    def test_headers_fetched_in_one_batch(self):
+        """Test that all header rows come from a single batchGet call."""
+        from sheets import discover_fb_lead_tabs
+
+        service = MagicMock()
+        service.spreadsheets().get().execute.return_value = {'sheets': [
+            {'properties': {'sheetId': 0, 'title': 'Summary', 'gridProperties': {'rowCount': 10}}},
+            {'properties': {'sheetId': 11, 'title': "Spring '24 Leads", 'gridProperties': {'rowCount': 500}}},
+            {'properties': {'sheetId': 12, 'title': 'Chart', 'sheetType': 'OBJECT'}},
+            {'properties': {'sheetId': 13, 'title': 'Empty', 'gridProperties': {'rowCount': 1000}}},
+        ]}
+        batch_get = service.spreadsheets().values().batchGet
+        batch_get.return_value.execute.return_value = {'valueRanges': [
+            {'values': [['Total', 'Count']]},
+            {'values': [['id', ' Created_Time', 'ad_id', 'ad_name', 'email']]},
+            {},
+        ]}
+
+        tabs = discover_fb_lead_tabs(service, 'a' * 44)
+
+        assert [(tab['name'], tab['gid'], tab['row_count']) for tab in tabs] == [("Spring '24 Leads", '11', 500)]
+        assert batch_get.call_args.kwargs['ranges'] == ["'Summary'!1:1", "'Spring ''24 Leads'!1:1", "'Empty'!1:1"]
+        service.spreadsheets().values().get.assert_not_called()
+
+
+class TestFetchSheetData:
+    """Tests for fetching sheet rows."""
+
+    def test_incremental_fetch_uses_open_ended_range(self):
+        """Test that incremental mode asks for every row from start_row, not a fixed slab."""
+        from sheets import fetch_sheet_data
+
+        service = MagicMock()
+        batch_get = service.spreadsheets().values().batchGet
+        batch_get.return_value.execute.return_value = {'valueRanges': [
+            {'values': [['email', 'name']]},
+            {'values': [['a@example.com', 'A'], ['b@example.com', 'B']]},
+        ]}
+
+        rows = fetch_sheet_data(service, 'a' * 44, 'Leads', start_row=42)
+
+        assert rows == [['email', 'name'], ['a@example.com', 'A'], ['b@example.com', 'B']]
+        assert batch_get.call_args.kwargs['ranges'] == ["'Leads'!1:1", "'Leads'!A42:ZZ"]
+
+    def test_quotes_in_sheet_name_are_doubled(self):
+        """Test that a single tab's range escapes quotes the same way as the batched fetch."""
+        from sheets import fetch_sheet_data
+
+        service = MagicMock()
+        batch_get = service.spreadsheets().values().batchGet
+        batch_get.return_value.execute.return_value = {'valueRanges': [
+            {'values': [['email']]},
+            {'values': [['a@example.com']]},
+        ]}
+
+        rows = fetch_sheet_data(service, 'a' * 44, "Joe's", start_row=10)
+
+        assert rows == [['email'], ['a@example.com']]
+        assert batch_get.call_args.kwargs['ranges'] == ["'Joe''s'!1:1", "'Joe''s'!A10:ZZ"]
+
+    def test_tabs_of_one_spreadsheet_fetched_in_one_batch(self):
+        """Test that full and incremental tabs share one batchGet and are split back out per tab."""
+        from sheets import fetch_sheets_data
+
+        service = MagicMock()
+        batch_get = service.spreadsheets().values().batchGet
+        batch_get.return_value.execute.return_value = {'valueRanges': [
+            {'values': [['email'], ['a@example.com']]},
+            {'values': [['email']]},
+            {},
+            {'values': [['email']]},
+            {'values': [['c@example.com']]},
+        ]}
+
+        results = fetch_sheets_data(service, 'a' * 44, [('Full', 1), ("Joe's", 10), ('Inc', 5)])
+
+        assert results == [
+            [['email'], ['a@example.com']],
+            [['email']],
+            [['email'], ['c@example.com']],
+        ]
+        assert batch_get.call_count == 1
+        assert batch_get.call_args.kwargs['ranges'] == [
+            "'Full'", "'Joe''s'!1:1", "'Joe''s'!A10:ZZ", "'Inc'!1:1", "'Inc'!A5:ZZ",
+        ]
+
+    def test_failed_batch_falls_back_to_single_tabs(self):
+        """Test that one bad tab doesn't stop the other tabs from being fetched."""
+        import sheets
+        from googleapiclient.errors import HttpError
+
+        service = MagicMock()
+        resp = MagicMock(status=400)
+        service.spreadsheets().values().batchGet.return_value.execute.side_effect = \
+            HttpError(resp, b'Unable to parse range')
+
+        fetched = {'Good': [['email'], ['a@example.com']], 'Renamed': []}
+        with patch.object(sheets, 'fetch_sheet_data', side_effect=lambda svc, sid, name, row: fetched[name]):
+            results = sheets.fetch_sheets_data(service, 'a' * 44, [('Good', 1), ('Renamed', 1)])
+
+        assert results == [[['email'], ['a@example.com']], []]
+
+    def test_spreadsheets_fetched_concurrently(self):
+        """Test that each spreadsheet's tabs are fetched and keyed back by spreadsheet, tab and start row."""
+        import sheets
+
+        tabs_by_spreadsheet = {'a' * 44: [('Leads', 1)], 'b' * 44: [('Leads', 7), ('Other', 1)]}
+        threads = set()
+
+        def fake_fetch(service, spreadsheet_id, tabs):
+            import threading
+            threads.add(threading.current_thread().name)
+            return [[['email'], [f'{spreadsheet_id[0]}-{name}-{row}']] for name, row in tabs]
+
+        with patch.object(sheets, 'fetch_sheets_data', side_effect=fake_fetch):
+            fetched = sheets.fetch_spreadsheets_data(MagicMock(), tabs_by_spreadsheet)
+
+        assert fetched == {
+            ('a' * 44, 'Leads', 1): [['email'], ['a-Leads-1']],
+            ('b' * 44, 'Leads', 7): [['email'], ['b-Leads-7']],
+            ('b' * 44, 'Other', 1): [['email'], ['b-Other-1']],
+        }
+        assert all(name.startswith('sheets-fetch') for name in threads)
+
+
+class TestThreadLocalHttp:
+    """Tests for giving each thread its own HTTP object."""
+
+    def test_worker_threads_get_their_own_http(self):
+        """Test that requests built off the creating thread don't share its httplib2 object."""
+        import threading
+        import httplib2
+        from google.auth.credentials import AnonymousCredentials
+        from google_auth_httplib2 import AuthorizedHttp
+        from googleapiclient.discovery import build
+        import sheets
+
+        credentials = AnonymousCredentials()
+        owner_http = AuthorizedHttp(credentials, http=httplib2.Http())
+        service = build('sheets', 'v4', http=owner_http, cache_discovery=False, static_discovery=True,
+                        requestBuilder=sheets._thread_local_request_builder(credentials, owner_http))
+
+        def request_http():
+            return service.spreadsheets().values().get(spreadsheetId='a' * 44, range='A1').http
+
+        worker_https = []
+
+        def worker():
+            worker_https.append(request_http())
+            worker_https.append(request_http())
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        assert request_http() is owner_http
+        assert worker_https[0] is worker_https[1]
+        assert worker_https[0] is not owner_http
+
+    def test_fetch_workers_reuse_and_close_their_http(self, monkeypatch):
+        """Test that pool threads keep their Http across cycles and close_service_http closes them."""
+        import threading
+        import httplib2
+        from google.auth.credentials import AnonymousCredentials
+        from google_auth_httplib2 import AuthorizedHttp
+        from googleapiclient.discovery import build
+        import sheets
+
+        closed = []
+        monkeypatch.setattr(httplib2.Http, 'close', lambda self: closed.append(self))
+        monkeypatch.setattr(sheets, 'SHEETS_FETCH_MAX_WORKERS', 2)
+        monkeypatch.setattr(sheets, '_fetch_executor', None)
+
+        credentials = AnonymousCredentials()
+        owner_http = AuthorizedHttp(credentials, http=httplib2.Http())
+        service = build('sheets', 'v4', http=owner_http, cache_discovery=False, static_discovery=True,
+                        requestBuilder=sheets._thread_local_request_builder(credentials, owner_http))
+
+        # Both spreadsheets must be in flight at once, so each cycle uses both pool threads
+        barrier = threading.Barrier(2, timeout=5)
+        cycle_https = []
+
+        def fake_fetch(svc, spreadsheet_id, tabs):
+            barrier.wait()
+            cycle_https.append(svc.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range='A1').http)
+            return [[['email']] for _ in tabs]
+
+        tabs_by_spreadsheet = {'a' * 44: [('Leads', 1)], 'b' * 44: [('Leads', 1)]}
+        try:
+            with patch.object(sheets, 'fetch_sheets_data', side_effect=fake_fetch):
+                sheets.fetch_spreadsheets_data(service, tabs_by_spreadsheet)
+                first_cycle = set(cycle_https)
+                cycle_https.clear()
+                sheets.fetch_spreadsheets_data(service, tabs_by_spreadsheet)
+                second_cycle = set(cycle_https)
+
+            assert len(first_cycle) == 2
+            assert first_cycle == second_cycle
+            assert owner_http not in first_cycle
+
+            sheets._close_service_http(service)
+
+            assert len(closed) == 3
+            assert set(closed) == {owner_http.http} | {http.http for http in first_cycle}
+            assert service._requestBuilder.thread_https == []
+        finally:
+            sheets._fetch_executor.shutdown(wait=True)
+
+
 class TestBuildLeadData:
     """Tests for building Momence lead data from sheet row."""
 
@@ -207,3 +789,36 @@ class TestBuildLeadData:
 
         result = build_momence_lead_data(headers, row, config)
         assert result.get('zipCode') == '54321'
+
+    def test_build_lead_data_with_compiled_schema(self):
+        """Test that a precompiled schema gives the same result as headers."""
+        from sheets import build_momence_lead_data, compile_schema
+
+        headers = ['Email', 'First_Name', 'Phone_Number', 'Ignored', 'Zip_Code']
+        row = ['test@example.com', 'John', '5551234567', 'x', '12345']
+        config = {'name': 'Test Sheet', 'lead_source_id': 123}
+
+        schema = compile_schema(headers)
+
+        assert 'ignored' not in schema
+        assert build_momence_lead_data(headers, row, config, schema) == \
+            build_momence_lead_data(headers, row, config)
+        assert build_momence_lead_data(headers, row, config, schema)['zipCode'] == '12345'
+
+    def test_alias_headers_are_fallbacks(self):
+        """Test that zipcode/discoveryanswer columns are only read when the main column is empty."""
+        from sheets import build_momence_lead_data, compile_schema
+
+        headers = ['email', 'zipcode', 'zip_code', 'discoveryanswer']
+        config = {'name': 'Test Sheet', 'lead_source_id': 123}
+
+        assert compile_schema(headers)['zip_code'] == (2, 1)
+        assert compile_schema(headers)['discovery_answer'] == (3,)
+
+        both = build_momence_lead_data(headers, ['a@example.com', '11111', '22222', 'Yoga'], config)
+        assert both['zipCode'] == '22222'
+        assert both['discoveryAnswer'] == 'Yoga'
+
+        alias_only = build_momence_lead_data(headers, ['a@example.com', '11111', '', ''], config)
+        assert alias_only['zipCode'] == '11111'
+        assert 'discoveryAnswer' not in alias_only
@@ -32,6 +32,7 @@ class TestDatabaseInitialization:
             assert 'failed_queue' in table_names
             assert 'dead_letters' in table_names
             assert 'tracker_metadata' in table_names
+            assert 'location_counts' in table_names
             assert 'admin_activity' in table_names
             assert 'lead_metrics' in table_names
             assert 'momence_hosts' in table_names
@@ -51,6 +52,87 @@ class TestDatabaseInitialization:
         storage.init_database()
 
 
+class TestTransactions:
+    """Tests for read/write transaction handling in get_db."""
+
+    def test_nested_write_rolls_back_with_outer(self, temp_dir, monkeypatch):
+        """Test that a write helper called inside a write block joins its transaction."""
+        monkeypatch.setenv('DATABASE_FILE', str(temp_dir / 'test.db'))
+
+        import importlib
+        import storage
+        importlib.reload(storage)
+        storage.init_database()
+
+        with pytest.raises(RuntimeError):
+            with storage.get_db() as conn:
+                conn.execute(
+                    "INSERT INTO sent_hashes (hash, location, created_at) VALUES ('outer', 'L', '2024-01-01')"
+                )
+                storage.add_sent_hash('inner', 'L')
+                raise RuntimeError('abort')
+
+        assert storage.hash_exists('outer') is False
+        assert storage.hash_exists('inner') is False
+
+    def test_reader_not_blocked_by_open_write(self, temp_dir, monkeypatch):
+        """Test that a read-only block runs while another thread holds a write transaction."""
+        import threading
+        monkeypatch.setenv('DATABASE_FILE', str(temp_dir / 'test.db'))
+
+        import importlib
+        import storage
+        importlib.reload(storage)
+        storage.init_database()
+
+        written = threading.Event()
+        release = threading.Event()
+
+        def writer():
+            with storage.get_db() as conn:
+                conn.execute(
+                    "INSERT INTO sent_hashes (hash, location, created_at) VALUES ('pending', 'L', '2024-01-01')"
+                )
+                written.set()
+                release.wait(5)
+            storage.close_connection(upload_to_cloud=False)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            assert written.wait(5)
+            # Uncommitted row isn't visible, and the read doesn't wait for the writer
+            assert storage.hash_exists('pending') is False
+        finally:
+            release.set()
+            thread.join(5)
+
+        assert storage.hash_exists('pending') is True
+
+    def test_concurrent_writers_serialized(self, temp_dir, monkeypatch):
+        """Test that writes from many threads all land, queued on the write lock rather than failing busy."""
+        import threading
+        monkeypatch.setenv('DATABASE_FILE', str(temp_dir / 'test.db'))
+
+        import importlib
+        import storage
+        importlib.reload(storage)
+        storage.init_database()
+
+        def bump():
+            for _ in range(25):
+                storage.increment_location_count('Busy', 1)
+            storage.close_connection(upload_to_cloud=False)
+
+        threads = [threading.Thread(target=bump) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+
+        assert storage.get_location_counts()['Busy'] == 200
+
+
 class TestSentHashes:
     """Tests for sent hash operations."""
 
@@ -124,6 +206,44 @@ class TestSentHashes:
 
         assert storage.get_sent_hash_count() == 1
 
+    def test_optimize_database_after_cleanup(self, temp_dir, monkeypatch):
+        """Test that maintenance runs after hash churn and keeps lookups intact."""
+        monkeypatch.setenv('DATABASE_FILE', str(temp_dir / 'test.db'))
+
+        import importlib
+        import storage
+        importlib.reload(storage)
+        storage.init_database()
+
+        storage.add_sent_hashes_batch([(f'hash{i}', 'Location1') for i in range(500)])
+        with storage.get_db() as conn:
+            conn.execute("UPDATE sent_hashes SET created_at = '2000-01-01T00:00:00' WHERE hash != 'hash0'")
+        storage.cleanup_old_hashes(days=90)
+
+        assert storage.optimize_database() >= 0
+        assert storage.hash_exists('hash0') is True
+        assert storage.get_sent_hash_count() == 1
+
+
+class TestSpreadsheetState:
+    """Tests for spreadsheet modifiedTime tracking."""
+
+    def test_spreadsheet_mtime_roundtrip(self, temp_dir, monkeypatch):
+        """Test recording and reading a spreadsheet's modifiedTime."""
+        monkeypatch.setenv('DATABASE_FILE', str(temp_dir / 'test.db'))
+
+        import importlib
+        import storage
+        importlib.reload(storage)
+        storage.init_database()
+
+        assert storage.get_spreadsheet_mtime('sheet1') is None
+
+        storage.update_spreadsheet_mtime('sheet1', '2024-01-15T12:00:00.000Z')
+        storage.update_spreadsheet_mtime('sheet1', '2024-01-16T08:30:00.000Z')
+
+        assert storage.get_spreadsheet_mtime('sheet1') == '2024-01-16T08:30:00.000Z'
+
 
 class TestFailedQueue:
     """Tests for failed queue operations."""
@@ -307,6 +427,62 @@ class TestTrackerMetadata:
         metadata = storage.get_tracker_metadata()
         assert metadata['location_counts'].get('TestLocation') == 3
 
+    def test_bulk_commit(self, temp_dir, monkeypatch):
+        """Test flushing hashes, location counts and metrics in one call."""
+        monkeypatch.setenv('DATABASE_FILE', str(temp_dir / 'test.db'))
+
+        import importlib
+        import storage
+        importlib.reload(storage)
+        storage.init_database()
+
+        from datetime import datetime, timezone
+        today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+        storage.increment_location_count('TestLocation', 2)
+        storage.bulk_commit(
+            sent_hashes=[('hash1', 'TestLocation'), ('hash2', 'TestLocation')],
+            location_increments={'TestLocation': 3, 'Other Location': 1},
+            metrics=[
+                ('TestLocation', 'TestTenant', today, True),
+                ('TestLocation', 'TestTenant', today, False),
+            ]
+        )
+
+        assert storage.hash_exists('hash1') is True
+        assert storage.hash_exists('hash2') is True
+
+        metadata = storage.get_tracker_metadata()
+        assert metadata['location_counts']['TestLocation'] == 5
+        assert metadata['location_counts']['Other Location'] == 1
+
+        data = storage.get_leads_by_location_daily(days=30)
+        assert data[0]['leads_sent'] == 1
+        assert data[0]['leads_failed'] == 1
+
+    def test_location_counts_migrated_from_metadata(self, temp_dir, monkeypatch):
+        """Test that legacy JSON location counts move into the location_counts table."""
+        monkeypatch.setenv('DATABASE_FILE', str(temp_dir / 'test.db'))
+
+        import importlib
+        import storage
+        importlib.reload(storage)
+        storage.init_database()
+
+        with storage.get_db() as conn:
+            conn.execute(
+                "UPDATE tracker_metadata SET location_counts = ? WHERE id = 1",
+                ('{"Eden Prairie": 4, "Wayzata": 2}',)
+            )
+
+        storage.init_database()
+        storage.increment_location_count('Eden Prairie')
+
+        assert storage.get_location_counts() == {'Eden Prairie': 5, 'Wayzata': 2}
+        with storage.get_db() as conn:
+            row = conn.execute('SELECT location_counts FROM tracker_metadata WHERE id = 1').fetchone()
+        assert row['location_counts'] == '{}'
+
 
 class TestAdminActivity:
     """Tests for admin activity logging."""
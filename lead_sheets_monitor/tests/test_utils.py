@@ -168,6 +168,29 @@ class TestEntryHashing:
         # Both naming conventions should produce same hash
         assert hash_camel == hash_snake
 
+    def test_row_hash_with_compiled_columns(self):
+        """Test that row hashes from compiled columns match hashing the full row."""
+        from failed_queue import compile_row_hash_columns, generate_row_hash
+        from utils import compute_entry_hash
+
+        headers = ['id', ' Email ', 'First_Name', 'last_name', 'phone_number', 'notes', 'email']
+        row = ['1', 'old@example.com', 'John ', 'Doe', '', 'call back', 'New@Example.com']
+
+        full_row = {
+            headers[i].lower().strip(): str(value).strip()
+            for i, value in enumerate(row) if value
+        }
+        expected = compute_entry_hash(full_row, sheet_id='sheet1', gid='0')
+
+        columns = compile_row_hash_columns(headers)
+
+        assert 'notes' not in columns
+        assert generate_row_hash('sheet1', '0', headers, row, columns) == expected
+        assert generate_row_hash('sheet1', '0', headers, row) == expected
+        # Short rows (trailing blank cells trimmed by the API) still hash
+        assert generate_row_hash('sheet1', '0', headers, row[:3], columns) == \
+            compute_entry_hash({'email': 'old@example.com', 'first_name': 'John'}, sheet_id='sheet1', gid='0')
+
 
 class TestHtmlEscaping:
     """Tests for HTML escaping."""
@@ -29,6 +29,7 @@ import storage
 from sheets import get_google_sheets_service, discover_fb_lead_tabs, parse_spreadsheet_url
 from momence import create_momence_lead
 from notifications import send_test_location_email
+from secret_manager import prefetch_all
 
 
 # ============================================================================
@@ -95,6 +96,11 @@ def _get_dashboard_credentials():
 
     return api_key, username, password
 
+# Warm the secrets cache in one parallel wave (no-op outside Cloud Run).
+# monitor.py imports this package before it reads any secret, so this is
+# the one startup prefetch for the whole process.
+prefetch_all()
+
 DASHBOARD_API_KEY, DASHBOARD_USERNAME, DASHBOARD_PASSWORD = _get_dashboard_credentials()
 
 # Trusted proxy IPs/networks for X-Forwarded-For header handling